@@ -0,0 +1,43 @@
+"""Synthetic series used by the benchmarks. They are generated from a seed, so that every run paints the same
+charts."""
+from typing import Dict
+
+import numpy as np
+
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint
+from models.token_info import TokenInfo
+
+DEFAULT_SEED = 42
+# one candle per minute
+INTERVAL = np.timedelta64(60, 's')
+START = np.datetime64('2021-01-01T00:00:00', 'us')
+
+TOKEN_INFO = TokenInfo(name='Benchmark', ticker='BENCH')
+
+
+def raw_ohcl(size: int, seed: int = DEFAULT_SEED) -> Dict[str, np.ndarray]:
+    """Columns of a random walk of `size` candles, named like the arguments of from_raw_values"""
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, size)))
+    opens = np.concatenate(([100.], closes[:-1]))
+    spread = np.abs(rng.normal(0, 0.001, size)) * closes
+    return dict(opens=opens,
+                highs=np.maximum(opens, closes) + spread,
+                lows=np.minimum(opens, closes) - spread,
+                closes=closes,
+                volumes=rng.lognormal(10, 1, size),
+                dates=START + np.arange(size) * INTERVAL)
+
+
+def raw_single_points(size: int, seed: int = DEFAULT_SEED) -> Dict[str, np.ndarray]:
+    """Columns of a random walk of `size` trades, named like the arguments of from_raw_values"""
+    ohcl = raw_ohcl(size, seed)
+    return dict(values=ohcl['closes'], volumes=ohcl['volumes'], dates=ohcl['dates'])
+
+
+def ohcl(size: int, seed: int = DEFAULT_SEED) -> ColumnarCollectionOhcl:
+    return ColumnarCollectionOhcl(**raw_ohcl(size, seed))
+
+
+def single_points(size: int, seed: int = DEFAULT_SEED) -> ColumnarCollectionSingleTradePoint:
+    return ColumnarCollectionSingleTradePoint(**raw_single_points(size, seed))
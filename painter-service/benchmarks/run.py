@@ -0,0 +1,359 @@
+"""Offline benchmarks of the stages of the painting pipeline, on synthetic series of increasing size.
+
+Usage, from the painter-service directory:
+    python -m benchmarks.run --sizes 50,1000,100000 --json results.json --csv results.csv
+    python -m benchmarks.run --baseline results.json --fail-on-regression
+
+Each stage is timed in isolation: its inputs are prepared beforehand and aren't part of the measure."""
+import argparse
+import csv
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from benchmarks import datasets
+from controllers.request_decoder import decode_collection
+from controllers.series_store import SeriesKey, SeriesStore
+from graph import finance_util
+from graph.decimation import decimation_indices, target_points
+from graph.graph_painter import GraphPainter
+from graph.grid_painter import GridPainter, GridPanel
+from graph.output import encode
+from graph.renderer_pool import get_renderer_pool
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+from models.price_point import CollectionOhcl, CollectionSingleTradePoint
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+DEFAULT_SIZES = (50, 1_000, 10_000, 100_000, 1_000_000)
+# the stages going through plotly and Kaleido are skipped above this size by default
+DEFAULT_MAX_RENDER_SIZE = 100_000
+# size of the image exported by Kaleido, before the banner and the border
+CHART_SIZE = (3200, 1800)
+# charts of the grid stages, as in a 3x3 dashboard
+GRID_PANELS = 9
+
+
+@dataclass
+class Stage:
+    name: str
+    # prepares the inputs of the stage for a size, and returns the function to time
+    setup: Callable[[int], Callable[[], object]]
+    # the stage goes through plotly and Kaleido
+    render: bool = False
+
+
+@dataclass
+class Result:
+    stage: str
+    size: int
+    runs: int
+    min_s: float
+    median_s: float
+    mean_s: float
+
+
+def _rows(columns: Dict[str, np.ndarray]) -> Dict[str, list]:
+    """Python lists and datetimes, as the pydantic models receive them"""
+    return {name: values.astype(datetime).tolist() if name == 'dates' else values.tolist()
+            for name, values in columns.items()}
+
+
+def _painter(size: int, ohcl: bool = True, **options) -> GraphPainter:
+    datas = datasets.ohcl(size) if ohcl else datasets.single_points(size)
+    return GraphPainter(datas, datasets.TOKEN_INFO, GraphOption(**options))
+
+
+def _from_raw_values(size: int) -> Callable[[], CollectionOhcl]:
+    rows = _rows(datasets.raw_ohcl(size))
+    return lambda: CollectionOhcl.from_raw_values(**rows)
+
+
+def _from_raw_values_single(size: int) -> Callable[[], CollectionSingleTradePoint]:
+    rows = _rows(datasets.raw_single_points(size))
+    return lambda: CollectionSingleTradePoint.from_raw_values(**rows)
+
+
+def _json_collection(size: int, ohcl: bool = True) -> dict:
+    """The collection as sent in a json chart request"""
+    rows = _rows(datasets.raw_ohcl(size) if ohcl else datasets.raw_single_points(size))
+    dates = [d.isoformat() for d in rows['dates']]
+    if ohcl:
+        return {'coll': [dict(date=dates[i], v_open=rows['opens'][i], v_high=rows['highs'][i], v_low=rows['lows'][i],
+                              v_close=rows['closes'][i], volume=rows['volumes'][i]) for i in range(size)]}
+    return {'coll': [dict(date=dates[i], value=rows['values'][i], volume=rows['volumes'][i]) for i in range(size)]}
+
+
+def _validate_collection(size: int) -> Callable[[], CollectionOhcl]:
+    collection = _json_collection(size)
+    return lambda: CollectionOhcl(**collection)
+
+
+def _decode_collection(size: int) -> Callable[[], ColumnarCollectionOhcl]:
+    collection = _json_collection(size)
+    return lambda: decode_collection(collection, ohcl=True)
+
+
+def _series_store_read(size: int) -> Callable[[], ColumnarCollectionOhcl]:
+    """Last 1000 candles of a stored series of `size` candles"""
+    directory = tempfile.TemporaryDirectory()
+    store = SeriesStore(directory.name)
+    key = SeriesKey('eth', 'benchmark', '1m')
+    store.append(key, datasets.ohcl(size))
+    # the directory is removed along with the function
+    return lambda _directory=directory: store.read(key, limit=1000)
+
+
+def _columnar_from_raw_values(size: int) -> Callable[[], ColumnarCollectionOhcl]:
+    raw = datasets.raw_ohcl(size)
+    return lambda: ColumnarCollectionOhcl.from_raw_values(**raw)
+
+
+def _columnar_from_raw_values_single(size: int) -> Callable[[], ColumnarCollectionSingleTradePoint]:
+    raw = datasets.raw_single_points(size)
+    return lambda: ColumnarCollectionSingleTradePoint.from_raw_values(**raw)
+
+
+def _regroup(size: int) -> Callable[[], CollectionOhcl]:
+    col = CollectionOhcl.from_raw_values(**_rows(datasets.raw_ohcl(size)))
+    return lambda: col.regroup(10)
+
+
+def _columnar_regroup(size: int) -> Callable[[], ColumnarCollectionOhcl]:
+    col = datasets.ohcl(size)
+    return lambda: col.regroup(10)
+
+
+def _to_ohcl(size: int) -> Callable[[], ColumnarCollectionOhcl]:
+    col = datasets.single_points(size)
+    return lambda: col.to_ohcl('1h', 'Europe/Paris')
+
+
+def _on_closes(indicator: Callable[[np.ndarray], object]) -> Callable[[int], Callable[[], object]]:
+    def setup(size: int) -> Callable[[], object]:
+        closes = datasets.ohcl(size).closes()
+        return lambda: indicator(closes)
+    return setup
+
+
+def _bollinger_bands(size: int) -> Callable[[], list]:
+    col = datasets.ohcl(size)
+    return lambda: finance_util.bollinger_bands(col.highs(), col.lows(), col.closes())
+
+
+def _decimation(mode: str) -> Callable[[int], Callable[[], object]]:
+    def setup(size: int) -> Callable[[], object]:
+        col = datasets.single_points(size)
+        x = col.dates().astype(np.int64)
+        return lambda: decimation_indices(x, col.values(), target_points(1600, 2), mode)
+    return setup
+
+
+def _export(size: int) -> Callable[[], bytes]:
+    chart = _painter(size)._candlestick_figure()
+    pool = get_renderer_pool()
+    return lambda: pool.to_image(chart, scale=2, validate=False)
+
+
+def _compose(size: int) -> Callable[[], Image.Image]:
+    painter = _painter(size, upper_part_text='Benchmark')
+    img = Image.new('RGB', CHART_SIZE)
+    return lambda: painter._compose(img, 0, 1)
+
+
+def _encode_grid(size: int) -> Callable[[], bytes]:
+    """Grid of GRID_PANELS charts of `size` points, against the same charts encoded one by one in
+    encode_grid_separately"""
+    options = GraphOption(export_type='PNG', width=800, height=450, scale=1)
+    panels = [GridPanel(GraphPainter(datasets.ohcl(size, seed=i), datasets.TOKEN_INFO, options),
+                        PaintingType.CANDLESTICK, f'Token {i}') for i in range(GRID_PANELS)]
+    return lambda: GridPainter(panels, options).encode()
+
+
+def _encode_grid_separately(size: int) -> Callable[[], List[bytes]]:
+    painters = [_painter(size, export_type='PNG', width=800, height=450, scale=1, upper_part_text=f'Token {i}')
+                for i in range(GRID_PANELS)]
+    return lambda: [painter.encode_candlestick() for painter in painters]
+
+
+def _encode(**options) -> Callable[[int], Callable[[], bytes]]:
+    def setup(size: int) -> Callable[[], bytes]:
+        painter = _painter(size, **options)
+        img = painter.paint_candlestick()
+        return lambda: encode(img, painter.options)
+    return setup
+
+
+STAGES = [
+    Stage('from_raw_values', _from_raw_values),
+    Stage('from_raw_values_single', _from_raw_values_single),
+    Stage('columnar_from_raw_values', _columnar_from_raw_values),
+    Stage('columnar_from_raw_values_single', _columnar_from_raw_values_single),
+    Stage('validate_collection', _validate_collection),
+    Stage('decode_collection', _decode_collection),
+    Stage('series_store_read', _series_store_read),
+    Stage('regroup', _regroup),
+    Stage('columnar_regroup', _columnar_regroup),
+    Stage('to_ohcl', _to_ohcl),
+    Stage('rsi', _on_closes(finance_util.calculate_rsi)),
+    Stage('rsi_wilder', _on_closes(lambda closes: finance_util.rsi(closes, method='wilder'))),
+    Stage('bollinger_bands', _bollinger_bands),
+    Stage('fibonacci_bands', _on_closes(finance_util.fibonnaci_bands)),
+    Stage('moving_average', _on_closes(finance_util.moving_average)),
+    Stage('ema', _on_closes(lambda closes: finance_util.ema(closes, span=20))),
+    Stage('decimation_lttb', _decimation('lttb')),
+    Stage('decimation_minmax', _decimation('minmax')),
+    Stage('paint_chart', lambda size: _painter(size, ohcl=False).paint_simple_chart, render=True),
+    Stage('paint_chart_lttb', lambda size: _painter(size, ohcl=False, downsample='lttb').paint_simple_chart,
+          render=True),
+    Stage('candlestick_figure', lambda size: _painter(size)._candlestick_figure, render=True),
+    Stage('chart_figure', lambda size: _painter(size, ohcl=False)._chart_figure, render=True),
+    Stage('export', _export, render=True),
+    Stage('generate_candlestick', lambda size: _painter(size)._generate_candlestick, render=True),
+    Stage('generate_chart', lambda size: _painter(size, ohcl=False)._generate_chart, render=True),
+    Stage('encode_candlestick', lambda size: _painter(size).encode_candlestick, render=True),
+    Stage('encode_candlestick_direct', lambda size: _painter(size, border=False).encode_candlestick, render=True),
+    Stage('encode_candlestick_thumbnail', lambda size: _painter(size, variants=['thumbnail']).encode_candlestick,
+          render=True),
+    Stage('encode_candlestick_variants',
+          lambda size: _painter(size, variants=['thumbnail', 'preview', 'full']).encode_candlestick, render=True),
+    Stage('compose', _compose),
+    Stage('encode_jpeg', _encode(export_type='JPEG'), render=True),
+    Stage('encode_jpeg_tuned', _encode(export_type='JPEG', quality=85, progressive=True, subsampling='4:2:0'),
+          render=True),
+    Stage('encode_webp', _encode(export_type='WEBP'), render=True),
+    Stage('encode_png', _encode(export_type='PNG'), render=True),
+    Stage('encode_png_palette', _encode(export_type='PNG', palette_colors=256), render=True),
+    Stage('encode_grid', _encode_grid, render=True),
+    Stage('encode_grid_separately', _encode_grid_separately, render=True),
+]
+
+
+def time_stage(stage: Stage, size: int, repeat: int, budget: float) -> Result:
+    """Times a stage `repeat` times, fewer if the runs exceed the budget in seconds. There's always one run."""
+    fn = stage.setup(size)
+    durations = []
+    start = time.perf_counter()
+    while len(durations) < repeat and (not durations or time.perf_counter() - start < budget):
+        t0 = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - t0)
+    return Result(stage.name, size, len(durations), min(durations), statistics.median(durations),
+                  statistics.fmean(durations))
+
+
+def run(stages: List[Stage], sizes: List[int], repeat: int = 5, budget: float = 10.,
+        max_render_size: int = DEFAULT_MAX_RENDER_SIZE) -> List[Result]:
+    results = []
+    if any(stage.render for stage in stages):
+        # starts Chromium in every renderer, so that its start isn't part of the first exports
+        get_renderer_pool().warm_up()
+    for stage in stages:
+        for size in sizes:
+            if stage.render and size > max_render_size:
+                continue
+            result = time_stage(stage, size, repeat, budget)
+            logging.info(f"{stage.name:>32} {size:>9}: median {result.median_s * 1000:10.3f}ms "
+                         f"({result.runs} runs)")
+            results.append(result)
+    return results
+
+
+def metadata(sizes: List[int]) -> dict:
+    return dict(date=datetime.now().isoformat(timespec='seconds'), python=platform.python_version(),
+                platform=platform.platform(), numpy=np.__version__, sizes=sizes)
+
+
+def write_json(path: str, results: List[Result], meta: dict) -> None:
+    with open(path, 'w') as f:
+        json.dump(dict(meta=meta, results=[asdict(r) for r in results]), f, indent=2)
+
+
+def write_csv(path: str, results: List[Result]) -> None:
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(Result.__dataclass_fields__))
+        writer.writeheader()
+        writer.writerows(asdict(r) for r in results)
+
+
+def load_results(path: str) -> List[Result]:
+    with open(path) as f:
+        return [Result(**r) for r in json.load(f)['results']]
+
+
+def compare(results: List[Result], baseline: List[Result], tolerance: float = 0.1) -> List[dict]:
+    """Median of each result against the one of the baseline for the same stage and size. A result is a
+    regression when it's slower than the baseline by more than the tolerance (0.1 being 10%)."""
+    reference = {(r.stage, r.size): r for r in baseline}
+    comparison = []
+    for result in results:
+        base = reference.get((result.stage, result.size))
+        if base is None:
+            continue
+        ratio = result.median_s / base.median_s if base.median_s else float('inf')
+        comparison.append(dict(stage=result.stage, size=result.size, baseline_s=base.median_s,
+                               median_s=result.median_s, ratio=ratio, regression=ratio > 1 + tolerance))
+    return comparison
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma separated numbers of points")
+    parser.add_argument('--stages', default=None, help="comma separated stages, all of them by default: " +
+                        ', '.join(s.name for s in STAGES))
+    parser.add_argument('--repeat', type=int, default=5, help="runs per stage and size")
+    parser.add_argument('--budget', type=float, default=10., help="seconds after which a stage stops repeating")
+    parser.add_argument('--max-render-size', type=int, default=DEFAULT_MAX_RENDER_SIZE,
+                        help="largest size painted through plotly and Kaleido")
+    parser.add_argument('--json', help="writes the results in this json file")
+    parser.add_argument('--csv', help="writes the results in this csv file")
+    parser.add_argument('--baseline', help="json results of a previous run to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="slowdown ratio tolerated by the comparison")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exits with an error if a stage is slower than in the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(',')]
+    stages = STAGES
+    if args.stages:
+        names = args.stages.split(',')
+        unknown = set(names) - {s.name for s in STAGES}
+        if unknown:
+            raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+        stages = [s for s in STAGES if s.name in names]
+
+    results = run(stages, sizes, args.repeat, args.budget, args.max_render_size)
+    if args.json:
+        write_json(args.json, results, metadata(sizes))
+    if args.csv:
+        write_csv(args.csv, results)
+    if args.baseline:
+        comparison = compare(results, load_results(args.baseline), args.tolerance)
+        for c in comparison:
+            flag = ' REGRESSION' if c['regression'] else ''
+            logging.info(f"{c['stage']:>32} {c['size']:>9}: {c['baseline_s'] * 1000:10.3f}ms -> "
+                         f"{c['median_s'] * 1000:10.3f}ms (x{c['ratio']:.2f}){flag}")
+        if args.fail_on_regression and any(c['regression'] for c in comparison):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Start-up time of the service: time to import its entry point, measured in fresh interpreters.
+
+Usage, from the painter-service directory:
+    python -m benchmarks.startup --repeat 5 --top 15
+    python -m benchmarks.startup --max-seconds 1.5
+
+The heaviest imports are listed from `python -X importtime`. The libraries only needed by the renders (pandas,
+plotly's validators and io, Kaleido, pyarrow) are imported on first use or during the warm-up, after the port is bound:
+the benchmark fails if one of them is imported with the entry point, or if the import takes longer than
+--max-seconds."""
+import argparse
+import logging
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# service.py itself reads its configuration when imported, the servicer imports everything else
+ENTRY_POINT = 'service.grpc_server'
+# modules that must not be imported at the start of the service
+DEFERRED_MODULES = ('pandas', 'plotly.graph_objects', 'plotly.io', 'kaleido', 'IPython', 'pyarrow')
+
+
+@dataclass
+class ImportTime:
+    module: str
+    # in seconds, the module alone and with the modules it imported
+    self_s: float
+    cumulative_s: float
+
+
+def _python(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *options, '-c', code], capture_output=True, text=True, check=True)
+
+
+def import_time(module: str = ENTRY_POINT) -> float:
+    """Seconds taken to import the module in a fresh interpreter"""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    return float(_python(code).stdout)
+
+
+def loaded_modules(module: str = ENTRY_POINT, names=DEFERRED_MODULES) -> List[str]:
+    """Those of the given modules that are imported along with the module"""
+    code = f"import sys; import {module}; print(','.join(n for n in {tuple(names)!r} if n in sys.modules))"
+    return [name for name in _python(code).stdout.strip().split(',') if name]
+
+
+def import_profile(module: str = ENTRY_POINT) -> List[ImportTime]:
+    """Import time of every module imported along with the module, from `python -X importtime`"""
+    profile = []
+    for line in _python(f"import {module}", '-X', 'importtime').stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        profile.append(ImportTime(name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return profile
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default=ENTRY_POINT, help="module imported")
+    parser.add_argument('--repeat', type=int, default=5, help="number of interpreters started")
+    parser.add_argument('--top', type=int, default=15, help="number of heaviest imports listed")
+    parser.add_argument('--max-seconds', type=float, help="exits with an error if the median import is slower")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    for entry in sorted(import_profile(args.module), key=lambda e: e.cumulative_s)[-args.top:]:
+        logging.info(f"{entry.module:>48}: {entry.cumulative_s * 1000:9.1f}ms ({entry.self_s * 1000:.1f}ms self)")
+    median = statistics.median(import_time(args.module) for _ in range(args.repeat))
+    logging.info(f"Imported {args.module} in {median * 1000:.1f}ms (median of {args.repeat}).")
+    failed = False
+    loaded = loaded_modules(args.module)
+    if loaded:
+        logging.error(f"Imported at start-up: {', '.join(loaded)}.")
+        failed = True
+    if args.max_seconds is not None and median > args.max_seconds:
+        logging.error(f"The import takes longer than {args.max_seconds}s.")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
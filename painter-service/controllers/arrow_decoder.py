@@ -0,0 +1,107 @@
+"""Decoding of the chart datas sent as an Arrow IPC stream or as a Parquet file, into columnar collections.
+
+The table has a `timestamp` column, `open`, `high`, `low` and `close` columns for the candles or a `value` column
+for the trades, and an optional `volume` column. The columns are mapped without copy when they already have the
+type of the collections (float64, timestamps in microseconds) in a single chunk without nulls; the others are
+cast. In strict mode, null values are refused except for the volumes, as with the json requests.
+
+pyarrow is an optional dependency, installed with requirements-arrow.txt and imported on the first table decoded."""
+from typing import Dict, Optional
+
+import numpy as np
+
+from controllers.request_decoder import strict_decoding
+from models.columnar import AbsColumnarCollection, ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint, \
+    DATE_DTYPE
+
+# column of the table read for each column of the collections
+TIMESTAMP_COLUMN = 'timestamp'
+VOLUME_COLUMN = 'volume'
+OHCL_COLUMNS = {'opens': 'open', 'highs': 'high', 'lows': 'low', 'closes': 'close'}
+SINGLE_TRADE_POINT_COLUMNS = {'values': 'value'}
+FORMATS = ('arrow', 'parquet')
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Arrow and Parquet datas need pyarrow, which isn't installed") from None
+    return pyarrow
+
+
+def read_table(data: bytes, fmt: str):
+    """pyarrow Table of an Arrow IPC stream ('arrow') or of a Parquet file ('parquet'). The Arrow buffers point
+    into the given bytes."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown table format {fmt}, expected one of {', '.join(FORMATS)}")
+    pa = _pyarrow()
+    buffer = pa.py_buffer(data)
+    try:
+        if fmt == 'arrow':
+            return pa.ipc.open_stream(buffer).read_all()
+        return pa.parquet.read_table(pa.BufferReader(buffer))
+    except pa.ArrowException as e:
+        raise ValueError(f"Invalid {fmt} datas: {e}") from None
+
+
+def is_ohcl(table) -> bool:
+    """Whether the table holds candles rather than single trade points"""
+    return OHCL_COLUMNS['opens'] in table.column_names
+
+
+def decode_table(table, ohcl: bool, strict: Optional[bool] = None) -> AbsColumnarCollection:
+    """Columnar collection of the rows of a table, in the order they were sent"""
+    strict = strict_decoding() if strict is None else strict
+    fields = OHCL_COLUMNS if ohcl else SINGLE_TRADE_POINT_COLUMNS
+    missing = [name for name in (TIMESTAMP_COLUMN, *fields.values()) if name not in table.column_names]
+    if missing:
+        raise ValueError(f"Missing columns {', '.join(missing)}, got {', '.join(table.column_names) or 'none'}")
+    columns: Dict[str, np.ndarray] = {name: _float_column(table, field, strict) for name, field in fields.items()}
+    volumes = _float_column(table, VOLUME_COLUMN, strict=False) if VOLUME_COLUMN in table.column_names else None
+    dates = _date_column(table)
+    if ohcl:
+        return ColumnarCollectionOhcl(dates=dates, volumes=volumes, **columns)
+    return ColumnarCollectionSingleTradePoint(dates=dates, volumes=volumes, **columns)
+
+
+def _to_numpy(column) -> np.ndarray:
+    """numpy view of a column in a single chunk without nulls, copy of it otherwise. Null numbers are NaN."""
+    pa = _pyarrow()
+    chunks = column.chunks
+    if len(chunks) == 1:
+        array = chunks[0]
+    elif chunks:
+        array = pa.concat_arrays(chunks)
+    else:
+        array = pa.array([], type=column.type)
+    return array.to_numpy(zero_copy_only=False)
+
+
+def _float_column(table, field: str, strict: bool) -> np.ndarray:
+    pa = _pyarrow()
+    column = table.column(field)
+    if not (pa.types.is_floating(column.type) or pa.types.is_integer(column.type)):
+        raise ValueError(f"Column {field} must hold numbers, got {column.type}")
+    if strict and column.null_count:
+        raise ValueError(f"Column {field} is required, got {column.null_count} null values")
+    if column.type != pa.float64():
+        column = column.cast(pa.float64())
+    return _to_numpy(column)
+
+
+def _date_column(table) -> np.ndarray:
+    """Naive UTC dates: the Arrow timestamps are stored in UTC whatever their timezone, integers are unix
+    timestamps in milliseconds"""
+    pa = _pyarrow()
+    column = table.column(TIMESTAMP_COLUMN)
+    if column.null_count:
+        raise ValueError(f"Column {TIMESTAMP_COLUMN} is required, got {column.null_count} null values")
+    if pa.types.is_timestamp(column.type):
+        return _to_numpy(column).astype(DATE_DTYPE, copy=False)
+    if pa.types.is_integer(column.type):
+        return _to_numpy(column.cast(pa.int64())).astype('datetime64[ms]').astype(DATE_DTYPE)
+    raise ValueError(f"Column {TIMESTAMP_COLUMN} must hold timestamps or unix timestamps in milliseconds, "
+                     f"got {column.type}")
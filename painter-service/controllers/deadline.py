@@ -0,0 +1,60 @@
+"""Time budget of a request, checked between the stages of a render"""
+import threading
+import time
+from typing import Optional
+
+from controllers.single_flight import RequestCancelled
+
+
+class DeadlineExceeded(RequestCancelled):
+    """Raised when the deadline of a request expired before one of its stages"""
+
+
+class RenderDeadline:
+    """Deadline and cancellation of a request. The render checks it before each of its expensive stages, so that no
+    more work is done for a client that won't read the result."""
+
+    def __init__(self, time_remaining: Optional[float] = None):
+        """time_remaining is in seconds, None meaning no deadline"""
+        self.expires_at = None if time_remaining is None else time.monotonic() + time_remaining
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def from_epoch(cls, expires_at: Optional[float]) -> 'RenderDeadline':
+        """Deadline expiring at the given wall-clock time, in seconds since the epoch, None meaning no deadline"""
+        return cls(None if expires_at is None else expires_at - time.time())
+
+    def expires_at_epoch(self) -> Optional[float]:
+        """Wall-clock time of the expiry in seconds since the epoch, which unlike the monotonic clock can be sent
+        to another process"""
+        if self.expires_at is None:
+            return None
+        return time.time() + self.expires_at - time.monotonic()
+
+    def time_remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.)
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def cancel(self) -> None:
+        """Marks the request as cancelled by its client"""
+        self._cancelled.set()
+
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def is_active(self) -> bool:
+        """True while the client still waits for the result"""
+        return not self.cancelled() and not self.expired()
+
+    def check(self, stage: Optional[str] = None) -> None:
+        """Raises RequestCancelled or DeadlineExceeded if the stage shouldn't be started, or without a stage if the
+        client doesn't wait for the result anymore"""
+        before = f" before the {stage} stage" if stage is not None else ""
+        if self.cancelled():
+            raise RequestCancelled(f"Request cancelled{before}.")
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline exceeded{before}.")
@@ -1,51 +1,373 @@
 """Helper to analyse and process a grpc based request"""
-import io
 
 import json
 import logging
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple, Union
 
-import time
+import numpy as np
 
+from controllers.arrow_decoder import decode_table, is_ohcl, read_table
+from controllers.deadline import RenderDeadline
+from controllers.metrics import StageTimer, get_metrics
+from controllers.image_cache import cache_key, get_image_cache, grid_cache_key
+from controllers.request_decoder import decode_collection, parse_options, parse_options_message, \
+    parse_token_info, parse_token_info_message
+from controllers.series_store import SeriesKey, SeriesStore, get_series_store
+from controllers.single_flight import SingleFlight
+from controllers.worker_pool import get_worker_pool
+from graph.banners import get_banner_cache, get_text_metrics
+from graph.figure_skeletons import get_skeleton_cache
 from graph.graph_painter import GraphPainter
+from graph.grid_painter import GridPainter, GridPanel
+from graph.output import EncodedChart
+from models.columnar import AbsColumnarCollection, ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint, \
+    to_columnar
 from models.graph_options import GraphOption
 from models.painting_types import PaintingType
-from models.price_point import CollectionSingleTradePoint, CollectionOhcl, AbsCollection
 from models.token_info import TokenInfo
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+# identical requests processed at the same time are painted once
+in_flight = SingleFlight()
+# collection painted for each type of request
+_COLUMNAR_TYPES = {PaintingType.CHART: ColumnarCollectionSingleTradePoint,
+                   PaintingType.CANDLESTICK: ColumnarCollectionOhcl}
+# stats of the caches and of the store that only ever increase, exported as counters
+_COUNTER_STATS = frozenset(('hits', 'misses', 'evictions', 'expirations', 'reads', 'appends', 'candles'))
 
-def process_chart_request(request, req_type: PaintingType):
+
+def process_chart_request(request, req_type: PaintingType, deadline: Optional[RenderDeadline] = None,
+                          headers: Optional['BatchHeaders'] = None):
     """Process a chart request based on the painting type required.
-    Returns the image as a byte array representing a png"""
-    t0 = time.time()
-    datas, token_info, options = _analyse_chart_request(request, req_type)
-    gp = GraphPainter(datas, token_info, options)
-    match req_type:
-        case PaintingType.CANDLESTICK:
-            img = gp.paint_candlestick()
-        case PaintingType.CHART:
-            img = gp.paint_simple_chart()
-    logging.debug(f"Took {time.time() - t0}s to paint the chart.")
+    Returns the image encoded in the export type of the options, or its encoded variants if requested.
+    The deadline is checked before each stage of the processing, RequestCancelled or DeadlineExceeded is raised
+    when the client won't read the result. The options and the token info of a request of a batch are taken from
+    the headers of the batch."""
+    return _process(request, req_type, partial(_analyse_chart_request, headers=headers), deadline)
+
+
+def process_chart_request_v2(request, req_type: PaintingType, deadline: Optional[RenderDeadline] = None):
+    """Same as process_chart_request, for the binary ChartRequestV2 messages"""
+    return _process(request, req_type, _analyse_chart_request_v2, deadline)
+
 
-    with io.BytesIO() as output:
-        img.save(output, options.export_type)
-        data = output.getvalue()
-    logging.info(f"Took {time.time() - t0}s to process the chart.")
+def _process(request, req_type: PaintingType, analyse, deadline: Optional[RenderDeadline]) -> EncodedChart:
+    """Analyses the request with the given function and paints it. The duration of each stage is recorded in the
+    metrics."""
+    timer = StageTimer(req_type)
+    try:
+        with timer.stage('total'):
+            if deadline is not None:
+                deadline.check('parse')
+            datas, token_info, options = analyse(request, req_type, timer)
+            timer.options = options
+            return _paint(datas, token_info, options, req_type, timer, deadline)
+    finally:
+        get_metrics().record(timer)
+
+
+def _paint(datas, token_info: TokenInfo, options: GraphOption, req_type: PaintingType, timer: StageTimer,
+           deadline: Optional[RenderDeadline] = None) -> EncodedChart:
+    """Paints the chart and returns it encoded in the export type of the options. Identical requests are served
+    from the image cache, or wait for the one being painted."""
+    datas = _prepare(datas, options, req_type, timer)
+    key = cache_key(datas, token_info, options, req_type)
+    cache = get_image_cache()
+    if cache is not None:
+        data = cache.get(key)
+        if data is not None:
+            logging.info(f"Took {timer.elapsed()}s to process the chart (cached).")
+            return data
+    data = in_flight.do(key, lambda: _render(key, datas, token_info, options, req_type, timer, deadline),
+                        deadline.check if deadline is not None else None)
+    logging.info(f"Took {timer.elapsed()}s to process the chart.")
     return data
 
 
-def _analyse_chart_request(request, req_type: PaintingType) -> (AbsCollection, TokenInfo, GraphOption):
-    """Analyses a chart request and returns the casted classes"""
-    json_class_collection = json.loads(request.datas)
-    json_class_token_info = json.loads(request.tokenInfo)
-    json_class_options = json.loads(request.options)
+def _render(key: bytes, datas, token_info: TokenInfo, options: GraphOption, req_type: PaintingType,
+            timer: StageTimer, deadline: Optional[RenderDeadline] = None) -> EncodedChart:
+    """Paints and encodes the chart, in a worker process if there's a worker pool, then caches it under the given
+    key"""
+    pool = get_worker_pool()
+    with get_metrics().in_flight('renders'):
+        if pool is not None:
+            data = pool.render(datas, token_info, options, req_type, deadline, timer)
+        else:
+            data = encode_chart(datas, token_info, options, req_type, deadline, timer)
+    logging.debug(f"Took {timer.elapsed()}s to paint the chart.")
+    cache = get_image_cache()
+    if cache is not None:
+        cache.put(key, data)
+    return data
+
+
+def _prepare(datas, options: GraphOption, req_type: PaintingType, timer: StageTimer) -> AbsColumnarCollection:
+    """Columns of the points painted, resampled if needed"""
+    datas = to_columnar(datas)
+    if options.interval is not None or not isinstance(datas, _COLUMNAR_TYPES[req_type]):
+        with timer.stage('resample'):
+            datas = resample(datas, options, req_type)
+    return datas
+
+
+class BatchHeaders:
+    """Options and token infos of the chart requests of a batch. Each distinct raw json is parsed once, by the
+    first request needing it, and kept for the whole batch however many there are; the requests sending the same
+    one meanwhile wait for it. An invalid one keeps the message of its error, raised again for each request sending
+    it."""
+
+    def __init__(self):
+        # the parsed header, or the message of its error
+        self._parsed: Dict[Tuple[Callable, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def _parse(self, parse: Callable[[str], Union[GraphOption, TokenInfo]], raw: str) -> Union[GraphOption, TokenInfo]:
+        with self._lock:
+            future = self._parsed.get((parse, raw))
+            first = future is None
+            if first:
+                future = self._parsed[(parse, raw)] = Future()
+        if first:
+            try:
+                future.set_result((parse(raw), None))
+            except ValueError as e:
+                future.set_result((None, str(e)))
+            except Exception as e:
+                future.set_exception(e)
+                raise
+        parsed, error = future.result()
+        if error is not None:
+            raise ValueError(error)
+        return parsed
+
+    def options(self, raw: str) -> GraphOption:
+        return self._parse(parse_options, raw)
+
+    def token_info(self, raw: str) -> TokenInfo:
+        return self._parse(parse_token_info, raw)
+
+
+def process_grid_request(request, deadline: Optional[RenderDeadline] = None) -> EncodedChart:
+    """Paints the panels of a GridRequest in a single figure. Returns the grid encoded in the export type of the
+    options, or the variants holding each of its panels if they're cropped. The grids are always painted in this
+    process, with its Kaleido renderers."""
+    timer = StageTimer(kind='grid')
+    try:
+        with timer.stage('total'):
+            if deadline is not None:
+                deadline.check('parse')
+            with timer.stage('validation'):
+                options = parse_options_message(request.options.SerializeToString(deterministic=True))
+            timer.options = options
+            panels = []
+            for panel in request.panels:
+                req_type = PaintingType.CANDLESTICK if panel.candlestick else PaintingType.CHART
+                datas, token_info, _ = _analyse_chart_request_v2(panel.chart, req_type, timer)
+                datas = _prepare(datas, options, req_type, timer)
+                title = panel.title if panel.HasField('title') else token_info.name
+                panels.append(GridPanel(GraphPainter(datas, token_info, options), req_type, title))
+            columns = request.columns if request.HasField('columns') else None
+            # checks the grid before looking it up
+            grid = GridPainter(panels, options, columns, **stage_hooks(deadline, timer))
+            key = grid_cache_key([cache_key(panel.painter.datas, panel.painter.token_info, options, panel.req_type)
+                                  for panel in panels], [panel.title for panel in panels], grid.columns,
+                                 request.crop_panels)
+            cache = get_image_cache()
+            data = cache.get(key) if cache is not None else None
+            if data is None:
+                data = in_flight.do(key, lambda: _render_grid(key, grid, request.crop_panels),
+                                    deadline.check if deadline is not None else None)
+            logging.info(f"Took {timer.elapsed()}s to process a grid of {len(panels)} charts.")
+            return data
+    finally:
+        get_metrics().record(timer)
+
+
+def _render_grid(key: bytes, grid: GridPainter, crop_panels: bool) -> EncodedChart:
+    with get_metrics().in_flight('renders'):
+        data = grid.encode(crop_panels)
+    cache = get_image_cache()
+    if cache is not None:
+        cache.put(key, data)
+    return data
+
+
+def resample(datas: AbsColumnarCollection, options: GraphOption, req_type: PaintingType) -> AbsColumnarCollection:
+    """Resamples the points by the interval of the options. Trades sent for a candlestick are aggregated in candles
+    of that interval."""
+    if req_type == PaintingType.CANDLESTICK and isinstance(datas, ColumnarCollectionSingleTradePoint):
+        if options.interval is None:
+            raise ValueError("An interval is needed to paint a candlestick from trades")
+        return datas.to_ohcl(options.interval, options.timezone, options.fill_gaps)
+    if options.interval is None:
+        return datas
+    return datas.resample(options.interval, options.timezone, options.fill_gaps)
+
+
+def stage_hooks(deadline: Optional[RenderDeadline], timer: Optional[StageTimer]) -> dict:
+    """Arguments of the painters checking the deadline before each stage of the painting and timing it"""
+    return dict(check_stage=deadline.check if deadline is not None else None,
+                time_stage=timer.stage if timer is not None else None)
+
+
+def encode_chart(datas, token_info: TokenInfo, options: GraphOption, req_type: PaintingType,
+                 deadline: Optional[RenderDeadline] = None, timer: Optional[StageTimer] = None) -> EncodedChart:
+    """Paints the chart and encodes it in the export type of the options, or encodes its variants"""
+    gp = GraphPainter(datas, token_info, options, **stage_hooks(deadline, timer))
     match req_type:
-        case PaintingType.CHART:
-            datas = CollectionSingleTradePoint(**json_class_collection)
         case PaintingType.CANDLESTICK:
-            datas = CollectionOhcl(**json_class_collection)
-    token_info = TokenInfo(**json_class_token_info)
-    options = GraphOption(**json_class_options)
+            return gp.encode_candlestick()
+        case PaintingType.CHART:
+            return gp.encode_simple_chart()
+
+
+def append_candles(request) -> (int, int):
+    """Appends the candles of an AppendCandlesRequest to the series store. Returns the number of candles written
+    and the size of the series."""
+    store = _series_store()
+    key = SeriesKey(request.chain_name, request.address, request.timeframe)
+    candles = ColumnarCollectionOhcl(dates=_decode_timestamps(request.timestamps),
+                                     opens=np.array(request.opens, dtype=np.float64),
+                                     highs=np.array(request.highs, dtype=np.float64),
+                                     lows=np.array(request.lows, dtype=np.float64),
+                                     closes=np.array(request.closes, dtype=np.float64),
+                                     volumes=np.array(request.volumes, dtype=np.float64) if len(request.volumes)
+                                     else None)
+    appended = store.append(key, candles)
+    return appended, store.size(key)
+
+
+def _series_store() -> SeriesStore:
+    store = get_series_store()
+    if store is None:
+        raise ValueError("The series store is disabled")
+    return store
+
+
+def service_metrics() -> Tuple[Dict[str, float], Dict[str, float]]:
+    """Gauges and counters of the caches, of the series store and of the request coalescing, exported with the
+    metrics. They're read once, so that both come from the same snapshot."""
+    stats = {}
+    for prefix, source in (('figure_skeletons', get_skeleton_cache()), ('text_metrics', get_text_metrics()),
+                           ('banner_cache', get_banner_cache()), ('image_cache', get_image_cache()),
+                           ('series_store', get_series_store())):
+        if source is not None:
+            stats.update({f'{prefix}_{name}': value for name, value in source.stats().items()})
+    gauges, counters = {}, {'coalesced_requests': in_flight.coalesced}
+    for name, value in stats.items():
+        (counters if name.rsplit('_', 1)[-1] in _COUNTER_STATS else gauges)[name] = value
+    return gauges, counters
+
+
+def _parse_headers(request, headers: Optional[BatchHeaders]) -> Tuple[TokenInfo, GraphOption]:
+    """Token info and options of a chart request, from the headers of its batch if it's part of one"""
+    if headers is not None:
+        return headers.token_info(request.tokenInfo), headers.options(request.options)
+    return parse_token_info(request.tokenInfo), parse_options(request.options)
+
+
+def _analyse_chart_request(request, req_type: PaintingType, timer: Optional[StageTimer] = None,
+                           headers: Optional[BatchHeaders] = None) -> (AbsColumnarCollection, TokenInfo, GraphOption):
+    """Analyses a chart request and returns the casted classes. The points are decoded straight into columns, see
+    controllers.request_decoder, or mapped from the Arrow or Parquet table if there's one."""
+    timer = timer or StageTimer()
+    if request.arrow or request.parquet:
+        return _analyse_table_request(request, req_type, timer, headers)
+    with timer.stage('decode'):
+        json_class_collection = json.loads(request.datas)
+    with timer.stage('validation'):
+        match req_type:
+            case PaintingType.CHART:
+                datas = decode_collection(json_class_collection, ohcl=False)
+            case PaintingType.CANDLESTICK if _are_trades(json_class_collection):
+                # aggregated in candles once casted to columns
+                datas = decode_collection(json_class_collection, ohcl=False)
+            case PaintingType.CANDLESTICK:
+                datas = decode_collection(json_class_collection, ohcl=True)
+        token_info, options = _parse_headers(request, headers)
+    return datas, token_info, options
+
+
+def _analyse_table_request(request, req_type: PaintingType, timer: StageTimer,
+                           headers: Optional[BatchHeaders] = None) -> (AbsColumnarCollection, TokenInfo, GraphOption):
+    """Analyses a chart request whose datas are an Arrow IPC stream or a Parquet file"""
+    with timer.stage('decode'):
+        table = read_table(request.arrow, 'arrow') if request.arrow else read_table(request.parquet, 'parquet')
+    with timer.stage('validation'):
+        # a candlestick may be painted from trades, aggregated in candles once casted to columns
+        datas = decode_table(table, ohcl=req_type == PaintingType.CANDLESTICK and is_ohcl(table))
+        token_info, options = _parse_headers(request, headers)
+    return datas, token_info, options
+
+
+def _are_trades(json_collection: dict) -> bool:
+    """Whether a json collection holds single trade points rather than candles"""
+    points = json_collection.get('coll') or [{}]
+    return 'value' in points[0]
+
+
+def _decode_timestamps(timestamps) -> np.ndarray:
+    """Dates of delta encoded unix timestamps in milliseconds"""
+    return np.cumsum(np.array(timestamps, dtype=np.int64)).astype('datetime64[ms]')
+
+
+def _analyse_chart_request_v2(request, req_type: PaintingType,
+                              timer: Optional[StageTimer] = None) -> (AbsColumnarCollection, TokenInfo, GraphOption):
+    """Analyses a ChartRequestV2 and returns the casted classes. The columns are decoded straight into numpy
+    arrays, the points are never instantiated one by one."""
+    timer = timer or StageTimer()
+    if request.HasField('series'):
+        return _analyse_stored_chart_request(request, req_type, timer)
+    with timer.stage('decode'):
+        dates = _decode_timestamps(request.timestamps)
+        volumes = np.array(request.volumes, dtype=np.float64) if len(request.volumes) else None
+        match req_type:
+            case PaintingType.CHART:
+                datas = ColumnarCollectionSingleTradePoint(dates=dates,
+                                                           values=np.array(request.values, dtype=np.float64),
+                                                           volumes=volumes)
+            case PaintingType.CANDLESTICK if len(request.values) and not len(request.opens):
+                # trades, aggregated in candles later on
+                datas = ColumnarCollectionSingleTradePoint(dates=dates,
+                                                           values=np.array(request.values, dtype=np.float64),
+                                                           volumes=volumes)
+            case PaintingType.CANDLESTICK:
+                datas = ColumnarCollectionOhcl(dates=dates,
+                                               opens=np.array(request.opens, dtype=np.float64),
+                                               highs=np.array(request.highs, dtype=np.float64),
+                                               lows=np.array(request.lows, dtype=np.float64),
+                                               closes=np.array(request.closes, dtype=np.float64),
+                                               volumes=volumes)
+    with timer.stage('validation'):
+        token_info = parse_token_info_message(request.tokenInfo.SerializeToString(deterministic=True))
+        options = parse_options_message(request.options.SerializeToString(deterministic=True))
+    return datas, token_info, options
+
+
+def _analyse_stored_chart_request(request, req_type: PaintingType,
+                                  timer: StageTimer) -> (AbsColumnarCollection, TokenInfo, GraphOption):
+    """Analyses a ChartRequestV2 painting a window of a stored series, keyed by the chain of the options and the
+    address of the token. A simple chart is painted from the closes."""
+    with timer.stage('validation'):
+        token_info = parse_token_info_message(request.tokenInfo.SerializeToString(deterministic=True))
+        options = parse_options_message(request.options.SerializeToString(deterministic=True))
+        if not token_info.address:
+            raise ValueError("The address of the token is needed to paint a stored series")
+    window = request.series
+    key = SeriesKey(options.chain_name, token_info.address, window.timeframe)
+    with timer.stage('decode'):
+        datas = _series_store().read(key,
+                                     start=np.datetime64(window.start, 'ms') if window.HasField('start') else None,
+                                     end=np.datetime64(window.end, 'ms') if window.HasField('end') else None,
+                                     limit=window.limit if window.HasField('limit') else None)
+    if datas.size() == 0:
+        raise ValueError(f"No candles stored in the series {'/'.join(key)} for this window")
+    if req_type == PaintingType.CHART:
+        datas = ColumnarCollectionSingleTradePoint(dates=datas.dates(), values=datas.closes(),
+                                                   volumes=datas.volumes())
     return datas, token_info, options
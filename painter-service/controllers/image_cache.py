@@ -0,0 +1,134 @@
+"""Cache of the encoded images, keyed by the content of the request that painted them"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Union
+
+from graph.output import EncodedChart, encoded_size
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+from models.token_info import TokenInfo
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 30.0
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def cache_key(datas: Union[ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint], token_info: TokenInfo,
+              options: GraphOption, req_type: PaintingType) -> bytes:
+    """Stable hash of everything an image depends on. The datas are hashed from the bytes of their columns, so
+    they have to be normalized (columnar, sorted) beforehand."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(req_type.name.encode())
+    h.update(type(datas).__name__.encode())
+    for name, column in sorted(datas.columns().items()):
+        h.update(name.encode())
+        h.update(str(column.dtype).encode())
+        h.update(column.tobytes())
+    h.update(token_info.json(sort_keys=True).encode())
+    # the theme is derived from theme_name
+    h.update(json.dumps(options.dict(exclude={'theme'}), sort_keys=True).encode())
+    return h.digest()
+
+
+def grid_cache_key(panel_keys: Sequence[bytes], titles: Sequence[str], columns: int, crop_panels: bool) -> bytes:
+    """Stable hash of a grid, from the cache keys of its panels"""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f'grid/{columns}/{crop_panels}'.encode())
+    for key, title in zip(panel_keys, titles):
+        h.update(key)
+        h.update(json.dumps(title).encode())
+    return h.digest()
+
+
+class _Entry(NamedTuple):
+    data: EncodedChart
+    expires_at: float
+
+
+class ImageCache:
+    """LRU cache of encoded images (or of their variants), bounded by the total size of the images. Each entry
+    expires `ttl` seconds after being stored."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: bytes) -> Optional[EncodedChart]:
+        """Returns the image stored under the key, None if there's none or if it expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.data
+
+    def put(self, key: bytes, data: EncodedChart) -> None:
+        """Stores an image, evicting the least recently used ones if the cache gets too big. Images bigger than the
+        cache itself are not stored."""
+        if encoded_size(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(data, self._clock() + self.ttl)
+            self._size += encoded_size(data)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: bytes) -> None:
+        self._size -= encoded_size(self._entries.pop(key).data)
+
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, expirations=self.expirations,
+                    entries=len(self._entries), size_bytes=self._size)
+
+
+_cache: Optional[ImageCache] = ImageCache()
+_cache_lock = threading.Lock()
+
+
+def configure_image_cache(max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL_SECONDS) -> None:
+    """Replaces the shared image cache. A size or a ttl of 0 disables the cache."""
+    global _cache
+    with _cache_lock:
+        _cache = ImageCache(max_bytes, ttl) if max_bytes > 0 and ttl > 0 else None
+    logging.info(f"Image cache configured with {max_bytes} bytes and a ttl of {ttl}s.")
+
+
+def get_image_cache() -> Optional[ImageCache]:
+    """Returns the shared image cache, None if it's disabled"""
+    return _cache
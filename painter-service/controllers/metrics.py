@@ -0,0 +1,163 @@
+"""Latency histograms of the stages of a render, with the number of requests in flight"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+
+# upper bounds of the buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10., float('inf'))
+# options changing the work done by a render, used as label of the histograms
+LABELLED_OPTIONS = ('bollinger_bands', 'fibonacci_bands', 'rsi', 'average', 'finance')
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def options_label(options: Optional[GraphOption]) -> str:
+    """Enabled options joined by a '+', 'none' if there's none"""
+    if options is None:
+        return 'unknown'
+    return '+'.join(name for name in LABELLED_OPTIONS if getattr(options, name)) or 'none'
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus sense"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[int]:
+        res, total = [], 0
+        for count in self.counts:
+            total += count
+            res.append(total)
+        return res
+
+
+class StageTimer:
+    """Durations of the stages of a single request. They are recorded in the registry once the request is done, when
+    all its labels are known."""
+
+    def __init__(self, req_type: Optional[PaintingType] = None, kind: Optional[str] = None):
+        """The kind labels the requests painting something else than a single chart, such as 'grid'"""
+        self.req_type = req_type
+        self.kind = kind
+        self.options: Optional[GraphOption] = None
+        self.durations: Dict[str, float] = {}
+        self.started_at = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """Seconds since the creation of the timer"""
+        return time.perf_counter() - self.started_at
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.) + seconds
+
+    def labels(self) -> Labels:
+        req_type = self.req_type.name.lower() if self.req_type is not None else self.kind or 'unknown'
+        return ('type', req_type), ('options', options_label(self.options))
+
+
+class MetricsRegistry:
+    """Histograms of the stage latencies by stage, painting type and options, plus gauges of the requests in
+    flight"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._in_flight: Dict[str, int] = {}
+
+    def observe(self, name: str, seconds: float, labels: Labels = ()) -> None:
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = Histogram()
+            histogram.observe(seconds)
+
+    def record(self, timer: StageTimer) -> None:
+        """Records the durations of a finished request"""
+        labels = timer.labels()
+        for stage, seconds in timer.durations.items():
+            self.observe('stage_seconds', seconds, (('stage', stage),) + labels)
+
+    @contextmanager
+    def in_flight(self, name: str = 'requests'):
+        """Counts the requests being processed"""
+        with self._lock:
+            self._in_flight[name] = self._in_flight.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight[name] -= 1
+
+    def gauges(self) -> Dict[str, int]:
+        with self._lock:
+            return {f'{name}_in_flight': count for name, count in self._in_flight.items()}
+
+    def histograms(self) -> List[Tuple[str, Labels, Histogram]]:
+        with self._lock:
+            return [(name, labels, histogram) for (name, labels), histogram in sorted(self._histograms.items())]
+
+    def to_prometheus(self, extra_gauges: Optional[Dict[str, float]] = None,
+                      extra_counters: Optional[Dict[str, float]] = None, prefix: str = 'graph_painter_') -> str:
+        """Dumps the metrics in the Prometheus text exposition format. The counters only ever increase, their names
+        get the `_total` suffix."""
+        lines = []
+        described = set()
+        for name, labels, histogram in self.histograms():
+            name = prefix + name
+            if name not in described:
+                lines.append(f'# TYPE {name} histogram')
+                described.add(name)
+            for bound, count in zip(histogram.buckets, histogram.cumulative_counts()):
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {count}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum}')
+            lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+        gauges = self.gauges()
+        gauges.update(extra_gauges or {})
+        for name, value in sorted(gauges.items()):
+            lines.append(f'# TYPE {prefix}{name} gauge')
+            lines.append(f'{prefix}{name} {value}')
+        for name, value in sorted((extra_counters or {}).items()):
+            lines.append(f'# TYPE {prefix}{name}_total counter')
+            lines.append(f'{prefix}{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Returns the metrics registry of the process"""
+    return _registry
@@ -0,0 +1,177 @@
+"""Decoding of the json chart requests straight into columnar collections.
+
+The json collections were validated by the pydantic models, one model per point: this decoder reads each field of
+every point into a numpy column instead, and parses the dates in bulk. The resulting collections are identical to
+the columnar version of the pydantic ones. In strict mode, the points the pydantic models would refuse raise a
+ValueError as well.
+
+The options and the token infos of the requests are parsed once per distinct raw value."""
+import warnings
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+from google.protobuf.json_format import MessageToDict
+from pydantic.datetime_parse import parse_datetime
+
+import protobuf.graphPainter_pb2 as pb2
+from models.columnar import AbsColumnarCollection, ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint, \
+    DATE_DTYPE, to_naive_utc
+from models.graph_options import GraphOption
+from models.token_info import TokenInfo
+
+# json field of each column
+SINGLE_TRADE_POINT_FIELDS = {'values': 'value'}
+OHCL_FIELDS = {'opens': 'v_open', 'highs': 'v_high', 'lows': 'v_low', 'closes': 'v_close'}
+# pydantic reads the numbers above it as unix timestamps in milliseconds rather than seconds
+MS_WATERSHED = 2e10
+# length of the longest ISO 8601 date parsed in bulk, without timezone: pydantic reads up to 12 digits of fraction
+ISO_MAX_LENGTH = 32
+# number of distinct options and token infos kept parsed
+PARSED_CACHE_SIZE = 256
+
+_strict = True
+
+
+def configure_request_decoder(strict: bool = True) -> None:
+    """Whether the points are validated like the pydantic models would do, a trusted client can skip it"""
+    global _strict
+    _strict = strict
+
+
+def strict_decoding() -> bool:
+    return _strict
+
+
+def decode_collection(json_collection: dict, ohcl: bool, strict: Optional[bool] = None) -> AbsColumnarCollection:
+    """Columnar collection of the points of a json collection, in the order they were sent"""
+    strict = _strict if strict is None else strict
+    if type(json_collection) is not dict:
+        raise ValueError("The collection must be an object")
+    points = json_collection.get('coll') or []
+    if type(points) is not list or not all(type(p) is dict for p in points):
+        raise ValueError("The points of the collection must be objects")
+    fields = OHCL_FIELDS if ohcl else SINGLE_TRADE_POINT_FIELDS
+    columns = {name: _float_column([p.get(field) for p in points], field, strict) for name, field in fields.items()}
+    volumes = _float_column([p.get('volume') for p in points], 'volume', strict=False)
+    dates = parse_dates([p.get('date') for p in points])
+    if ohcl:
+        return ColumnarCollectionOhcl(dates=dates, volumes=volumes, **columns)
+    return ColumnarCollectionSingleTradePoint(dates=dates, volumes=volumes, **columns)
+
+
+def _float_column(values: List, field: str, strict: bool) -> np.ndarray:
+    """float64 column of the values, null values being NaN. Refused in strict mode, as the field is required."""
+    if strict and values.count(None):
+        raise ValueError(f"Field {field} is required, got null or no value")
+    try:
+        column = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f"Field {field} must hold numbers")
+    # a list of lists makes a 2d array
+    if column.ndim != 1:
+        raise ValueError(f"Field {field} must hold numbers")
+    return column
+
+
+def parse_dates(dates: Sequence) -> np.ndarray:
+    """Parses the dates like pydantic does, to naive UTC datetime64 dates. ISO 8601 strings without timezone or in
+    UTC, and unix timestamps, are parsed in bulk; the others one by one."""
+    if not dates:
+        return np.zeros(0, dtype=DATE_DTYPE)
+    if all(type(d) is str for d in dates):
+        parsed = _parse_iso_dates(np.array(dates))
+        if parsed is not None:
+            return parsed
+    elif all(type(d) in (int, float) for d in dates):
+        timestamps = np.array(dates, dtype=np.float64)
+        # pydantic refuses NaN and clips the infinities, left to it
+        if np.isfinite(timestamps).all():
+            return _parse_timestamps(timestamps)
+    try:
+        return np.array([to_naive_utc(parse_datetime(d)) for d in dates], dtype=DATE_DTYPE)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid date: {e}")
+
+
+def _parse_iso_dates(dates: np.ndarray) -> Optional[np.ndarray]:
+    """Parses 'YYYY-MM-DD[T ]HH:MM[:SS[.f{1,12}]][Z]' strings, None if any of them doesn't have this shape"""
+    # the characters of the fixed width unicode strings, padded with zeros
+    chars = dates.view(np.uint32).reshape(len(dates), -1)
+    lengths = np.count_nonzero(chars, axis=1)
+    if chars.shape[1] <= 10 or lengths.min() < 16 or not np.isin(chars[:, 10], (ord('T'), ord(' '))).all():
+        return None
+    rows = np.arange(len(dates))
+    utc = chars[rows, lengths - 1] == ord('Z')
+    if utc.any():
+        chars = chars.copy()
+        chars[rows[utc], lengths[utc] - 1] = 0
+        lengths = lengths - utc
+        dates = chars.view(dates.dtype).ravel()
+    # numpy parses more forms than pydantic, such as dates without time or an empty fraction: the shape is checked
+    # here, the values by numpy
+    if not _iso_shape(chars, lengths).all():
+        return None
+    with warnings.catch_warnings():
+        # numpy warns about the timezone offsets, which are left to pydantic
+        warnings.simplefilter('error')
+        try:
+            return dates.astype(DATE_DTYPE)
+        except (ValueError, Warning):
+            return None
+
+
+def _iso_shape(chars: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Whether each date has the shape 'YYYY-MM-DD?HH:MM[:SS[.f{1,12}]]', the separator at 10 being checked by the
+    caller"""
+    # wide enough for the longest shape, the missing characters are zeros
+    chars = np.pad(chars, ((0, 0), (0, max(ISO_MAX_LENGTH + 1 - chars.shape[1], 0))))
+    digits = (chars >= ord('0')) & (chars <= ord('9'))
+    ok = digits[:, [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15]].all(axis=1)
+    ok &= (chars[:, 4] == ord('-')) & (chars[:, 7] == ord('-')) & (chars[:, 13] == ord(':'))
+    seconds = lengths > 16
+    ok &= ~seconds | (lengths >= 19) & (chars[:, 16] == ord(':')) & digits[:, 17] & digits[:, 18]
+    fraction = lengths > 19
+    ok &= ~fraction | (lengths >= 21) & (lengths <= ISO_MAX_LENGTH) & (chars[:, 19] == ord('.'))
+    positions = np.arange(chars.shape[1])
+    in_fraction = (positions >= 20) & (positions < lengths[:, None])
+    return ok & (digits | ~in_fraction).all(axis=1)
+
+
+def _parse_timestamps(timestamps: np.ndarray) -> np.ndarray:
+    """Unix timestamps in seconds, or in milliseconds above MS_WATERSHED, as pydantic reads them"""
+    if not np.isfinite(timestamps).all():
+        raise ValueError("Invalid date: the timestamps must be finite")
+    while True:
+        above = np.abs(timestamps) > MS_WATERSHED
+        if not above.any():
+            break
+        timestamps = np.where(above, timestamps / 1000, timestamps)
+    return np.round(timestamps * 1_000_000).astype(np.int64).astype(DATE_DTYPE)
+
+
+@lru_cache(maxsize=PARSED_CACHE_SIZE)
+def parse_options(raw: str) -> GraphOption:
+    """Options of a request, parsed once per raw json. The instance is shared and must not be modified."""
+    return GraphOption.parse_raw(raw)
+
+
+@lru_cache(maxsize=PARSED_CACHE_SIZE)
+def parse_token_info(raw: str) -> TokenInfo:
+    """Token info of a request, parsed once per raw json. The instance is shared and must not be modified."""
+    return TokenInfo.parse_raw(raw)
+
+
+@lru_cache(maxsize=PARSED_CACHE_SIZE)
+def parse_options_message(raw: bytes) -> GraphOption:
+    """Options of a ChartRequestV2, parsed once per serialized GraphOptionMessage"""
+    message = pb2.GraphOptionMessage.FromString(raw)
+    # only the fields set in the message are given to the model, so that the others keep their default value
+    return GraphOption(**MessageToDict(message, preserving_proto_field_name=True))
+
+
+@lru_cache(maxsize=PARSED_CACHE_SIZE)
+def parse_token_info_message(raw: bytes) -> TokenInfo:
+    """Token info of a ChartRequestV2, parsed once per serialized TokenInfoMessage"""
+    message = pb2.TokenInfoMessage.FromString(raw)
+    return TokenInfo(**MessageToDict(message, preserving_proto_field_name=True))
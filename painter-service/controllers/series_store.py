@@ -0,0 +1,176 @@
+"""Append-only store of candle series, so that the clients send a token and a time window instead of the whole
+history at each request.
+
+Each series (chain, token address, timeframe) is a directory holding one file per column, the raw little-endian
+values one after the other: `dates` in microseconds since the epoch, `opens`, `highs`, `lows`, `closes` and
+`volumes` as float64. A read maps the dates to find the window, then maps and copies the window of each column, so
+the size of the history doesn't matter. The value columns are written before the dates: after a crash, the
+columns longer than the dates are truncated when the series is opened again."""
+import logging
+import os
+import re
+import threading
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from models.columnar import ColumnarCollectionOhcl, DATE_DTYPE
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+VALUE_COLUMNS = ('opens', 'highs', 'lows', 'closes', 'volumes')
+DATES_COLUMN = 'dates'
+VALUE_DTYPE = np.dtype('<f8')
+# the parts of a key are directory names
+_KEY_PART = re.compile(r'[A-Za-z0-9_-]{1,128}')
+
+
+class SeriesKey(NamedTuple):
+    chain: str
+    address: str
+    timeframe: str
+
+    def check(self) -> 'SeriesKey':
+        for name, part in self._asdict().items():
+            if not isinstance(part, str) or not _KEY_PART.fullmatch(part):
+                raise ValueError(f"Invalid series {name} {part!r}, expected letters, digits, '_' or '-'")
+        return self
+
+
+class _Series:
+    """Files of a series, and the number of candles they hold"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        sizes = [self._file_size(name) // VALUE_DTYPE.itemsize for name in (DATES_COLUMN, *VALUE_COLUMNS)]
+        self.length = min(sizes)
+        if max(sizes) != self.length:
+            logging.warning(f"Truncating the series {path} to {self.length} candles, its columns had {sizes}.")
+            for name in (DATES_COLUMN, *VALUE_COLUMNS):
+                with open(self._file(name), 'r+b') as f:
+                    f.truncate(self.length * VALUE_DTYPE.itemsize)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _file_size(self, name: str) -> int:
+        if not os.path.exists(self._file(name)):
+            open(self._file(name), 'wb').close()
+        return os.path.getsize(self._file(name))
+
+    def _map(self, name: str, start: int, stop: int) -> np.ndarray:
+        dtype = np.dtype(DATE_DTYPE) if name == DATES_COLUMN else VALUE_DTYPE
+        if stop <= start:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode='r', offset=start * dtype.itemsize,
+                         shape=(stop - start,))
+
+    def last_date(self) -> Optional[np.datetime64]:
+        return self._map(DATES_COLUMN, self.length - 1, self.length)[0] if self.length else None
+
+    def window(self, start: Optional[np.datetime64], end: Optional[np.datetime64],
+               limit: Optional[int]) -> Dict[str, np.ndarray]:
+        """Copies of the columns between the two dates, both included"""
+        dates = self._map(DATES_COLUMN, 0, self.length)
+        lo = int(np.searchsorted(dates, start, 'left')) if start is not None else 0
+        hi = int(np.searchsorted(dates, end, 'right')) if end is not None else self.length
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        columns = {DATES_COLUMN: np.array(dates[lo:hi])}
+        columns.update({name: np.array(self._map(name, lo, hi)) for name in VALUE_COLUMNS})
+        return columns
+
+    def write(self, at: int, columns: Dict[str, np.ndarray]) -> None:
+        """Writes the columns from the candle `at`, the dates last"""
+        for name in (*VALUE_COLUMNS, DATES_COLUMN):
+            with open(self._file(name), 'r+b') as f:
+                f.seek(at * VALUE_DTYPE.itemsize)
+                f.write(columns[name].tobytes())
+        self.length = at + len(columns[DATES_COLUMN])
+
+
+class SeriesStore:
+    """Candle series stored under a directory, see the module documentation. Safe to use from several threads of
+    a single process."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._series: Dict[SeriesKey, _Series] = {}
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.appends = 0
+        self.appended_candles = 0
+
+    def _get(self, key: SeriesKey, create: bool = False) -> Optional[_Series]:
+        """Opens the series, None if it was never appended to unless it's created. A read doesn't touch the disk
+        nor keep anything for a series that doesn't exist."""
+        key.check()
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                path = os.path.join(self.root, *key)
+                if not create and not os.path.isdir(path):
+                    return None
+                series = self._series[key] = _Series(path)
+            return series
+
+    def append(self, key: SeriesKey, candles: ColumnarCollectionOhcl) -> int:
+        """Appends the candles newer than the last stored one, which is replaced if it's sent again. The candles
+        have to be sorted by date. Returns the number of candles written."""
+        dates = candles.dates()
+        if len(dates) > 1 and np.any(dates[1:] <= dates[:-1]):
+            raise ValueError("The candles appended must be sorted by date, without duplicates")
+        columns = {DATES_COLUMN: dates, 'opens': candles.opens(), 'highs': candles.highs(), 'lows': candles.lows(),
+                   'closes': candles.closes(), 'volumes': candles.volumes()}
+        series = self._get(key, create=True)
+        with series.lock:
+            last = series.last_date()
+            first = 0 if last is None else int(np.searchsorted(dates, last, 'left'))
+            at = series.length if last is None or first == len(dates) or dates[first] != last else series.length - 1
+            written = {name: np.ascontiguousarray(column[first:]) for name, column in columns.items()}
+            if len(written[DATES_COLUMN]):
+                series.write(at, written)
+            self.appends += 1
+            self.appended_candles += len(written[DATES_COLUMN])
+        return len(written[DATES_COLUMN])
+
+    def read(self, key: SeriesKey, start: Optional[np.datetime64] = None, end: Optional[np.datetime64] = None,
+             limit: Optional[int] = None) -> ColumnarCollectionOhcl:
+        """Candles of the series between the two dates, both included, or its last `limit` ones. A series never
+        appended to is empty."""
+        series = self._get(key)
+        if series is None:
+            columns = {name: np.empty(0, dtype=DATE_DTYPE if name == DATES_COLUMN else VALUE_DTYPE)
+                       for name in (DATES_COLUMN, *VALUE_COLUMNS)}
+        else:
+            with series.lock:
+                columns = series.window(start, end, limit)
+        self.reads += 1
+        return ColumnarCollectionOhcl(**columns)
+
+    def size(self, key: SeriesKey) -> int:
+        """Number of candles stored in the series"""
+        series = self._get(key)
+        return series.length if series is not None else 0
+
+    def stats(self) -> Dict[str, int]:
+        return dict(series=len(self._series), reads=self.reads, appends=self.appends,
+                    appended_candles=self.appended_candles)
+
+
+_store: Optional[SeriesStore] = None
+
+
+def configure_series_store(root: Optional[str]) -> None:
+    """Stores the series under the given directory, None disables the store"""
+    global _store
+    _store = SeriesStore(root) if root else None
+    logging.info(f"Series store {'configured in ' + root if root else 'disabled'}.")
+
+
+def get_series_store() -> Optional[SeriesStore]:
+    """Returns the shared series store, None if it's disabled"""
+    return _store
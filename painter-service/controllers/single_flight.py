@@ -0,0 +1,81 @@
+"""Deduplication of identical requests being processed at the same time"""
+import threading
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# how often a waiting request checks if its client is still there, in seconds
+POLL_INTERVAL = 0.05
+
+
+class RequestCancelled(Exception):
+    """Raised when the client of a request left before it was processed"""
+
+
+class _Call:
+    """A function call being processed, that other requests can wait for"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Runs a single call of a function per key at a time. Requests coming with the key of a call in progress wait
+    for it and receive its result, or its exception.
+    If the call was cancelled because its own client left, the waiting requests don't inherit the cancellation: one
+    of them makes the call again."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T], check: Optional[Callable[[], None]] = None) -> T:
+        """Returns fn(), or the result of the call in progress for the same key.
+        check is called while the request waits, it raises RequestCancelled, or a subclass of it telling why, once
+        the client doesn't wait for the result anymore."""
+        if check is not None:
+            check()
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    call.followers += 1
+                    self.coalesced += 1
+            if leader:
+                return self._lead(key, call, fn)
+            self._wait(call, check)
+            if not isinstance(call.error, RequestCancelled):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+
+    def _lead(self, key: Hashable, call: _Call, fn: Callable[[], T]) -> T:
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @staticmethod
+    def _wait(call: _Call, check: Optional[Callable[[], None]]) -> None:
+        if check is None:
+            call.done.wait()
+            return
+        while not call.done.wait(POLL_INTERVAL):
+            check()
+
+    def in_flight(self) -> int:
+        """Number of distinct calls in progress"""
+        return len(self._calls)
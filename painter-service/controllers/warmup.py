@@ -0,0 +1,80 @@
+"""Warm-up of the service, before it reports itself ready.
+
+The first export of a Kaleido renderer starts its Chromium subprocess, and the first figure of a theme loads its
+plotly template and its fonts: the first requests after a start would pay seconds for them. The renderers are
+started beforehand, then each painting type is painted with each theme from synthetic series, which also imports
+plotly and pandas, and fills the figure skeletons and the text banners. The images painted aren't cached."""
+import logging
+import time
+from typing import Dict
+
+from controllers import warmup_fixtures
+from controllers.grpc_controller import encode_chart
+from controllers.worker_pool import get_worker_pool
+from graph.renderer_pool import get_renderer_pool
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+from models.themes import GraphTheme
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+WARM_UP_POINTS = 100
+# the white theme isn't warmed up: its layout_template isn't a plotly template, it can't be painted
+THEMES = ('dark',)
+UPPER_PART_TEXT = 'Warm-up'
+
+
+def warm_up() -> None:
+    """Warms up the processes painting the charts: the workers of the worker pool if there's one, this process
+    otherwise"""
+    pool = get_worker_pool()
+    if pool is not None:
+        start = time.perf_counter()
+        pool.warm_up()
+        logging.info(f"Warmed up {pool.processes} workers in {time.perf_counter() - start:.2f}s.")
+    else:
+        warm_up_process()
+
+
+def warm_up_process() -> Dict[str, float]:
+    """Starts the renderers of this process and paints the fixtures. Returns the duration of each step."""
+    start = time.perf_counter()
+    get_renderer_pool().warm_up()
+    durations = {'renderers': time.perf_counter() - start}
+    start = time.perf_counter()
+    load_fonts()
+    durations['fonts'] = time.perf_counter() - start
+    durations.update(paint_fixtures())
+    logging.info(f"Warmed up in {sum(durations.values()):.2f}s: "
+                 f"{', '.join(f'{name} {seconds:.2f}s' for name, seconds in durations.items())}.")
+    return durations
+
+
+def load_fonts() -> None:
+    """Loads the fonts of the themes, which are otherwise loaded on their first use"""
+    # the fonts are shared by every theme
+    for font in ('upper_part_font', 'raster_font', 'raster_watermark_font'):
+        getattr(GraphTheme, font)
+
+
+def paint_fixtures() -> Dict[str, float]:
+    """Paints each painting type with each theme, and returns the duration of each by 'type/theme'. A painting that
+    fails is logged and skipped, the service can still serve the others."""
+    durations = {}
+    for req_type in PaintingType:
+        datas = warmup_fixtures.ohcl(WARM_UP_POINTS) if req_type == PaintingType.CANDLESTICK \
+            else warmup_fixtures.single_points(WARM_UP_POINTS)
+        for theme in THEMES:
+            name = f'{req_type.name.lower()}/{theme}'
+            options = GraphOption(theme_name=theme, upper_part_text=UPPER_PART_TEXT)
+            start = time.perf_counter()
+            try:
+                encode_chart(datas, warmup_fixtures.TOKEN_INFO, options, req_type)
+            except Exception as e:
+                # the first line is enough, the plotly errors list every valid value
+                message = str(e).strip().splitlines()[0] if str(e).strip() else ''
+                logging.warning(f"Warm-up painting {name} failed: {type(e).__name__} {message}")
+                continue
+            durations[name] = time.perf_counter() - start
+    return durations
@@ -0,0 +1,32 @@
+"""Series painted by the warm-up of the service: a few candles and trades along a sine wave, so that the warm-up
+neither depends on the benchmarks nor on randomness."""
+import numpy as np
+
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint
+from models.token_info import TokenInfo
+
+# one candle per minute
+INTERVAL = np.timedelta64(60, 's')
+START = np.datetime64('2021-01-01T00:00:00', 'us')
+
+TOKEN_INFO = TokenInfo(name='Warm-up', ticker='WARM')
+
+
+def _closes(size: int) -> np.ndarray:
+    return 100 + 5 * np.sin(np.arange(size) / 10)
+
+
+def _dates(size: int) -> np.ndarray:
+    return START + np.arange(size) * INTERVAL
+
+
+def ohcl(size: int) -> ColumnarCollectionOhcl:
+    closes = _closes(size)
+    opens = np.concatenate(([100.], closes[:-1]))
+    return ColumnarCollectionOhcl(dates=_dates(size), opens=opens, highs=np.maximum(opens, closes) + 0.5,
+                                  lows=np.minimum(opens, closes) - 0.5, closes=closes,
+                                  volumes=np.full(size, 1000.))
+
+
+def single_points(size: int) -> ColumnarCollectionSingleTradePoint:
+    return ColumnarCollectionSingleTradePoint(dates=_dates(size), values=_closes(size), volumes=np.full(size, 1000.))
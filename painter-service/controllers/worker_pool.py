@@ -0,0 +1,205 @@
+"""Pool of worker processes painting the charts, so that the renders of a container run on all its cores.
+
+The numeric columns of a request are copied once into a shared memory block that the worker maps, instead of
+pickling the collections point by point. The token info and the options are small and sent as dicts."""
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from controllers.deadline import RenderDeadline
+from controllers.metrics import StageTimer
+from controllers.single_flight import RequestCancelled
+from graph.output import EncodedChart
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+from models.token_info import TokenInfo
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# how often a request waiting for its worker checks if its client is still there, in seconds
+POLL_INTERVAL = 0.05
+
+_COLLECTION_CLASSES = {cls.__name__: cls for cls in (ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint)}
+
+# name, dtype, offset and number of values of each column in the shared memory block
+ColumnsLayout = List[Tuple[str, str, int, int]]
+
+
+def columns_to_shared_memory(columns: Dict[str, np.ndarray]) -> Tuple[SharedMemory, ColumnsLayout]:
+    """Copies the columns one after the other in a new shared memory block. The caller owns the block and has to
+    unlink it once the worker is done."""
+    layout = []
+    offset = 0
+    for name, column in columns.items():
+        layout.append((name, column.dtype.str, offset, len(column)))
+        # 8 bytes aligned, every column is 8 bytes wide
+        offset += column.nbytes
+    shm = SharedMemory(create=True, size=max(offset, 1))
+    for (name, dtype, start, length), column in zip(layout, columns.values()):
+        np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=start)[:] = column
+    return shm, layout
+
+
+def columns_from_shared_memory(shm: SharedMemory, layout: ColumnsLayout) -> Dict[str, np.ndarray]:
+    """Reads the columns written by columns_to_shared_memory. They are copied out of the block, so that it can be
+    closed while the render still holds them."""
+    return {name: np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=start).copy()
+            for name, dtype, start, length in layout}
+
+
+def _init_worker(renderers: int, ready) -> None:
+    """Starts the Kaleido renderers of the worker and warms it up, so that the first request doesn't pay for the
+    start of Chromium. The ready semaphore is released once done."""
+    from controllers.warmup import warm_up_process
+    from graph.renderer_pool import configure_renderer_pool
+    configure_renderer_pool(renderers)
+    warm_up_process()
+    ready.release()
+
+
+def _started() -> None:
+    """Task submitted to start the workers"""
+
+
+def _render_in_worker(shm_name: str, layout: ColumnsLayout, collection: str, token_info: dict, options: dict,
+                      req_type: str, expires_at: Optional[float],
+                      submitted_at: float) -> Tuple[EncodedChart, Dict[str, float]]:
+    """Paints a chart from the columns in shared memory. Returns the image with the duration of the stages of the
+    render, the time spent waiting for the worker included.
+    expires_at is the deadline of the request in seconds since the epoch, so that the time spent in the queue of
+    the pool counts."""
+    from controllers.grpc_controller import encode_chart
+    timer = StageTimer()
+    timer.add('worker_queue_wait', max(time.time() - submitted_at, 0.))
+    shm = SharedMemory(name=shm_name)
+    try:
+        columns = columns_from_shared_memory(shm, layout)
+    finally:
+        shm.close()
+    datas = _COLLECTION_CLASSES[collection](**columns)
+    data = encode_chart(datas, TokenInfo(**token_info), GraphOption(**options), PaintingType[req_type],
+                        RenderDeadline.from_epoch(expires_at), timer)
+    return data, timer.durations
+
+
+class RenderWorkerPool:
+    """Fixed size pool of pre-warmed processes, each with its own Kaleido renderers"""
+
+    def __init__(self, processes: int, renderers_per_process: int = 1):
+        if processes < 1:
+            raise ValueError(f"A worker pool needs at least one process, got {processes}")
+        self.processes = processes
+        self.renderers_per_process = renderers_per_process
+        # forking a process running grpc threads isn't safe, the workers start from a fresh interpreter
+        self._context = multiprocessing.get_context('spawn')
+        # released by each worker once warmed up
+        self._ready = self._context.Semaphore(0)
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+        self._warmed_up = False
+        self.respawns = 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(self.processes, mp_context=self._context, initializer=_init_worker,
+                                   initargs=(self.renderers_per_process, self._ready))
+
+    def _respawn(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Replaces the executor after one of its workers died, which breaks it for good. Returns the executor in
+        use, the requests failing on the same broken one respawn it only once."""
+        with self._lock:
+            if self._executor is broken:
+                logging.warning("A render worker died, restarting the worker pool.")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+                self.respawns += 1
+            return self._executor
+
+    def render(self, datas: Union[ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint],
+               token_info: TokenInfo, options: GraphOption, req_type: PaintingType,
+               deadline: Optional[RenderDeadline] = None, timer: Optional[StageTimer] = None) -> EncodedChart:
+        """Paints and encodes the chart in a worker. If the client leaves while the request still waits for a
+        worker, it's removed from the queue and RequestCancelled is raised.
+        The durations of the stages run by the worker are added to the timer.
+        If a worker dies, the pool is restarted: a request that was in progress fails with BrokenProcessPool, one
+        submitted to the broken pool is sent again to the new one."""
+        shm, layout = columns_to_shared_memory(datas.columns())
+        args = (_render_in_worker, shm.name, layout, type(datas).__name__, token_info.dict(),
+                options.dict(exclude={'theme'}), req_type.name,
+                deadline.expires_at_epoch() if deadline is not None else None)
+        try:
+            executor = self._executor
+            try:
+                future = executor.submit(*args, time.time())
+            except BrokenProcessPool:
+                executor = self._respawn(executor)
+                future = executor.submit(*args, time.time())
+            try:
+                self._wait(future, deadline)
+                data, durations = future.result()
+            except BrokenProcessPool:
+                self._respawn(executor)
+                raise
+        finally:
+            shm.close()
+            shm.unlink()
+        if timer is not None:
+            for stage, seconds in durations.items():
+                timer.add(stage, seconds)
+        return data
+
+    def warm_up(self) -> None:
+        """Starts the workers and waits until every one of them is warmed up, see controllers.warmup. Raises
+        BrokenProcessPool if a worker failed to start."""
+        if self._warmed_up:
+            return
+        # the workers are spawned on demand, one per task submitted while none is idle
+        started = [self._executor.submit(_started) for _ in range(self.processes)]
+        for _ in range(self.processes):
+            while not self._ready.acquire(timeout=POLL_INTERVAL):
+                for future in started:
+                    if future.done():
+                        future.result()
+        self._warmed_up = True
+
+    @staticmethod
+    def _wait(future: Future, deadline: Optional[RenderDeadline]) -> None:
+        if deadline is None:
+            return
+        done = threading.Event()
+        future.add_done_callback(lambda _: done.set())
+        while not done.wait(POLL_INTERVAL):
+            if not deadline.is_active() and future.cancel():
+                deadline.check('render')
+                raise RequestCancelled()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: Optional[RenderWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def configure_worker_pool(processes: int, renderers_per_process: int = 1) -> None:
+    """Starts the shared worker pool, 0 processes meaning that the charts are painted in the calling process"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = RenderWorkerPool(processes, renderers_per_process) if processes > 0 else None
+    logging.info(f"Render worker pool configured with {processes} processes.")
+
+
+def get_worker_pool() -> Optional[RenderWorkerPool]:
+    """Returns the shared worker pool, None if the charts are painted in process"""
+    return _pool
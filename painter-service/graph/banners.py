@@ -0,0 +1,149 @@
+"""Caches of the text banners painted above the charts, and of the size of the texts drawn.
+
+The upper part texts only take a handful of values (the name of a bot, a promotion...), the banners are painted
+once per text and theme and then reused. They are shared between the requests and must not be modified."""
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Hashable, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_TEXTS = 4096
+
+
+def font_key(font: ImageFont.FreeTypeFont) -> Hashable:
+    """Identifies a font by its file and its size, the font objects being hashed by identity"""
+    path = getattr(font, 'path', None)
+    return (path, font.size) if path is not None else id(font)
+
+
+@lru_cache(maxsize=64)
+def font_variant(font: ImageFont.FreeTypeFont, size: int) -> ImageFont.FreeTypeFont:
+    """The font at another size, loaded once per size"""
+    return font if size == font.size else font.font_variant(size=size)
+
+
+class TextMetrics:
+    """LRU cache of the size of the texts drawn, by font and text"""
+
+    def __init__(self, max_texts: int = DEFAULT_MAX_TEXTS):
+        self.max_texts = max_texts
+        self._sizes: OrderedDict[Hashable, Tuple[int, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        # only used to measure the texts
+        self._draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+        self.hits = 0
+        self.misses = 0
+
+    def text_size(self, text: str, font: ImageFont.FreeTypeFont) -> Tuple[int, int]:
+        """Width and height of the text drawn with the font, as measured by `ImageDraw.textsize`"""
+        key = (font_key(font), text)
+        with self._lock:
+            size = self._sizes.get(key)
+            if size is not None:
+                self._sizes.move_to_end(key)
+                self.hits += 1
+                return size
+            self.misses += 1
+            size = self._draw.textsize(text, font=font)
+            self._sizes[key] = size
+            if len(self._sizes) > self.max_texts:
+                self._sizes.popitem(last=False)
+            return size
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, size=len(self._sizes))
+
+
+class BannerCache:
+    """LRU cache of the banners, bounded by the total size of their pixels"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._banners: OrderedDict[Hashable, Image.Image] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def banner(self, text: str, font: ImageFont.FreeTypeFont, background: Tuple[int, int, int],
+               color: Tuple[int, int, int], width: int, height: int) -> Image.Image:
+        """Banner of the given size with the text centered on it. It's painted on the first call only."""
+        key = (text, font_key(font), background, color, width, height)
+        with self._lock:
+            banner = self._banners.get(key)
+            if banner is not None:
+                self._banners.move_to_end(key)
+                self.hits += 1
+                return banner
+            self.misses += 1
+        banner = paint_banner(text, font, background, color, width, height)
+        self._put(key, banner)
+        return banner
+
+    def _put(self, key: Hashable, banner: Image.Image) -> None:
+        size = _image_bytes(banner)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._banners:
+                return
+            self._banners[key] = banner
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._banners.popitem(last=False)
+                self._size -= _image_bytes(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._banners.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, entries=len(self._banners),
+                        bytes=self._size)
+
+
+def _image_bytes(img: Image.Image) -> int:
+    return img.width * img.height * len(img.getbands())
+
+
+def paint_banner(text: str, font: ImageFont.FreeTypeFont, background: Tuple[int, int, int],
+                 color: Tuple[int, int, int], width: int, height: int) -> Image.Image:
+    """Paints a banner of the given size and background, with the text centered on it"""
+    img = Image.new('RGB', (width, height), color=background)
+    w, h = get_text_metrics().text_size(text, font)
+    # centered on the banner
+    x = (width - w) / 2
+    y = (height - h) / 2
+    ImageDraw.Draw(img).text((x, y), text, align='center', font=font, fill=color)
+    return img
+
+
+_metrics = TextMetrics()
+_cache: Optional[BannerCache] = BannerCache()
+_cache_lock = threading.Lock()
+
+
+def configure_banner_cache(max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+    """Replaces the shared banner cache. A size of 0 disables the cache."""
+    global _cache
+    with _cache_lock:
+        _cache = BannerCache(max_bytes) if max_bytes > 0 else None
+    logging.info(f"Banner cache configured with {max_bytes} bytes.")
+
+
+def get_banner_cache() -> Optional[BannerCache]:
+    """Returns the shared banner cache, None if it's disabled"""
+    return _cache
+
+
+def get_text_metrics() -> TextMetrics:
+    return _metrics
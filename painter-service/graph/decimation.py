@@ -0,0 +1,94 @@
+"""Downsampling of the series too long to be drawn point by point.
+
+A chart can't show more points than it has pixels horizontally. Beyond that, the points only make the figure and
+its export heavier, so they are decimated down to about one point per pixel before the figure is built. The first
+and last points and the extrema are always kept."""
+from typing import Optional
+
+import numpy as np
+
+from models.columnar import ColumnarCollectionSingleTradePoint
+
+LTTB = 'lttb'
+MINMAX = 'minmax'
+MODES = (LTTB, MINMAX)
+
+
+def target_points(width: int, scale: float = 1) -> int:
+    """Number of points a chart of the given width can show, i.e. its number of pixels once exported"""
+    return int(width * scale)
+
+
+def _with_extrema(indices: np.ndarray, y: np.ndarray) -> np.ndarray:
+    return np.union1d(indices, [np.argmin(y), np.argmax(y)])
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: splits the points in `threshold` - 2 buckets between the first and the last
+    one, and keeps in each the point forming the largest triangle with the one kept in the previous bucket and the
+    average of the next bucket. Returns the sorted indices of the points kept."""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # averages of each bucket, the last point being the bucket following the last one
+    starts = np.append(edges[:-1], n - 1)
+    counts = np.diff(np.append(starts, n))
+    avg_x = np.add.reduceat(x, starts) / counts
+    avg_y = np.add.reduceat(y, starts) / counts
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        areas = np.abs((x[a] - avg_x[i + 1]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    return _with_extrema(indices, y)
+
+
+def minmax_indices(y: np.ndarray, buckets: int) -> np.ndarray:
+    """Splits the points in buckets of consecutive points and keeps the lowest and the highest one of each, so that
+    the envelope of the series is drawn exactly. Returns the sorted indices of the points kept."""
+    n = len(y)
+    if 2 * buckets + 2 >= n or buckets < 1:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    starts = np.linspace(0, n, buckets, endpoint=False).astype(np.int64)
+    bucket_of = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+
+    def first_matching(extrema: np.ndarray) -> np.ndarray:
+        # the first point of each bucket equal to its extremum
+        positions = np.flatnonzero(y == extrema[bucket_of])
+        _, first = np.unique(bucket_of[positions], return_index=True)
+        return positions[first]
+
+    lows = first_matching(np.minimum.reduceat(y, starts))
+    highs = first_matching(np.maximum.reduceat(y, starts))
+    return np.union1d(np.concatenate((lows, highs)), [0, n - 1])
+
+
+def decimation_indices(x: np.ndarray, y: np.ndarray, target: int, mode: str = LTTB) -> Optional[np.ndarray]:
+    """Indices of the points to draw to show the series on `target` pixels, None if all of them fit"""
+    if len(y) <= target:
+        return None
+    match mode:
+        case 'lttb':
+            return lttb_indices(x, y, target)
+        case 'minmax':
+            # two points per bucket
+            return minmax_indices(y, target // 2)
+    raise ValueError(f"Unknown downsampling mode {mode}, expected one of {', '.join(MODES)}")
+
+
+def downsample(datas: ColumnarCollectionSingleTradePoint, indices: np.ndarray) -> ColumnarCollectionSingleTradePoint:
+    """Keeps the points at the given sorted indices. The volume of each point kept is the sum of its own and of the
+    ones of the points dropped after it, so that the total volume doesn't change."""
+    volumes = None
+    if datas.has_volume():
+        volumes = np.add.reduceat(np.nan_to_num(datas.volumes()), indices)
+    return ColumnarCollectionSingleTradePoint(dates=datas.dates()[indices], values=datas.values()[indices],
+                                              volumes=volumes)
@@ -0,0 +1,81 @@
+"""Cache of the validated layouts of the plotly figures.
+
+Building a `go.Figure` validates every property and resolves the theme template, a fixed cost paid on every chart
+whatever its size. The layout of a chart only depends on its painting type, its theme, the options enabled and
+whether it shows a volume: it's validated once per such skeleton and kept as a plain dict. The figures are then
+assembled as plain dicts from a copy of the skeleton, the titles, and the traces, and exported without
+validation.
+
+The titles of the skeletons are format strings, filled with the fields of the token info."""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+DEFAULT_MAX_SKELETONS = 128
+AXES = ('yaxis', 'yaxis2', 'yaxis3')
+
+
+def build_layout(updates: List[dict]) -> dict:
+    """Validated layout resulting from the given updates, applied in order like `Figure.update_layout` does"""
+    # the validators are loaded on the first skeleton built rather than at the start of the service
+    import plotly.graph_objects as go
+    layout = go.Layout()
+    for update in updates:
+        layout.update(update)
+    return layout.to_plotly_json()
+
+
+def fill_layout(skeleton: dict, titles: Dict[str, str], annotations: Optional[list] = None) -> dict:
+    """Layout of a figure, from its skeleton. Only the parts that are modified are copied, the others (such as the
+    template) are shared with the skeleton and must not be modified."""
+    layout = dict(skeleton)
+    for axis in AXES:
+        title = layout.get(axis, {}).get('title', {}).get('text')
+        if title is not None:
+            layout[axis] = dict(layout[axis], title=dict(layout[axis]['title'], text=title.format(**titles)))
+    if annotations:
+        layout['annotations'] = annotations
+    return layout
+
+
+class SkeletonCache:
+    """LRU cache of the validated layouts, by skeleton key"""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SKELETONS):
+        self.max_size = max_size
+        self._skeletons: OrderedDict[Hashable, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], dict]) -> dict:
+        """Skeleton stored under the key, built and stored if there's none"""
+        with self._lock:
+            skeleton = self._skeletons.get(key)
+            if skeleton is not None:
+                self._skeletons.move_to_end(key)
+                self.hits += 1
+                return skeleton
+            self.misses += 1
+        # built out of the lock, two threads may build the same skeleton at the same time
+        skeleton = build()
+        with self._lock:
+            self._skeletons[key] = skeleton
+            while len(self._skeletons) > self.max_size:
+                self._skeletons.popitem(last=False)
+        return skeleton
+
+    def clear(self) -> None:
+        with self._lock:
+            self._skeletons.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, size=len(self._skeletons))
+
+
+_cache = SkeletonCache()
+
+
+def get_skeleton_cache() -> SkeletonCache:
+    return _cache
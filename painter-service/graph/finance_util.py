@@ -1,60 +1,83 @@
+from typing import List, Optional, Tuple
+
 import numpy as np
-import pandas as pd
 import locale
-
-
-def calculate_rsi(closes):
-    i = 0
-    up_prices = []
-    down_prices = []
-    #  Loop to hold up and down price movements
-    while i < len(closes):
-        if i == 0:
-            up_prices.append(0)
-            down_prices.append(0)
-        else:
-            if (closes[i] - closes[i - 1]) > 0:
-                up_prices.append(closes[i] - closes[i - 1])
-                down_prices.append(0)
-            else:
-                down_prices.append(closes[i] - closes[i - 1])
-                up_prices.append(0)
-        i += 1
-    x = 0
-    avg_gain = []
-    avg_loss = []
-    #  Loop to calculate the average gain and loss
-    while x < len(up_prices):
-        if x < 15:
-            avg_gain.append(0)
-            avg_loss.append(0)
-        else:
-            sum_gain = 0
-            sum_loss = 0
-            y = x - 14
-            while y <= x:
-                sum_gain += up_prices[y]
-                sum_loss += down_prices[y]
-                y += 1
-            avg_gain.append(sum_gain / 14)
-            if sum_loss != 0.0:
-                avg_loss.append(abs(sum_loss / 14))
-            else:
-                avg_loss.append(0.00001)
-        x += 1
-    p = 0
-    rsi = []
-    #  Loop to calculate RSI and RS
-    while p < len(closes):
-        if p < 15:
-            rsi.append(np.nan)
-        else:
-            rs_value = (avg_gain[p] / avg_loss[p])
-            rsi.append(100 - (100 / (1 + rs_value)))
-        p += 1
-    lower_band = np.ones(len(rsi)) * 30
-    upper_band = np.ones(len(rsi)) * 70
-    return rsi, lower_band.tolist(), upper_band.tolist()
+from numpy.lib.stride_tricks import sliding_window_view
+
+RSI_LOWER_BOUND = 30
+RSI_UPPER_BOUND = 70
+FIBONACCI_RATIOS = ((0, 'lowest'), (1 - 0.236, '23%'), (1 - 0.382, '38%'), (1 - 0.5, '50%'), (1 - 0.618, '62%'),
+                    (1, 'top'))
+
+
+def _padded(values: np.ndarray, size: int) -> np.ndarray:
+    """Pads the result of a rolling computation with NaNs so that it has the given size, like pandas does"""
+    res = np.full(size, np.nan)
+    if len(values):
+        res[size - len(values):] = values
+    return res
+
+
+def sma(values, window: int) -> np.ndarray:
+    """Simple moving average, NaN for the first `window - 1` values"""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < window:
+        return np.full(len(values), np.nan)
+    return _padded(sliding_window_view(values, window).mean(axis=1), len(values))
+
+
+def rolling_std(values, window: int) -> np.ndarray:
+    """Sample standard deviation over a sliding window, NaN for the first `window - 1` values"""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < window:
+        return np.full(len(values), np.nan)
+    return _padded(sliding_window_view(values, window).std(axis=1, ddof=1), len(values))
+
+
+def ema(values, span: Optional[int] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """Exponential moving average, either of the given span or smoothing factor"""
+    # pandas takes longer to import than the rest of the service, it's only loaded once needed
+    import pandas as pd
+    return pd.Series(np.asarray(values, dtype=np.float64)).ewm(span=span, alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def rsi(closes, period: int = 14, method: str = 'sma') -> np.ndarray:
+    """Relative strength index of the closes.
+    'sma' averages the moves over the last `period + 1` closes, like the historical implementation of the service,
+    the first `period + 1` values being NaN. 'wilder' uses Wilder's smoothing."""
+    closes = np.asarray(closes, dtype=np.float64)
+    moves = np.diff(closes, prepend=closes[:1])
+    gains = np.clip(moves, 0, None)
+    losses = np.clip(moves, None, 0)
+    match method:
+        case 'sma':
+            gains_sum = np.cumsum(np.concatenate(([0], gains)))
+            losses_sum = np.cumsum(np.concatenate(([0], losses)))
+            avg_gain = (gains_sum[period + 1:] - gains_sum[:-period - 1]) / period
+            sum_loss = losses_sum[period + 1:] - losses_sum[:-period - 1]
+            avg_loss = np.where(sum_loss != 0, np.abs(sum_loss / period), 0.00001)
+            res = np.full(len(closes), np.nan)
+            res[period + 1:] = (100 - 100 / (1 + avg_gain / avg_loss))[1:]
+            return res
+        case 'wilder':
+            res = np.full(len(closes), np.nan)
+            if len(closes) <= period:
+                return res
+            # seeded with the simple average of the first moves, then smoothed with a factor of 1 / period
+            seeded_gains = np.concatenate(([gains[1:period + 1].mean()], gains[period + 1:]))
+            seeded_losses = np.concatenate(([-losses[1:period + 1].mean()], -losses[period + 1:]))
+            avg_gain = ema(seeded_gains, alpha=1 / period)
+            avg_loss = ema(seeded_losses, alpha=1 / period)
+            with np.errstate(divide='ignore'):
+                res[period:] = np.where(avg_loss == 0, 100, 100 - 100 / (1 + avg_gain / avg_loss))
+            return res
+    raise ValueError(f"Unknown rsi method {method}")
+
+
+def calculate_rsi(closes, method: str = 'sma') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the rsi of the closes, with the lower and upper bounds to draw along"""
+    rsis = rsi(closes, method=method)
+    return rsis, np.full(len(rsis), RSI_LOWER_BOUND), np.full(len(rsis), RSI_UPPER_BOUND)
 
 
 def moving_average(interval, window_size=10):
@@ -62,59 +85,58 @@ def moving_average(interval, window_size=10):
     return np.convolve(interval, window, 'same')
 
 
+def typical_price(highs, lows, closes) -> np.ndarray:
+    return (np.asarray(highs, dtype=np.float64) + np.asarray(lows, dtype=np.float64)
+            + np.asarray(closes, dtype=np.float64)) / 3
+
+
 def bbands(price, window_size=10, num_of_std=5):
-    price_pd = pd.DataFrame(price)
-    rolling_mean = price_pd.rolling(window=window_size).mean()
-    rolling_std = price_pd.rolling(window=window_size).std()
-    upper_band = rolling_mean + (rolling_std * num_of_std)
-    lower_band = rolling_mean - (rolling_std * num_of_std)
+    rolling_mean = sma(price, window_size)
+    rolling_std_dev = rolling_std(price, window_size)
+    upper_band = rolling_mean + (rolling_std_dev * num_of_std)
+    lower_band = rolling_mean - (rolling_std_dev * num_of_std)
     return rolling_mean, upper_band, lower_band
 
 
+def fibonacci_levels(closes) -> List[Tuple[str, float]]:
+    """Returns the fibonacci retracement levels between the lowest and the highest close, from the bottom up"""
+    closes = np.asarray(closes, dtype=np.float64)
+    highest = float(np.max(closes))
+    lowest = float(np.min(closes))
+    top = highest - lowest
+    return [(name, top * ratio + lowest) for ratio, name in FIBONACCI_RATIOS]
+
+
 def fibonnaci_bands(closes):
-    highest = max(closes)
-    lowest = min(closes)
+    """Fibonacci levels with the style to draw them with, as (level, line style, label)"""
     line = dict(color='rgb(169,169,169,0.5)', width=2)
     line_main = dict(color='rgb(0,0,0,1)', width=4)
-    top = highest - lowest
-    l = []
-    percent_23 = top * (1 - 0.236) + lowest
-    percent_38 = top * (1 - 0.382) + lowest
-    percent_50 = top * (1 - 0.5) + lowest
-    percent_62 = top * (1 - 0.618) + lowest
-    l.append((pd.DataFrame(np.full(len(closes), lowest)), line_main, "lowest: " + pretty_number(lowest)))
-    l.append((pd.DataFrame(np.full(len(closes), percent_23)), line, "23%: " + pretty_number(percent_23)))
-    l.append((pd.DataFrame(np.full(len(closes), percent_38)), line, "38%: " + pretty_number(percent_38)))
-    l.append((pd.DataFrame(np.full(len(closes), percent_50)), line, "50%: " + pretty_number(percent_50)))
-    l.append((pd.DataFrame(np.full(len(closes), percent_62)), line, "62%: " + pretty_number(percent_62)))
-    l.append((pd.DataFrame(np.full(len(closes), top * 1 + lowest)), line_main, "top: " + pretty_number(highest)))
-    return l
+    return [(level, line_main if name in ('lowest', 'top') else line, f"{name}: {pretty_number(level)}")
+            for name, level in fibonacci_levels(closes)]
+
+
+def bollinger(tp, n=20, m=3, mean: Optional[np.ndarray] = None,
+              std: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger bands (middle, upper, lower) of the typical price. The rolling mean and standard deviation can be
+    given when they are already known."""
+    ma = sma(tp, n) if mean is None else mean
+    sd = m * (rolling_std(tp, n) if std is None else std)
+    return ma, ma + sd, ma - sd
 
 
 def bollinger_bands(highs, lows, closes, n=20, m=3):
-    # sourcery skip: inline-immediately-returned-variable, merge-list-append
-    tp = (pd.DataFrame(highs) + pd.DataFrame(lows) + pd.DataFrame(closes)) / 3
-    ma = tp.rolling(n).mean()
-    sd = m * tp.rolling(n).std()
+    """Bollinger bands with the style to draw them with, as (values, line style, show legend, name)"""
+    ma, upper, lower = bollinger(typical_price(highs, lows, closes), n, m)
+    return styled_bollinger_bands(ma, upper, lower)
+
+
+def styled_bollinger_bands(ma, upper, lower):
     ls_up = dict(color='rgb(255, 0, 0, 0.5)')
     ls_mid = dict(color='rgb(255,20,147, 0.5)')
     ls_low = dict(color='rgb(34,139,34, 0.5)')
-    ls_fib = dict(color='rgb(169,169,169,0.5)', width=1)
-    l = []
-    l.append((ma, ls_mid, True, "Middle Band"))
-    # l.append((ma + (0.236 * sd), ls_fib, False, "Fib band"))
-    # l.append((ma + (0.382 * sd), ls_fib, False, "Fib band"))
-    # l.append((ma + (0.5 * sd), ls_fib, False, "Fib band"))
-    # l.append((ma + (0.618 * sd), ls_fib, False, "Fib band"))
-    # l.append((ma + (0.764 * sd), ls_fib, False, "Fib band"))
-    l.append((ma + (1 * sd), ls_up, True, "Upper Band"))
-    # l.append((ma - (0.236 * sd), ls_fib, False, "Fib band"))
-    # l.append((ma - (0.382 * sd), ls_fib, False, "Fib band"))
-    # l.append((ma - (0.5 * sd), ls_fib, False, "Fib band"))
-    # l.append((ma - (0.618 * sd), ls_fib, False, "Fib band"))
-    # l.append((ma - (0.764 * sd), ls_fib, False, "Fib band"))
-    l.append((ma - (1 * sd), ls_low, True, "Lower Band"))
-    return l
+    return [(ma, ls_mid, True, "Middle Band"),
+            (upper, ls_up, True, "Upper Band"),
+            (lower, ls_low, True, "Lower Band")]
 
 
 def keep_significant_number_float(float_to_keep: float, number: int):
@@ -1,189 +1,279 @@
 import io
-from dataclasses import dataclass
-from typing import Union
-
-import plotly.graph_objects as go
-import plotly.io as pio
-from PIL import Image, ImageDraw, ImageOps
-from graph.finance_util import fibonnaci_bands, bollinger_bands, moving_average, calculate_rsi
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, ContextManager, List, Optional, Union
+
+import numpy as np
+from PIL import Image
+from graph.figure_skeletons import build_layout, fill_layout, get_skeleton_cache
+from graph.banners import font_variant, get_banner_cache, paint_banner
+from graph.decimation import decimation_indices, downsample, target_points
+from graph.indicators import IndicatorEngine
+from graph.output import BANNER_HEIGHT, BORDER_SIZE, EncodedChart, compose, encode, encode_variants, \
+    kaleido_format, render_scale
+from graph.raster_painter import RasterPainter
+from graph.renderer_pool import get_renderer_pool
 from models.graph_options import GraphOption
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint, to_columnar
 from models.price_point import CollectionSingleTradePoint, CollectionOhcl
 from models.token_info import TokenInfo
 
+# scale the fonts of the themes are sized for
+FONT_SCALE = 2
+
 
 @dataclass
 class GraphPainter:
-    datas: Union[CollectionOhcl, CollectionSingleTradePoint]
+    datas: Union[CollectionOhcl, CollectionSingleTradePoint, ColumnarCollectionOhcl,
+                 ColumnarCollectionSingleTradePoint]
     token_info: TokenInfo
     options: GraphOption
+    # called with the name of each expensive stage before it starts, raises to stop the painting, such as
+    # controllers.deadline.RenderDeadline.check
+    check_stage: Optional[Callable[[str], None]] = None
+    # context manager measuring the duration of a stage, by name, such as controllers.metrics.StageTimer.stage
+    time_stage: Optional[Callable[[str], ContextManager]] = None
+    indicators: IndicatorEngine = field(init=False, repr=False)
+    # points drawn on the figure: the datas, or a downsampled version of them
+    plotted: Union[ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint] = field(init=False, repr=False)
+    _plotted_indices: Optional[np.ndarray] = field(init=False, repr=False, default=None)
+    # scale the figure is exported at, see graph.output.render_scale
+    scale: float = field(init=False)
+
+    def __post_init__(self):
+        # the painting works on columns, row oriented collections are casted once here
+        self.datas = to_columnar(self.datas)
+        self.indicators = IndicatorEngine(self.datas)
+        self.plotted = self.datas
+        # the margins of the raster backend are in pixels, it always paints at the scale of the options
+        self.scale = render_scale(self.options) if self.options.render_backend == 'plotly' else self.options.scale
+
+    @contextmanager
+    def _stage(self, name: str):
+        """Wraps an expensive stage of the painting, which isn't started if check_stage raises, for instance when the
+        deadline of the request expired. Its duration is measured by time_stage if there's one."""
+        if self.check_stage is not None:
+            self.check_stage(name)
+        if self.time_stage is None:
+            yield
+        else:
+            with self.time_stage(name):
+                yield
+
+    def _decimate(self) -> None:
+        """Downsamples the points of a simple chart to about one per pixel of the exported image, if requested in
+        the options. The indicators are still computed on every point."""
+        if self.options.downsample is None:
+            return
+        x = self.datas.dates().astype(np.int64)
+        indices = decimation_indices(x, self.datas.values(), target_points(self.options.width, self.scale),
+                                     self.options.downsample)
+        if indices is not None:
+            self._plotted_indices = indices
+            self.plotted = downsample(self.datas, indices)
+
+    def _sampled(self, values: np.ndarray) -> np.ndarray:
+        """Values of an indicator at the plotted points"""
+        if self._plotted_indices is None:
+            return values
+        return np.asarray(values)[self._plotted_indices]
+
+    def _decode(self, png: io.BytesIO) -> Image:
+        with self._stage('png_decode'):
+            img = Image.open(png)
+            img.load()
+        return img
 
     def paint_candlestick(self) -> Image:
         """Method that paints a candlestick chart based on a collection of OHCL, token info, and graph options."""
-        actual_candlestick = self._generate_candlestick()
-        candlestick_img = Image.open(actual_candlestick)
-        candlestick_img = self._add_text(candlestick_img)
-        border_color = self._pick_border_color(self.datas.first_value().v_close, self.datas.last_value().v_open)
-        img_final = self._add_border(candlestick_img, color=border_color)
-        return img_final
+        return self._compose(self._candlestick_image(),
+                             self.datas.first_value().v_close, self.datas.last_value().v_open)
 
     def paint_simple_chart(self) -> Image:
         """Similar to get_candlestick, but prints a simple chart"""
-        actual_chart = self._generate_chart()
-        chart_img = Image.open(actual_chart)
-        chart_img = self._add_text(chart_img)
-        border_color = self._pick_border_color(self.datas.first_value().value, self.datas.last_value().value)
-        img_final = self._add_border(chart_img, color=border_color)
-        return img_final
+        return self._compose(self._simple_chart_image(), self.datas.first_value().value, self.datas.last_value().value)
+
+    def encode_candlestick(self) -> EncodedChart:
+        """Paints the candlestick chart and encodes it in the export type of the options, or encodes each of its
+        variants if requested"""
+        fmt = self._kaleido_format()
+        if fmt is None:
+            return self._encode(self.paint_candlestick())
+        with self._stage('indicators'):
+            self.indicators.compute(self.options)
+        return self._export_candlestick(fmt)
+
+    def encode_simple_chart(self) -> EncodedChart:
+        """Paints the simple chart and encodes it in the export type of the options, or encodes each of its
+        variants if requested"""
+        fmt = self._kaleido_format()
+        if fmt is None:
+            return self._encode(self.paint_simple_chart())
+        with self._stage('indicators'):
+            self.indicators.compute(self.options)
+        with self._stage('decimation'):
+            self._decimate()
+        return self._export_chart(fmt)
+
+    def _kaleido_format(self) -> Optional[str]:
+        """Format in which Kaleido exports the final image, when it needs neither banner, border nor tuned
+        encoding. None if the image is composed and encoded here."""
+        if self.options.render_backend != 'plotly' or self.options.upper_part_text or self.options.border:
+            return None
+        return kaleido_format(self.options)
+
+    def _candlestick_image(self) -> Image:
+        with self._stage('indicators'):
+            self.indicators.compute(self.options)
+        if self.options.render_backend == 'raster':
+            with self._stage('raster'):
+                return self._raster_painter().paint_candlestick()
+        return self._decode(self._generate_candlestick())
+
+    def _simple_chart_image(self) -> Image:
+        with self._stage('indicators'):
+            self.indicators.compute(self.options)
+        if self.options.render_backend == 'raster':
+            with self._stage('raster'):
+                return self._raster_painter().paint_simple_chart()
+        with self._stage('decimation'):
+            self._decimate()
+        return self._decode(self._generate_chart())
+
+    def _raster_painter(self) -> RasterPainter:
+        return RasterPainter(self.datas, self.token_info, self.options, width=round(self.options.width * self.scale),
+                             height=round(self.options.height * self.scale), indicators=self.indicators)
+
+    def _compose(self, chart_img: Image, first_value, last_value) -> Image:
+        """Draws the banner, if there's an upper part text, the chart and the border in the final image"""
+        with self._stage('compositing'):
+            banner = None
+            if self.options.upper_part_text:
+                banner = self._generate_text_banner(chart_img.width, max(round(BANNER_HEIGHT * self.scale), 1))
+            border = max(round(BORDER_SIZE * self.scale), 1) if self.options.border else 0
+            return compose(chart_img, banner, border, self._pick_border_color(first_value, last_value))
+
+    def _encode(self, img: Image) -> EncodedChart:
+        with self._stage('encode'):
+            if self.options.variants:
+                return encode_variants(img, self.options)
+            return encode(img, self.options)
 
     def _generate_chart(self) -> io.BytesIO:
         """Generates a simple chart of a collection of single trade point.
         The theme will follow the one given in the graph options."""
-        chart = go.Figure()
-
-        with_volume = self.datas.volumes()[0]
-
-        # chart.add_scatter(x=datas.dates(), y=datas.values(), yaxis='y2', line=go.scatter.Line(color='#636EFA'))
-        # if self.datas.volumes()
-        chart.add_scatter(x=self.datas.dates(), y=self.datas.values(), yaxis='y2',
-                          line=go.scatter.Line(color='#8246e5'))
-
-        chart.update_layout(
-            template=self.options.theme.layout_template,
-            annotations=self.options.generate_watermark(),
-            plot_bgcolor=None,
-            autosize=False,
-            width=1600,
-            height=900,
-            xaxis=dict(rangeslider=dict(visible=False)),
-            yaxis2=dict(domain=[0.0, 1],
-                        title=f"{self.token_info.name} price ({self.token_info.currency_against})",
-                        side='right'),
-            showlegend=False,
-            margin=dict(t=15, b=15, r=15, l=15))
+        return io.BytesIO(self._export_chart('png'))
 
+    def _generate_candlestick(self) -> io.BytesIO:
+        return io.BytesIO(self._export_candlestick('png'))
+
+    def _export_chart(self, fmt: str) -> bytes:
+        with self._stage('figure'):
+            chart = self._chart_figure()
+        return self._export(chart, fmt)
+
+    def _export_candlestick(self, fmt: str) -> bytes:
+        with self._stage('figure'):
+            chart = self._candlestick_figure()
+        return self._export(chart, fmt)
+
+    def _export(self, chart: dict, fmt: str) -> bytes:
+        with self._stage('export'):
+            return get_renderer_pool().to_image(chart, fmt=fmt, scale=self.scale, validate=False)
+
+    def _chart_figure(self) -> dict:
+        """Figure of the simple chart, as a plain dict"""
+        with_volume = self.plotted.has_volume()
+        traces = [dict(type='scatter', x=self.plotted.dates(), y=self.plotted.values(), yaxis='y2',
+                       line=dict(color='#8246e5'))]
         if with_volume:
-            chart.add_bar(
-                x=self.datas.dates(),
-                y=self.datas.volumes(),
-                yaxis='y',
-                marker=dict(),
-                name='Volume'
-            )
-
-            chart.update_layout(
-                yaxis=dict(
-                    domain=[0, 0.19],
-                    showticklabels=True,
-                    title=f"Volume ({self.token_info.volume_currency})",
-                    side='right'),
-                yaxis2=dict(
-                    domain=[0.2, 1],
-                    title=f"{self.token_info.name} price ({self.token_info.currency_against})",
-                    side='right'),
-            )
-
-        chart = self._process_options(chart)
-        img = pio.to_image(fig=chart, scale=2)
-        return io.BytesIO(img)
+            traces.append(dict(type='bar', x=self.plotted.dates(), y=self.plotted.volumes(), yaxis='y', marker=dict(),
+                               name='Volume'))
+        return self._process_options(dict(data=traces, layout=self._layout('chart', with_volume)))
+
+    def _candlestick_figure(self) -> dict:
+        """Figure of the candlestick chart, as a plain dict"""
+        closes = self.datas.closes()
+        colors_volume = np.where(closes[1:] > closes[:-1],
+                                 self.options.theme.increasing_color,
+                                 self.options.theme.decreasing_color)
+        colors_volume = [self.options.theme.decreasing_color] + colors_volume.tolist()
+        traces = [dict(type='candlestick',
+                       open=self.datas.opens(),
+                       high=self.datas.highs(),
+                       low=self.datas.lows(),
+                       close=self.datas.closes(),
+                       x=self.datas.dates(),
+                       yaxis='y2',
+                       name='OHCL',
+                       increasing=dict(line=dict(color=self.options.theme.increasing_color)),
+                       decreasing=dict(line=dict(color=self.options.theme.decreasing_color))),
+                  dict(type='bar',
+                       x=self.datas.dates(),
+                       y=self.datas.volumes(),
+                       marker=dict(color=colors_volume),
+                       yaxis='y',
+                       name='Volume')]
+        return self._process_options(dict(data=traces, layout=self._layout('candlestick', with_volume=True)))
+
+    def _layout(self, kind: str, with_volume: bool) -> dict:
+        """Layout of the figure, from the skeleton of its kind and options"""
+        overlays = tuple(name for name in ('bollinger_bands', 'fibonacci_bands', 'rsi', 'average', 'finance')
+                         if getattr(self.options, name))
+        key = (kind, self.options.theme.layout_template, overlays, with_volume, self.options.width,
+               self.options.height)
+        skeleton = get_skeleton_cache().get(key, lambda: build_layout(self._layout_updates(kind, with_volume)))
+        titles = dict(name=self.token_info.name, currency_against=self.token_info.currency_against,
+                      volume_currency=self.token_info.volume_currency)
+        annotations = self.options.generate_watermark() if kind == 'chart' else None
+        return fill_layout(skeleton, titles, annotations)
+
+    def _layout_updates(self, kind: str, with_volume: bool) -> List[dict]:
+        """Updates making the layout of a figure, its titles being format strings of the token info fields"""
+        base = dict(template=self.options.theme.layout_template,
+                    plot_bgcolor=None,
+                    autosize=False,
+                    width=self.options.width,
+                    height=self.options.height,
+                    xaxis=dict(rangeslider=dict(visible=False)),
+                    showlegend=False,
+                    margin=dict(t=15, b=15, r=15, l=15))
+        volume_axis = dict(domain=[0, 0.19], showticklabels=True, title='Volume ({volume_currency})', side='right')
+        if kind == 'candlestick':
+            updates = [dict(base, yaxis=volume_axis,
+                            yaxis2=dict(domain=[0.2, 1], title='{name}  price ({currency_against})', side='right'))]
+        else:
+            updates = [dict(base, yaxis2=dict(domain=[0.0, 1], title='{name} price ({currency_against})',
+                                              side='right'))]
+            if with_volume:
+                updates.append(dict(yaxis=volume_axis,
+                                    yaxis2=dict(domain=[0.2, 1], title='{name} price ({currency_against})',
+                                                side='right')))
 
-    def _generate_candlestick(self) -> io.BytesIO:
-        chart = go.Figure()
-
-        chart.add_candlestick(
-            open=self.datas.opens(),
-            high=self.datas.highs(),
-            low=self.datas.lows(),
-            close=self.datas.closes(),
-            x=self.datas.dates(),
-            yaxis='y2',
-            name='OHCL',
-            increasing=dict(line=dict(color=self.options.theme.increasing_color)),
-            decreasing=dict(line=dict(color=self.options.theme.decreasing_color)),
-        )
-
-        colors_volume = [self.options.theme.decreasing_color]
-
-        for i in range(1, len(self.datas.closes())):
-            if self.datas.closes()[i] > self.datas.closes()[i - 1]:
-                colors_volume.append(self.options.theme.increasing_color)
-            else:
-                colors_volume.append(self.options.theme.decreasing_color)
-
-        chart.add_bar(
-            x=self.datas.dates(),
-            y=self.datas.volumes(),
-            marker=dict(color=colors_volume),
-            yaxis='y',
-            name='Volume'
-        )
-
-        chart.update_layout(
-            template=self.options.theme.layout_template,
-            plot_bgcolor=None,
-            autosize=False,
-            width=1600,
-            height=900,
-            xaxis=dict(
-                rangeslider=dict(visible=False)),
-            yaxis=dict(
-                domain=[0, 0.19],
-                showticklabels=True,
-                title=f"Volume ({self.token_info.volume_currency})",
-                side='right'),
-            yaxis2=dict(
-                domain=[0.2, 1],
-                title=f"{self.token_info.name}  price ({self.token_info.currency_against})",
-                side='right'),
-            showlegend=False,
-            margin=dict(
-                t=15,
-                b=15,
-                r=15,
-                l=15)
-        )
-        chart = self._process_options(chart)
-        img = pio.to_image(fig=chart, scale=2)
-        return io.BytesIO(img)
+        if self.options.bollinger_bands:
+            updates.append(dict(showlegend=True))
+        if self.options.fibonacci_bands:
+            updates.append(dict(margin=dict(t=15, b=15, r=15, l=100)))
+        if self.options.rsi:
+            updates.append(dict(yaxis=dict(domain=[0, 0.14], title='Volume ($)', side='right'),
+                                yaxis3=dict(domain=[0.15, 0.29], showticklabels=True, title='RSI', side='right'),
+                                yaxis2=dict(domain=[0.3, 1], title='{name} price ({currency_against})',
+                                            side='right')))
+        if self.options.finance:
+            updates.append(dict(xaxis=dict(rangeslider=dict(visible=False), type='category', dtick=6,
+                                           tickformat="%b-%d-%H-%M")))
+        return updates
 
     def _generate_text_banner(self, width: int = 3200, height: int = 100) -> Image:
         """Generates a text banner of the given width and height. It is assumed that there's a text in the graph
-        options. The graph will have the theme of the one passed in the graph options"""
-        font = self.options.theme.upper_part_font
-        txt = self.options.upper_part_text
-
-        bounding_box = [0, 0, width, height]
-        x1, y1, x2, y2 = bounding_box  # For easy reading
-
-        img = Image.new('RGB', (x2, y2), color=self.options.theme.upper_barrier_img_color)
-
-        d = ImageDraw.Draw(img)
-
-        # Calculate the width and height of the text to be drawn, given font size
-        w, h = d.textsize(txt, font=font)
-
-        # Calculate the mid points and offset by the upper left corner of the bounding box
-        x = (x2 - x1 - w) / 2 + x1
-        y = (y2 - y1 - h) / 2 + y1
-
-        # Write the text to the image, where (x,y) is the top left corner of the text
-        d.text((x, y), txt, align='center', font=font, fill=self.options.theme.upper_barrier_txt_color)
-
-        return img  # returning raw img
-
-    def _concatenate_two_images(self, im1: Image, im2: Image) -> Image:
-        """
-        Concatenate two images into one.
-        im1 will be put above im2.
-        Both images need to have the same width.
-        """
-        dst = Image.new('RGB', (im1.width, im1.height + im2.height))
-        dst.paste(im1, (0, 0))
-        dst.paste(im2, (0, im1.height))
-        return dst
-
-    def _add_border(self, img, color, border_size: int = 10) -> Image:
-        """Add a border of the desired color to the graph"""
-        return ImageOps.expand(img, border=border_size, fill=color)
+        options. The graph will have the theme of the one passed in the graph options.
+        The banners are cached, the one returned is shared and must not be modified."""
+        theme = self.options.theme
+        font = font_variant(theme.upper_part_font, max(round(theme.upper_part_font_size * self.scale / FONT_SCALE), 1))
+        args = (self.options.upper_part_text, font, theme.upper_barrier_img_color,
+                theme.upper_barrier_txt_color, width, height)
+        cache = get_banner_cache()
+        return cache.banner(*args) if cache is not None else paint_banner(*args)
 
     def _pick_border_color(self, first_value, last_value) -> str:
         """
@@ -194,77 +284,57 @@ class GraphPainter:
         else:
             return self.options.theme.decrease_color_img_border
 
-    def _add_text(self, image) -> Image:
-        """Add a text above an image"""
-        if self.options.upper_part_text:
-            img_up = self._generate_text_banner()
-            return self._concatenate_two_images(img_up, image)
-        return image
-
-    def _process_options(self, chart):
-        """Adds the options passed in the graph options to the given plotly figure."""
+    def _process_options(self, chart: dict) -> dict:
+        """Adds the traces and annotations of the options passed in the graph options to the given figure. Their
+        layout is part of the skeleton of the figure."""
+        traces = chart['data']
         if self.options.bollinger_bands:
-            bbs = bollinger_bands(self.datas.highs(), self.datas.lows(), self.datas.closes())
-            chart.update_layout(showlegend=True)
-            for bb in bbs:
-                chart.add_scatter(x=self.datas.dates(), y=bb[0][0].to_list(), type='scatter', yaxis='y2',
-                                  line=bb[1], name=bb[3],
-                                  marker=dict(color='#ccc'), hoverinfo='none',
-                                  legendgroup='Bollinger Bands', showlegend=bb[2])
+            for bb in self.indicators.bollinger_bands:
+                traces.append(dict(type='scatter', x=self.plotted.dates(), y=self._sampled(bb[0]), yaxis='y2',
+                                   line=bb[1], name=bb[3],
+                                   marker=dict(color='#ccc'), hoverinfo='none',
+                                   legendgroup='Bollinger Bands', showlegend=bb[2]))
 
         if self.options.fibonacci_bands:
             annotations = []
-            match self.datas:
-                case CollectionOhcl():
-                    fibo_bands = fibonnaci_bands(self.datas.closes())
-                case CollectionSingleTradePoint():
-                    fibo_bands = fibonnaci_bands(self.datas.values())
-            # fig['layout']['showlegend'] = True
-            for res in fibo_bands:
-                chart.add_scatter(x=self.datas.dates(), y=res[0][0].to_list(), type='scatter', yaxis='y2',
-                                  line=res[1], name=res[2],
-                                  marker=dict(color='#ccc'), hoverinfo='none',
-                                  legendgroup='Fibo Bands', showlegend=False)
-                annotations.append(dict(xref='paper', x=0.0, y=res[0][0].to_list()[0],
+            # the levels are horizontal lines, their two ends are enough
+            ends = self.plotted.dates()[[0, -1]]
+            for res in self.indicators.fibonacci_bands:
+                traces.append(dict(type='scatter', x=ends, y=[res[0], res[0]], yaxis='y2',
+                                   line=res[1], name=res[2],
+                                   marker=dict(color='#ccc'), hoverinfo='none',
+                                   legendgroup='Fibo Bands', showlegend=False))
+                annotations.append(dict(xref='paper', x=0.0, y=res[0],
                                         xanchor='right', yanchor='middle', yref='y2',
                                         text=res[2],
                                         font=dict(family='Arial',
                                                   size=16),
                                         showarrow=False))
-            chart.update_layout(margin=dict(t=15, b=15, r=15, l=100),
-                                annotations=annotations)
+            # drawn along the watermark, if any
+            chart['layout']['annotations'] = chart['layout'].get('annotations', []) + annotations
 
         if self.options.rsi:
-            rsis, lower, upper = calculate_rsi(self.datas.closes())
-            chart.update_layout(yaxis=dict(domain=[0, 0.14], title='Volume ($)', side='right'),
-                                yaxis3=dict(domain=[0.15, 0.29], showticklabels=True, title='RSI', side='right'),
-                                yaxis2=dict(domain=[0.3, 1],
-                                            title=f"{self.token_info.name} price ({self.token_info.currency_against})",
-                                            side='right'))
-            chart.add_scatter(x=self.datas.dates(), y=rsis, mode='lines',
-                              marker=dict(color='#E377C2'),
-                              yaxis='y3', name='RSI')
-            chart.add_scatter(x=self.datas.dates(), y=lower, mode='lines',
-                              marker=dict(color='rgba(13, 55, 13, 0.9)'),
-                              yaxis='y3', name='RSI')
-            chart.add_scatter(x=self.datas.dates(), y=upper, mode='lines',
-                              marker=dict(color='rgba(100, 0, 0, 0.9)'),
-                              yaxis='y3', name='RSI')
+            rsis, lower, upper = self.indicators.rsi
+            traces.append(dict(type='scatter', x=self.plotted.dates(), y=self._sampled(rsis), mode='lines',
+                               marker=dict(color='#E377C2'),
+                               yaxis='y3', name='RSI'))
+            traces.append(dict(type='scatter', x=self.plotted.dates(), y=self._sampled(lower), mode='lines',
+                               marker=dict(color='rgba(13, 55, 13, 0.9)'),
+                               yaxis='y3', name='RSI'))
+            traces.append(dict(type='scatter', x=self.plotted.dates(), y=self._sampled(upper), mode='lines',
+                               marker=dict(color='rgba(100, 0, 0, 0.9)'),
+                               yaxis='y3', name='RSI'))
         if self.options.average:
-            mv_y = moving_average(self.datas.closes())
-            mv_x = list(self.datas.dates())
+            mv_y = self._sampled(self.indicators.moving_average)
+            mv_x = self.plotted.dates()
 
             # Clip the ends
             mv_x = mv_x[5:-5]
             mv_y = mv_y[5:-5]
 
-            chart.add_scatter(x=mv_x, y=mv_y, mode='lines',
-                              line=dict(width=2),
-                              marker=dict(color='#E377C2'),
-                              yaxis='y2', name='Moving Average')
-
-        if self.options.finance:
-            chart.update_layout(xaxis=dict(rangeslider=dict(visible=False), type='category', dtick=6,
-                                           tickformat="%b-%d-%H-%M"))
+            traces.append(dict(type='scatter', x=mv_x, y=mv_y, mode='lines',
+                               line=dict(width=2),
+                               marker=dict(color='#E377C2'),
+                               yaxis='y2', name='Moving Average'))
 
         return chart
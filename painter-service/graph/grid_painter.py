@@ -0,0 +1,213 @@
+"""Grids of charts painted as the panels of a single figure, exported by Kaleido in one call.
+
+Each panel is a figure built by its own GraphPainter, with the options shared by the grid. Its axes are renamed
+after its position (the volume, price and RSI axes of the panel n are y3n+1, y3n+2 and y3n+3, anchored on xn+1) and
+their domains are squeezed into the cell of the panel, the traces and the annotations follow. The layout of the first
+panel gives the theme of the grid. The title of each panel is an annotation above its plot, its border is drawn on
+the exported image, in the colour GraphPainter picks for a single chart."""
+import io
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from math import ceil, sqrt
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from graph.graph_painter import GraphPainter
+from graph.output import BORDER_SIZE, EncodedChart, ImageVariant, encode
+from graph.renderer_pool import get_renderer_pool
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+
+MAX_PANELS = 16
+# size of the exported grid, Chromium doesn't paint larger canvases and the image is held in memory a few times
+MAX_GRID_SIDE = 16384
+MAX_GRID_PIXELS = 64 * 1024 * 1024
+# space around the plot of a panel, in pixels of the figure: the title above, the dates below, the price and volume
+# axes on the right
+PANEL_MARGINS = dict(t=50, b=40, l=50, r=110)
+TITLE_FONT_SIZE = 24
+# y axes of a panel figure, in the order they're numbered in the grid
+PANEL_Y_AXES = ('y', 'y2', 'y3')
+
+
+@dataclass
+class GridPanel:
+    painter: GraphPainter
+    req_type: PaintingType
+    title: str
+
+
+def grid_shape(panels: int, columns: Optional[int] = None) -> Tuple[int, int]:
+    """Rows and columns of a grid: about square by default"""
+    columns = min(columns or ceil(sqrt(panels)), panels)
+    return ceil(panels / columns), columns
+
+
+def _axis_name(prefix: str, n: int) -> str:
+    """Name of the n-th x or y axis of the grid: 'x', 'x2', ..."""
+    return prefix if n == 1 else f'{prefix}{n}'
+
+
+def _layout_key(name: str) -> str:
+    """Key of an axis in the layout: 'y2' is set by 'yaxis2'"""
+    return f'{name[0]}axis{name[1:]}'
+
+
+@dataclass
+class GridPainter:
+    panels: List[GridPanel]
+    options: GraphOption
+    columns: Optional[int] = None
+    # same as the hooks of GraphPainter, for the stages of the whole grid
+    check_stage: Optional[Callable[[str], None]] = None
+    time_stage: Optional[Callable[[str], ContextManager]] = None
+    rows: int = field(init=False)
+
+    def __post_init__(self):
+        if not self.panels:
+            raise ValueError("A grid needs at least one panel")
+        if len(self.panels) > MAX_PANELS:
+            raise ValueError(f"A grid has at most {MAX_PANELS} panels, got {len(self.panels)}")
+        if self.options.render_backend != 'plotly':
+            raise ValueError("The grids are painted with the plotly backend")
+        if self.options.variants:
+            raise ValueError("The grids have no variants, their panels can be cropped instead")
+        self.rows, self.columns = grid_shape(len(self.panels), self.columns)
+        width, height = (round(cells * size * self.scale) for cells, size in
+                         ((self.columns, self.options.width), (self.rows, self.options.height)))
+        if max(width, height) > MAX_GRID_SIDE or width * height > MAX_GRID_PIXELS:
+            raise ValueError(f"A grid is at most {MAX_GRID_SIDE} pixels wide and high and {MAX_GRID_PIXELS} "
+                             f"pixels in all, got {width}x{height}")
+
+    @property
+    def scale(self) -> float:
+        return self.options.scale
+
+    @contextmanager
+    def _stage(self, name: str):
+        """Same as GraphPainter._stage, for the stages of the whole grid"""
+        if self.check_stage is not None:
+            self.check_stage(name)
+        if self.time_stage is None:
+            yield
+        else:
+            with self.time_stage(name):
+                yield
+
+    def paint(self) -> Image.Image:
+        """Image of the whole grid, the border of each panel drawn around its cell"""
+        figure = self.figure()
+        with self._stage('export'):
+            png = get_renderer_pool().to_image(figure, fmt='png', scale=self.scale, validate=False)
+        with self._stage('png_decode'):
+            img = Image.open(io.BytesIO(png))
+            img.load()
+        if self.options.border:
+            with self._stage('compositing'):
+                img = img.convert('RGB')
+                self._draw_borders(img)
+        return img
+
+    def encode(self, crop_panels: bool = False) -> EncodedChart:
+        """The grid encoded in the export type of the options, or each of its panels, named after their index"""
+        img = self.paint()
+        with self._stage('encode'):
+            if not crop_panels:
+                return encode(img, self.options)
+            crops = [img.crop(self._cell_box(i)) for i in range(len(self.panels))]
+            return tuple(ImageVariant(str(i), crop.width, crop.height, encode(crop, self.options))
+                         for i, crop in enumerate(crops))
+
+    def figure(self) -> dict:
+        """Figure of the grid, as a plain dict"""
+        with self._stage('indicators'):
+            for panel in self.panels:
+                panel.painter.indicators.compute(self.options)
+        with self._stage('figure'):
+            figures = [self._panel_figure(panel) for panel in self.panels]
+            layout = {key: value for key, value in figures[0]['layout'].items()
+                      if not key.startswith(('xaxis', 'yaxis')) and key != 'annotations'}
+            layout.update(width=self.columns * self.options.width, height=self.rows * self.options.height,
+                          margin=dict(t=0, b=0, l=0, r=0, pad=0), showlegend=False, annotations=[])
+            data = []
+            for i, (panel, figure) in enumerate(zip(self.panels, figures)):
+                self._add_panel(i, panel, figure, data, layout)
+        return dict(data=data, layout=layout)
+
+    @staticmethod
+    def _panel_figure(panel: GridPanel) -> dict:
+        painter = panel.painter
+        if panel.req_type == PaintingType.CANDLESTICK:
+            return painter._candlestick_figure()
+        painter._decimate()
+        return painter._chart_figure()
+
+    def _cell(self, i: int) -> Tuple[int, int, int, int]:
+        """Left, top, right and bottom of the cell of a panel, in pixels of the figure"""
+        row, column = divmod(i, self.columns)
+        return (column * self.options.width, row * self.options.height,
+                (column + 1) * self.options.width, (row + 1) * self.options.height)
+
+    def _cell_box(self, i: int) -> Tuple[int, int, int, int]:
+        """Cell of a panel in pixels of the exported image"""
+        return tuple(round(v * self.scale) for v in self._cell(i))
+
+    def _plot_domain(self, i: int) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """x and y domains of the plot of a panel, in fractions of the figure"""
+        left, top, right, bottom = self._cell(i)
+        width, height = self.columns * self.options.width, self.rows * self.options.height
+        x = ((left + PANEL_MARGINS['l']) / width, (right - PANEL_MARGINS['r']) / width)
+        y = (1 - (bottom - PANEL_MARGINS['b']) / height, 1 - (top + PANEL_MARGINS['t']) / height)
+        return x, y
+
+    def _add_panel(self, i: int, panel: GridPanel, figure: dict, data: list, layout: dict) -> None:
+        """Adds the traces, the axes and the annotations of a panel figure to the grid"""
+        (x0, x1), (y0, y1) = self._plot_domain(i)
+        x_name = _axis_name('x', i + 1)
+        y_names = {axis: _axis_name('y', 3 * i + n) for n, axis in enumerate(PANEL_Y_AXES, start=1)}
+        panel_layout = figure['layout']
+        scale_x: Callable[[float], float] = lambda v: x0 + v * (x1 - x0)
+        scale_y: Callable[[float], float] = lambda v: y0 + v * (y1 - y0)
+        y_axes: Dict[str, dict] = {}
+        for axis, name in y_names.items():
+            if _layout_key(axis) in panel_layout:
+                source = panel_layout[_layout_key(axis)]
+                domain = source.get('domain', [0, 1])
+                y_axes[name] = dict(source, domain=[scale_y(domain[0]), scale_y(domain[1])], anchor=x_name,
+                                    automargin=False)
+        layout.update({_layout_key(name): axis for name, axis in y_axes.items()})
+        # the dates are shown below the lowest axis
+        lowest = min(y_axes, key=lambda name: y_axes[name]['domain'][0])
+        layout[_layout_key(x_name)] = dict(panel_layout.get('xaxis', {}), domain=[x0, x1], anchor=lowest,
+                                           automargin=False)
+        for trace in figure['data']:
+            data.append(dict(trace, xaxis=x_name, yaxis=y_names[trace.get('yaxis', 'y')], showlegend=False))
+        for annotation in panel_layout.get('annotations', []):
+            annotation = dict(annotation)
+            for ref, scale in (('xref', scale_x), ('yref', scale_y)):
+                # the annotations are placed on the first axes by default
+                ref_name = annotation.get(ref, ref[0])
+                if ref_name == 'paper':
+                    annotation[ref[0]] = scale(annotation.get(ref[0], 0.5))
+                else:
+                    annotation[ref] = x_name if ref == 'xref' else y_names[ref_name]
+            layout['annotations'].append(annotation)
+        left, top, _, _ = self._cell(i)
+        width, height = self.columns * self.options.width, self.rows * self.options.height
+        layout['annotations'].append(dict(text=panel.title, showarrow=False, xref='paper', yref='paper',
+                                          x=(left + PANEL_MARGINS['l']) / width, y=1 - (top + 10) / height,
+                                          xanchor='left', yanchor='top', font=dict(size=TITLE_FONT_SIZE)))
+
+    def _draw_borders(self, img: Image.Image) -> None:
+        border = max(round(BORDER_SIZE * self.scale), 1)
+        draw = ImageDraw.Draw(img)
+        for i, panel in enumerate(self.panels):
+            datas = panel.painter.datas
+            if panel.req_type == PaintingType.CANDLESTICK:
+                first, last = datas.first_value().v_close, datas.last_value().v_open
+            else:
+                first, last = datas.first_value().value, datas.last_value().value
+            left, top, right, bottom = self._cell_box(i)
+            draw.rectangle((left, top, right - 1, bottom - 1), outline=panel.painter._pick_border_color(first, last),
+                           width=border)
@@ -0,0 +1,91 @@
+"""Computes the indicators requested in the graph options on a collection, sharing the intermediate results."""
+from functools import cached_property
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from graph import finance_util
+from models.graph_options import GraphOption
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint
+
+BOLLINGER_WINDOW = 20
+BOLLINGER_STD = 3
+
+
+class IndicatorEngine:
+    """Lazily computes the indicators of a collection. Each intermediate result (typical price, moves of the closes,
+    rolling means...) is computed once and reused by every indicator needing it."""
+
+    def __init__(self, datas: Union[ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint]):
+        self.datas = datas
+        self._rolling_means: Dict[Tuple[str, int], np.ndarray] = {}
+        self._rolling_stds: Dict[Tuple[str, int], np.ndarray] = {}
+
+    @cached_property
+    def prices(self) -> np.ndarray:
+        """Closes of a candlestick, values of a simple chart"""
+        if isinstance(self.datas, ColumnarCollectionOhcl):
+            return self.datas.closes()
+        return self.datas.values()
+
+    @cached_property
+    def typical_price(self) -> np.ndarray:
+        if isinstance(self.datas, ColumnarCollectionOhcl):
+            return finance_util.typical_price(self.datas.highs(), self.datas.lows(), self.datas.closes())
+        return self.prices
+
+    def _series(self, name: str) -> np.ndarray:
+        return self.typical_price if name == 'typical_price' else self.prices
+
+    def sma(self, name: str, window: int) -> np.ndarray:
+        """Simple moving average of 'prices' or 'typical_price'"""
+        key = (name, window)
+        if key not in self._rolling_means:
+            self._rolling_means[key] = finance_util.sma(self._series(name), window)
+        return self._rolling_means[key]
+
+    def rolling_std(self, name: str, window: int) -> np.ndarray:
+        """Rolling standard deviation of 'prices' or 'typical_price'"""
+        key = (name, window)
+        if key not in self._rolling_stds:
+            self._rolling_stds[key] = finance_util.rolling_std(self._series(name), window)
+        return self._rolling_stds[key]
+
+    def ema(self, span: int) -> np.ndarray:
+        return finance_util.ema(self.prices, span=span)
+
+    @cached_property
+    def rsi(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """RSI of the prices and its bounds"""
+        return finance_util.calculate_rsi(self.prices)
+
+    def rsi_wilder(self, period: int = 14) -> np.ndarray:
+        return finance_util.rsi(self.prices, period=period, method='wilder')
+
+    @cached_property
+    def bollinger_bands(self) -> List[tuple]:
+        """Styled bollinger bands, see finance_util.bollinger_bands"""
+        ma, upper, lower = finance_util.bollinger(self.typical_price, BOLLINGER_WINDOW, BOLLINGER_STD,
+                                                  mean=self.sma('typical_price', BOLLINGER_WINDOW),
+                                                  std=self.rolling_std('typical_price', BOLLINGER_WINDOW))
+        return finance_util.styled_bollinger_bands(ma, upper, lower)
+
+    @cached_property
+    def fibonacci_bands(self) -> List[tuple]:
+        """Styled fibonacci levels, see finance_util.fibonnaci_bands"""
+        return finance_util.fibonnaci_bands(self.prices)
+
+    @cached_property
+    def moving_average(self) -> np.ndarray:
+        return finance_util.moving_average(self.prices)
+
+    def compute(self, options: GraphOption) -> None:
+        """Computes up front the indicators requested in the options"""
+        if options.bollinger_bands:
+            _ = self.bollinger_bands
+        if options.fibonacci_bands:
+            _ = self.fibonacci_bands
+        if options.rsi:
+            _ = self.rsi
+        if options.average:
+            _ = self.moving_average
@@ -0,0 +1,114 @@
+"""Composition and encoding of the painted charts.
+
+The banner, the chart and the border are drawn in a single canvas allocated at its final size, which is then
+encoded once in the export type of the options. When there's nothing to add to the chart and nothing to tune in the
+encoder, Kaleido exports it in that type directly and the image is never decoded.
+
+When variants of the image are requested, it's painted once at the size of the largest one, and downscaled for the
+others."""
+import io
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+from PIL import Image
+
+from models.graph_options import GraphOption, VARIANT_WIDTHS
+
+# formats Kaleido can export the final image in, by export type
+KALEIDO_FORMATS = {'PNG': 'png', 'JPEG': 'jpeg', 'WEBP': 'webp'}
+# size of the border and height of the banner, in pixels of the figure: they're multiplied by the export scale
+BORDER_SIZE = 5
+BANNER_HEIGHT = 50
+
+
+class ImageVariant(NamedTuple):
+    name: str
+    width: int
+    height: int
+    image: bytes
+
+
+# an encoded image, or its encoded variants
+EncodedChart = Union[bytes, Tuple[ImageVariant, ...]]
+
+
+def encoded_size(chart: EncodedChart) -> int:
+    """Number of bytes of the encoded images"""
+    if isinstance(chart, bytes):
+        return len(chart)
+    return sum(len(variant.image) for variant in chart)
+
+
+def render_scale(options: GraphOption) -> float:
+    """Scale the figure is exported at: the one of the options, or the one of the largest variant if the full image
+    isn't requested"""
+    if not options.variants or 'full' in options.variants:
+        return options.scale
+    largest = max(VARIANT_WIDTHS[name] for name in options.variants)
+    return largest / (options.width + (2 * BORDER_SIZE if options.border else 0))
+
+
+def compose(chart: Image.Image, banner: Optional[Image.Image], border: int, border_color: str) -> Image.Image:
+    """Chart below its banner, if any, framed by a border of the given size"""
+    banner_height = banner.height if banner is not None else 0
+    canvas = Image.new('RGB', (chart.width + 2 * border, banner_height + chart.height + 2 * border), border_color)
+    if banner is not None:
+        canvas.paste(banner, (border, border))
+    canvas.paste(chart, (border, border + banner_height))
+    return canvas
+
+
+def save_params(options: GraphOption) -> Dict[str, Any]:
+    """Parameters given to the Pillow encoder of the export type"""
+    params = {}
+    match options.export_type.upper():
+        case 'JPEG':
+            if options.quality is not None:
+                params['quality'] = options.quality
+            if options.progressive:
+                params['progressive'] = True
+            if options.subsampling is not None:
+                params['subsampling'] = options.subsampling
+        case 'WEBP':
+            if options.quality is not None:
+                params['quality'] = options.quality
+    return params
+
+
+def is_tuned(options: GraphOption) -> bool:
+    """Whether the encoding differs from the default one of the export type"""
+    return bool(save_params(options)) or (options.export_type.upper() == 'PNG' and options.palette_colors is not None)
+
+
+def kaleido_format(options: GraphOption) -> Optional[str]:
+    """Format Kaleido exports the final image in, None if the image has to be encoded by Pillow"""
+    if options.variants or is_tuned(options):
+        return None
+    return KALEIDO_FORMATS.get(options.export_type.upper())
+
+
+def encode_variants(img: Image.Image, options: GraphOption) -> Tuple[ImageVariant, ...]:
+    """Encodes the variants of the options, in the order they were requested. The image is resized to the width of
+    each variant, which is mostly a downscale: it's painted at the size of the largest one, give or take the
+    rounding of the export."""
+    variants = []
+    for name in options.variants:
+        width = VARIANT_WIDTHS[name]
+        resized = img
+        if width is not None and width != img.width:
+            height = max(round(img.height * width / img.width), 1)
+            # reduces by an integer factor first, then resamples what remains
+            resized = img.resize((width, height), Image.BILINEAR, reducing_gap=2.)
+        variants.append(ImageVariant(name, resized.width, resized.height, encode(resized, options)))
+    return tuple(variants)
+
+
+def encode(img: Image.Image, options: GraphOption) -> bytes:
+    """Encodes the image in the export type of the options. The PNG images are reduced to a palette of
+    `palette_colors` colors if requested."""
+    export_type = options.export_type.upper()
+    if export_type == 'PNG' and options.palette_colors is not None:
+        img = img.quantize(options.palette_colors, method=Image.FASTOCTREE)
+    with io.BytesIO() as output:
+        img.save(output, export_type, **save_params(options))
+        # the internal buffer is shrunk and returned rather than copied
+        return output.getvalue()
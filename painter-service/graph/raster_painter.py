@@ -0,0 +1,305 @@
+"""Render backend drawing the charts directly into a Pillow canvas, without plotly nor Kaleido.
+
+It mimics the layout of the plotly charts (price on top, volume below, RSI in between when requested, axis on the
+right) but trades the interactivity features plotly computes for raw speed."""
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw
+
+from graph.finance_util import pretty_number
+from graph.indicators import IndicatorEngine
+from models.graph_options import GraphOption
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint, to_columnar
+from models.token_info import TokenInfo
+
+CHART_LINE_COLOR = '#8246e5'
+CHART_VOLUME_COLOR = '#636efa'
+AVERAGE_COLOR = '#E377C2'
+RSI_COLORS = ('#E377C2', 'rgba(13, 55, 13, 0.9)', 'rgba(100, 0, 0, 0.9)')
+
+
+def _to_rgb(color: str) -> Tuple[int, int, int]:
+    """Casts a css color to a rgb tuple. Also accepts the 'rgb(r, g, b, a)' notation used by finance_util."""
+    if color.startswith('rgb'):
+        values = color[color.index('(') + 1:color.index(')')].split(',')
+        return int(values[0]), int(values[1]), int(values[2])
+    return ImageColor.getrgb(color)[:3]
+
+
+def _blend(color: Tuple[int, int, int], background: Tuple[int, int, int], alpha: float) -> Tuple[int, int, int]:
+    """Color seen when painting `color` with the given opacity over `background`"""
+    return tuple(int(c * alpha + b * (1 - alpha)) for c, b in zip(color, background))
+
+
+def _nice_ticks(lowest: float, highest: float, count: int = 6) -> np.ndarray:
+    """Returns round tick values covering [lowest, highest], about `count` of them."""
+    span = highest - lowest
+    if span <= 0:
+        span = abs(highest) or 1
+    raw_step = span / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    start = math.ceil(lowest / step) * step
+    return np.arange(start, highest + step * 1e-9, step)
+
+
+@dataclass
+class _Panel:
+    """Vertical slice of the canvas with its own y axis"""
+    top: int
+    bottom: int
+    lowest: float
+    highest: float
+    title: str
+    lines: List[Tuple[np.ndarray, Tuple[int, int, int], int]] = field(default_factory=list)
+
+    def y(self, values: np.ndarray) -> np.ndarray:
+        """Pixel ordinates of the given values"""
+        span = (self.highest - self.lowest) or 1
+        return self.bottom - (np.asarray(values, dtype=float) - self.lowest) / span * (self.bottom - self.top)
+
+
+@dataclass
+class RasterPainter:
+    datas: Union[ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint]
+    token_info: TokenInfo
+    options: GraphOption
+    width: int = 3200
+    height: int = 1800
+    margin_top: int = 30
+    margin_bottom: int = 70
+    margin_right: int = 190
+    indicators: Optional[IndicatorEngine] = None
+
+    def __post_init__(self):
+        self.datas = to_columnar(self.datas)
+        if self.indicators is None:
+            self.indicators = IndicatorEngine(self.datas)
+
+    @property
+    def margin_left(self) -> int:
+        return 200 if self.options.fibonacci_bands else 30
+
+    def paint_candlestick(self) -> Image:
+        """Paints a candlestick chart with its volume, same content as GraphPainter._generate_candlestick"""
+        theme = self.options.theme
+        opens = self.datas.opens()
+        highs = self.datas.highs()
+        lows = self.datas.lows()
+        closes = self.datas.closes()
+        volumes = self._volumes()
+
+        img, d = self._canvas()
+        xs, half_width = self._x_positions()
+        price, volume, rsi = self._panels(lows, highs, volume_title=f"Volume ({self.token_info.volume_currency})",
+                                          with_rsi=self.options.rsi)
+        self._add_overlays(price, rsi)
+        self._draw_axes(img, d, xs, [p for p in (price, volume, rsi) if p is not None])
+        self._draw_fibonacci(d, price)
+
+        increasing, decreasing = _to_rgb(theme.increasing_color), _to_rgb(theme.decreasing_color)
+        up = closes >= opens
+        y_open, y_close, y_high, y_low = price.y(opens), price.y(closes), price.y(highs), price.y(lows)
+        for i in range(len(xs)):
+            color = increasing if up[i] else decreasing
+            fill = _blend(color, theme.raster_bg_color, 0.5)
+            x = xs[i]
+            d.line([(x, y_high[i]), (x, y_low[i])], fill=color, width=2)
+            top, bottom = min(y_open[i], y_close[i]), max(y_open[i], y_close[i])
+            d.rectangle([x - half_width, top, x + half_width, max(bottom, top + 1)], fill=fill, outline=color,
+                        width=2)
+
+        # volume bars are colored according to the evolution of the closes, like the plotly version
+        volume_up = np.concatenate(([False], closes[1:] > closes[:-1]))
+        self._draw_bars(d, volume, xs, half_width, volumes,
+                        [increasing if v else decreasing for v in volume_up])
+
+        self._draw_lines(d, xs, price)
+        self._draw_lines(d, xs, rsi)
+        self._draw_watermark(img)
+        return img
+
+    def paint_simple_chart(self) -> Image:
+        """Paints a simple line chart, same content as GraphPainter._generate_chart"""
+        values = self.datas.values()
+        volumes = self._volumes()
+        with_volume = bool(np.any(volumes))
+
+        img, d = self._canvas()
+        xs, half_width = self._x_positions()
+        volume_title = f"Volume ({self.token_info.volume_currency})" if with_volume else None
+        # rsi and bollinger bands need ohcl values, they are not available on simple charts
+        price, volume, rsi = self._panels(values, values, volume_title=volume_title, with_rsi=False)
+        if self.options.average:
+            self._add_average(price)
+        self._pad(price)
+        self._draw_axes(img, d, xs, [p for p in (price, volume, rsi) if p is not None])
+        self._draw_fibonacci(d, price)
+        if volume is not None:
+            self._draw_bars(d, volume, xs, half_width, volumes, [_to_rgb(CHART_VOLUME_COLOR)] * len(xs))
+        price.lines.insert(0, (values, _to_rgb(CHART_LINE_COLOR), 4))
+        self._draw_lines(d, xs, price)
+        self._draw_watermark(img)
+        return img
+
+    def _canvas(self) -> Tuple[Image.Image, ImageDraw.ImageDraw]:
+        img = Image.new('RGB', (self.width, self.height), color=self.options.theme.raster_bg_color)
+        return img, ImageDraw.Draw(img)
+
+    def _volumes(self) -> np.ndarray:
+        return np.nan_to_num(self.datas.volumes())
+
+    def _x_positions(self) -> Tuple[np.ndarray, float]:
+        """Abscissa of each point and half width of a candle. The axis is temporal, or categorical when the
+        finance option is set, like in plotly."""
+        size = self.datas.size()
+        plot_width = self.width - self.margin_left - self.margin_right
+        if self.options.finance or size < 2:
+            positions = np.arange(size, dtype=float)
+        else:
+            positions = self.datas.dates().astype(np.int64) / 1e6
+        positions = positions - positions[0]
+        span = positions[-1] if size > 1 and positions[-1] > 0 else 1
+        step = np.median(np.diff(positions)) if size > 1 else span
+        # half a step of padding on each side so that the first and last candles are fully visible
+        unit = plot_width / (span + step)
+        xs = self.margin_left + (positions + step / 2) * unit
+        return xs, max(step * unit * 0.35, 1)
+
+    def _panels(self, lows: np.ndarray, highs: np.ndarray, volume_title: Optional[str],
+                with_rsi: bool) -> Tuple[_Panel, Optional[_Panel], Optional[_Panel]]:
+        """Splits the canvas in price / rsi / volume panels with the same domains as the plotly charts."""
+        if volume_title is None and not with_rsi:
+            domains = {'price': (0.0, 1)}
+        elif with_rsi:
+            domains = {'volume': (0, 0.14), 'rsi': (0.15, 0.29), 'price': (0.3, 1)}
+        else:
+            domains = {'volume': (0, 0.19), 'price': (0.2, 1)}
+        if volume_title is None:
+            domains.pop('volume', None)
+        plot_height = self.height - self.margin_top - self.margin_bottom
+
+        def panel(name, lowest, highest, title):
+            start, end = domains[name]
+            return _Panel(top=int(self.margin_top + (1 - end) * plot_height),
+                          bottom=int(self.margin_top + (1 - start) * plot_height),
+                          lowest=lowest, highest=highest, title=title)
+
+        price = panel('price', float(np.nanmin(lows)), float(np.nanmax(highs)),
+                      f"{self.token_info.name} price ({self.token_info.currency_against})")
+        volume = panel('volume', 0, float(np.max(self._volumes())) or 1, volume_title) if 'volume' in domains else None
+        rsi = panel('rsi', 0, 100, 'RSI') if 'rsi' in domains else None
+        return price, volume, rsi
+
+    def _add_overlays(self, price: _Panel, rsi: Optional[_Panel]) -> None:
+        """Computes the indicators requested in the options and attaches them to their panel"""
+        if self.options.bollinger_bands:
+            for values, line, _, _ in self.indicators.bollinger_bands:
+                price.lines.append((values, _to_rgb(line['color']), 3))
+        if self.options.average:
+            self._add_average(price)
+        if rsi is not None:
+            rsis, lower, upper = self.indicators.rsi
+            for values, color in zip((rsis, lower, upper), RSI_COLORS):
+                rsi.lines.append((np.asarray(values, dtype=float), _to_rgb(color), 3))
+        self._pad(price)
+
+    @staticmethod
+    def _pad(price: _Panel) -> None:
+        """Extends the price range so that it includes the overlays, plus some padding"""
+        for values, _, _ in price.lines:
+            if np.any(np.isfinite(values)):
+                price.lowest = min(price.lowest, float(np.nanmin(values)))
+                price.highest = max(price.highest, float(np.nanmax(values)))
+        # same 5% padding as plotly's autorange
+        padding = (price.highest - price.lowest) * 0.05 or abs(price.highest) * 0.05 or 1
+        price.lowest, price.highest = price.lowest - padding, price.highest + padding
+
+    def _add_average(self, price: _Panel) -> None:
+        average = self.indicators.moving_average.copy()
+        # the ends are clipped as they are computed on incomplete windows
+        average[:5] = np.nan
+        average[-5:] = np.nan
+        price.lines.append((average, _to_rgb(AVERAGE_COLOR), 4))
+
+    def _draw_axes(self, img: Image.Image, d: ImageDraw.ImageDraw, xs: np.ndarray, panels: List[_Panel]) -> None:
+        """Draws the gridlines, the tick labels on the right of each panel, their titles and the date axis."""
+        theme = self.options.theme
+        font = theme.raster_font
+        right = self.width - self.margin_right
+        for panel in panels:
+            for tick in _nice_ticks(panel.lowest, panel.highest, count=8 if panel.bottom - panel.top > 600 else 3):
+                y = float(panel.y(tick))
+                d.line([(self.margin_left, y), (right, y)], fill=theme.raster_grid_color, width=2)
+                d.text((right + 10, y), pretty_number(tick), font=font, fill=theme.raster_txt_color, anchor='lm')
+            if panel.title:
+                title = Image.new('RGB', (panel.bottom - panel.top, theme.raster_font_size + 8),
+                                  color=theme.raster_bg_color)
+                ImageDraw.Draw(title).text((title.width / 2, title.height / 2), panel.title, font=font,
+                                           fill=theme.raster_txt_color, anchor='mm')
+                title = title.rotate(-90, expand=True)
+                img.paste(title, (self.width - title.width - 5, panel.top))
+
+        dates = self.datas.dates()
+        for i in np.linspace(0, len(xs) - 1, num=min(len(xs), 8)).astype(int):
+            d.line([(xs[i], self.margin_top), (xs[i], self.height - self.margin_bottom)],
+                   fill=theme.raster_grid_color, width=1)
+            label = self._format_date(dates[i], dates)
+            # the labels of the edges are shifted so that they are not cut
+            half_label = d.textlength(label, font=font) / 2
+            x = min(max(xs[i], half_label + 5), self.width - half_label - 5)
+            d.text((x, self.height - self.margin_bottom + 10), label, font=font, fill=theme.raster_txt_color,
+                   anchor='ma')
+
+    @staticmethod
+    def _format_date(date: np.datetime64, dates: np.ndarray) -> str:
+        two_days = np.timedelta64(2, 'D')
+        return date.item().strftime('%b %d' if dates[-1] - dates[0] > two_days else '%b %d %H:%M')
+
+    def _draw_fibonacci(self, d: ImageDraw.ImageDraw, price: _Panel) -> None:
+        """Draws the horizontal fibonacci levels with their label on the left"""
+        if not self.options.fibonacci_bands:
+            return
+        for level, line, label in self.indicators.fibonacci_bands:
+            y = float(price.y(level))
+            d.line([(self.margin_left, y), (self.width - self.margin_right, y)], fill=_to_rgb(line['color']),
+                   width=line['width'])
+            d.text((self.margin_left - 5, y), label, font=self.options.theme.raster_font,
+                   fill=self.options.theme.raster_txt_color, anchor='rm')
+
+    @staticmethod
+    def _draw_bars(d: ImageDraw.ImageDraw, panel: _Panel, xs: np.ndarray, half_width: float, values: np.ndarray,
+                   colors: List[Tuple[int, int, int]]) -> None:
+        ys = panel.y(values)
+        for x, y, color in zip(xs, ys, colors):
+            d.rectangle([x - half_width, y, x + half_width, panel.bottom], fill=color)
+
+    @staticmethod
+    def _draw_lines(d: ImageDraw.ImageDraw, xs: np.ndarray, panel: Optional[_Panel]) -> None:
+        """Draws the lines attached to a panel, skipping the undefined values"""
+        if panel is None:
+            return
+        for values, color, width in panel.lines:
+            ys = panel.y(values)
+            defined = np.isfinite(ys)
+            # one polyline per run of defined values
+            breaks = np.flatnonzero(np.diff(defined.astype(int))) + 1
+            for run in np.split(np.arange(len(ys)), breaks):
+                if len(run) > 1 and defined[run[0]]:
+                    d.line(list(zip(xs[run].tolist(), ys[run].tolist())), fill=color, width=width, joint='curve')
+
+    def _draw_watermark(self, img: Image.Image) -> None:
+        """Draws the watermark of the options, if any, rotated and mostly transparent in the middle of the chart"""
+        if self.options.watermark is None:
+            return
+        theme = self.options.theme
+        font = theme.raster_watermark_font
+        left, top, right, bottom = font.getbbox(self.options.watermark)
+        mask = Image.new('L', (right - left + 20, bottom - top + 20), 0)
+        ImageDraw.Draw(mask).text((10 - left, 10 - top), self.options.watermark, font=font, fill=int(255 * 0.1))
+        mask = mask.rotate(30, expand=True, resample=Image.BICUBIC)
+        position = ((self.width - mask.width) // 2, (self.height - mask.height) // 2)
+        img.paste(theme.raster_txt_color, (*position, position[0] + mask.width, position[1] + mask.height), mask)
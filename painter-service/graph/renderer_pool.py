@@ -0,0 +1,134 @@
+"""Pool of independent Kaleido renderers used to export plotly figures.
+
+plotly's `pio.to_image` goes through a single global Kaleido scope, i.e. a single Chromium subprocess, so
+concurrent renders serialize on it. The pool below owns several scopes, each with its own subprocess, and hands
+them out to the painting threads.
+
+plotly.io and Kaleido are imported when the first renderer starts, not with this module: they pull in most of
+plotly, which the service doesn't need to bind its port."""
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import List, Optional
+
+import plotly
+
+DEFAULT_POOL_SIZE = 5
+# same bundles as the ones plotly configures on its global scope, so that no CDN is needed
+PLOTLY_JS_PATH = os.path.join(os.path.dirname(os.path.abspath(plotly.__file__)), "package_data", "plotly.min.js")
+MATHJAX_URL = "https://cdnjs.cloudflare.com/ajax/libs/mathjax/2.7.5/MathJax.js"
+# exported to start the Chromium subprocesses
+EMPTY_FIGURE = {'data': [], 'layout': {}}
+
+
+class KaleidoRenderer:
+    """A single Kaleido scope, i.e. one Chromium subprocess fed through its own stdin / stdout pipes."""
+
+    def __init__(self, renderer_id: int):
+        from kaleido.scopes.plotly import PlotlyScope
+        self.renderer_id = renderer_id
+        self.scope = PlotlyScope(plotlyjs=PLOTLY_JS_PATH)
+        if self.scope.mathjax is None:
+            self.scope.mathjax = MATHJAX_URL
+        self.renders = 0
+
+    def to_image(self, fig, fmt: str = 'png', width: Optional[int] = None, height: Optional[int] = None,
+                 scale: float = 1, validate: bool = True) -> bytes:
+        """Exports a figure (or a figure dict) to the requested format."""
+        from plotly.io._utils import validate_coerce_fig_to_dict
+        fig_dict = validate_coerce_fig_to_dict(fig, validate)
+        img = self.scope.transform(fig_dict, format=fmt, width=width, height=height, scale=scale)
+        self.renders += 1
+        return img
+
+    def shutdown(self) -> None:
+        """Stops the Chromium subprocess, it will be restarted on the next render if needed."""
+        self.scope._shutdown_kaleido()
+
+
+class KaleidoRendererPool:
+    """Fixed size pool of Kaleido renderers with checkout / return semantics.
+
+    Idle renderers wait in a queue; a thread checks one out for the duration of an export and gives it back
+    afterwards, so at most `size` exports run at the same time, each in its own subprocess."""
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE):
+        if size < 1:
+            raise ValueError(f"A renderer pool needs at least one renderer, got {size}")
+        import plotly.io as pio
+        self.size = size
+        # plotly resolves its json engine lazily on the first serialization, doing it once here avoids several
+        # renderer threads racing on that import
+        pio.to_json({}, validate=False)
+        self._renderers: List[KaleidoRenderer] = [KaleidoRenderer(i) for i in range(size)]
+        self._idle: queue.Queue = queue.Queue()
+        for renderer in self._renderers:
+            self._idle.put(renderer)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """Context manager lending an idle renderer, blocking until one is available."""
+        try:
+            renderer = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No Kaleido renderer available after {timeout}s") from None
+        try:
+            yield renderer
+        finally:
+            self._idle.put(renderer)
+
+    def to_image(self, fig, fmt: str = 'png', width: Optional[int] = None, height: Optional[int] = None,
+                 scale: float = 1, validate: bool = True) -> bytes:
+        """Exports a figure on the first renderer available. Same semantic as `plotly.io.to_image`."""
+        with self.checkout() as renderer:
+            return renderer.to_image(fig, fmt=fmt, width=width, height=height, scale=scale, validate=validate)
+
+    def warm_up(self) -> None:
+        """Starts the Chromium subprocess of every renderer, in parallel, by exporting an empty figure on each"""
+        with ExitStack() as stack:
+            renderers = [stack.enter_context(self.checkout()) for _ in range(self.size)]
+            with ThreadPoolExecutor(self.size) as executor:
+                list(executor.map(lambda r: r.to_image(EMPTY_FIGURE, width=10, height=10, validate=False), renderers))
+
+    def available(self) -> int:
+        """Number of renderers currently idle"""
+        return self._idle.qsize()
+
+    def renders_per_renderer(self) -> List[int]:
+        """Number of exports each renderer performed, indexed by renderer id"""
+        return [r.renders for r in self._renderers]
+
+    def shutdown(self) -> None:
+        """Stops every Chromium subprocess of the pool"""
+        for renderer in self._renderers:
+            renderer.shutdown()
+
+
+_pool: Optional[KaleidoRendererPool] = None
+_pool_size: int = DEFAULT_POOL_SIZE
+_pool_lock = threading.Lock()
+
+
+def configure_renderer_pool(size: int) -> None:
+    """Sets the size of the shared renderer pool. Has to be called before the first render to be effective,
+    otherwise the existing pool is shut down and replaced."""
+    global _pool, _pool_size
+    with _pool_lock:
+        _pool_size = size
+        if _pool is not None and _pool.size != size:
+            _pool.shutdown()
+            _pool = None
+    logging.info(f"Kaleido renderer pool configured with {size} renderers.")
+
+
+def get_renderer_pool() -> KaleidoRendererPool:
+    """Returns the shared renderer pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = KaleidoRendererPool(_pool_size)
+    return _pool
@@ -0,0 +1,374 @@
+"""Struct of arrays versions of the collections of models.price_point.
+
+Every field is held in a contiguous numpy array (float64 for the values, datetime64[us] for the dates) and the
+accessors return views of those arrays instead of building new lists. The row oriented api of AbsCollection
+(first_value, coll, ...) is kept on top of them for compatibility."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from models.price_point import AbsCollection, CollectionOhcl, CollectionSingleTradePoint, DataTradePoint, \
+    OhclTradePoint, SingleTradePoint
+from models.resample import Buckets, bucketize
+
+DATE_DTYPE = 'datetime64[us]'
+
+
+def to_naive_utc(date: datetime) -> datetime:
+    """numpy dates have no timezone: aware datetimes are converted to UTC first"""
+    if date.tzinfo is None:
+        return date
+    return date.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _float_column(values: Sequence[Optional[float]]) -> np.ndarray:
+    """Casts a sequence of floats to a contiguous float64 array, None being stored as NaN. No copy is done if the
+    values already are such an array."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _date_column(dates: Sequence[Union[datetime, np.datetime64]]) -> np.ndarray:
+    if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+        return np.ascontiguousarray(dates, dtype=DATE_DTYPE)
+    return np.array([to_naive_utc(d) for d in dates], dtype=DATE_DTYPE)
+
+
+def sorted_order(dates: np.ndarray, dedupe: bool = False) -> Optional[np.ndarray]:
+    """Indices putting the dates in chronological order, None if they already are and there's nothing to remove.
+    The sort is stable. If dedupe is set, only the last index of each date is kept."""
+    order = None
+    if len(dates) > 1 and np.any(dates[1:] < dates[:-1]):
+        order = np.argsort(dates, kind='stable')
+        dates = dates[order]
+    if dedupe and len(dates) > 1:
+        keep = np.append(dates[1:] != dates[:-1], True)
+        if not np.all(keep):
+            order = np.flatnonzero(keep) if order is None else order[keep]
+    return order
+
+
+class AbsColumnarCollection(ABC):
+    """Columns shared by all the collections: the dates and the volumes (NaN when unknown)"""
+    row_class = DataTradePoint
+    value_columns: tuple = ()
+
+    def __init__(self, dates: Sequence, volumes: Optional[Sequence[Optional[float]]] = None):
+        self._dates = _date_column(dates)
+        if volumes is None:
+            self._volumes = np.full(len(self._dates), np.nan)
+        else:
+            self._volumes = _float_column(volumes)
+        if len(self._volumes) != len(self._dates):
+            raise ValueError(f"Got {len(self._volumes)} volumes for {len(self._dates)} dates")
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Every column of the collection, by name"""
+        cols = {'dates': self._dates, 'volumes': self._volumes}
+        cols.update({name: getattr(self, '_' + name) for name in self.value_columns})
+        return cols
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], dedupe: bool = False) -> AbsColumnarCollection:
+        """Bulk constructor: builds a collection from its columns (see `columns()`), sorting them at most once"""
+        col = cls(**columns)
+        order = sorted_order(col._dates, dedupe)
+        if order is not None:
+            col = cls(**{name: values[order] for name, values in col.columns().items()})
+        return col
+
+    def extend(self, other: AbsColumnarCollection, dedupe: bool = False) -> None:
+        """Add all the points of another collection at once, sorting the result at most once.
+        If dedupe is set, the points of `other` replace the ones sharing their date."""
+        merged = type(self).from_columns({name: np.concatenate((values, other.columns()[name]))
+                                          for name, values in self.columns().items()}, dedupe=dedupe)
+        for name, values in merged.columns().items():
+            setattr(self, '_' + name, values)
+
+    def _row(self, i: int) -> DataTradePoint:
+        """Builds the row oriented data point at the given index, without validation"""
+        volume = self._volumes[i]
+        fields = {'date': self._dates[i].item(), 'volume': None if np.isnan(volume) else float(volume)}
+        fields.update(self._row_values(i))
+        return self.row_class.construct(**fields)
+
+    @abstractmethod
+    def _row_values(self, i: int) -> dict:
+        """Values of the point at the given index, by field of the row class"""
+
+    @property
+    def coll(self) -> List[DataTradePoint]:
+        """Row oriented view of the collection. Built on each access, prefer the column accessors."""
+        return [self._row(i) for i in range(self.size())]
+
+    def add(self, data_point: DataTradePoint) -> None:
+        """Add a new data point to the collection, keeping it sorted."""
+        date = np.datetime64(to_naive_utc(data_point.date), 'us')
+        i = int(np.searchsorted(self._dates, date, side='right'))
+        self._dates = np.insert(self._dates, i, date)
+        self._volumes = np.insert(self._volumes, i, np.nan if data_point.volume is None else data_point.volume)
+        for name, value in self._point_values(data_point).items():
+            setattr(self, '_' + name, np.insert(getattr(self, '_' + name), i, value))
+
+    @abstractmethod
+    def _point_values(self, data_point: DataTradePoint) -> dict:
+        """Values of a row oriented data point, by column"""
+
+    def first_value(self) -> DataTradePoint:
+        """Returns the data point with the earliest recorded value"""
+        return self._row(0)
+
+    def last_value(self) -> DataTradePoint:
+        """Returns the data point with the latest recorded value"""
+        return self._row(self.size() - 1)
+
+    def size(self) -> int:
+        """Number of elements in the collection"""
+        return len(self._dates)
+
+    def has_volume(self) -> bool:
+        """Whether any point of the collection carries a volume"""
+        return not np.isnan(self._volumes).all()
+
+    def total_volume(self) -> Optional[float]:
+        """Returns the total volume of the collection, False if no volume is known"""
+        if np.all(np.isnan(self._volumes)):
+            return False
+        return float(np.nansum(self._volumes))
+
+    def volumes(self) -> np.ndarray:
+        """Returns a view on the volumes, sorted by time. Unknown volumes are NaN."""
+        return self._volumes
+
+    def dates(self) -> np.ndarray:
+        """Returns a view on the dates, sorted by time"""
+        return self._dates
+
+    def closest_to(self, date_to_compare: datetime) -> DataTradePoint:
+        """Returns the datapoint that has the closest date to the given argument"""
+        target = np.datetime64(to_naive_utc(date_to_compare), 'us')
+        return self._row(int(np.argmin(np.abs(self._dates - target))))
+
+    def matching_date_ts_seconds(self, ts: int) -> Optional[DataTradePoint]:
+        """If any, returns a DataTradePoint whose time is matching. Timestamp has to be in seconds.
+        The dates are stored as naive UTC, so the timestamp is compared as a UTC epoch: unlike the row oriented
+        collection, which reads naive dates in the local time of the host, the result doesn't depend on its
+        timezone."""
+        matches = np.flatnonzero(self._dates == np.datetime64(int(ts * 1_000_000), 'us'))
+        return self._row(int(matches[0])) if len(matches) else None
+
+    def _chunk_starts(self, size: int) -> np.ndarray:
+        return np.arange(0, self.size(), size)
+
+    def _chunk_volumes(self, starts: np.ndarray) -> np.ndarray:
+        """Sum of the volumes of each chunk, NaN for the chunks without any known volume"""
+        known = np.add.reduceat(~np.isnan(self._volumes), starts) if len(starts) else np.zeros(0)
+        sums = np.add.reduceat(np.nan_to_num(self._volumes), starts) if len(starts) else np.zeros(0)
+        return np.where(known > 0, sums, np.nan)
+
+    def _chronological(self) -> AbsColumnarCollection:
+        """The collection itself if its dates are sorted, else a sorted copy: the points are kept in the order
+        they were sent, the resampling needs them in chronological order"""
+        order = sorted_order(self._dates)
+        if order is None:
+            return self
+        return type(self)(**{name: values[order] for name, values in self.columns().items()})
+
+    def _bucket_volumes(self, buckets: Buckets) -> np.ndarray:
+        """Sum of the volumes of each bucket, 0 for the empty ones if the volumes are known"""
+        return buckets.spread(self._chunk_volumes(buckets.starts), 0. if self.has_volume() else np.nan)
+
+
+# noinspection SpellCheckingInspection
+class ColumnarCollectionSingleTradePoint(AbsColumnarCollection):
+    """Columnar collection of single trade points."""
+    row_class = SingleTradePoint
+    value_columns = ('values',)
+
+    def __init__(self, dates: Sequence, values: Sequence[float], volumes: Optional[Sequence[Optional[float]]] = None):
+        super().__init__(dates, volumes)
+        self._values = _float_column(values)
+        if len(self._values) != len(self._dates):
+            raise ValueError(f"Got {len(self._values)} values for {len(self._dates)} dates")
+
+    @classmethod
+    def from_collection(cls, collection: CollectionSingleTradePoint) -> ColumnarCollectionSingleTradePoint:
+        """Casts a row oriented collection to a columnar one"""
+        return cls(dates=[d.date for d in collection.coll],
+                   values=[d.value for d in collection.coll],
+                   volumes=[d.volume for d in collection.coll])
+
+    @classmethod
+    def from_raw_values(cls, values: Sequence[float], volumes: Sequence[Optional[float]], dates: Sequence,
+                        dedupe: bool = False) -> ColumnarCollectionSingleTradePoint:
+        """Returns an initialized collection from the provided raw value, sorted by date"""
+        return cls.from_columns(dict(dates=dates, values=values, volumes=volumes), dedupe=dedupe)
+
+    def _row_values(self, i: int) -> dict:
+        return {'value': float(self._values[i])}
+
+    def _point_values(self, data_point: SingleTradePoint) -> dict:
+        return {'values': data_point.value}
+
+    def values(self) -> np.ndarray:
+        """Returns a view on the values, sorted by time"""
+        return self._values
+
+    def regroup(self, size) -> ColumnarCollectionSingleTradePoint:
+        """Merges the collection of single trade points by groupe of 'size' into a new Collection"""
+        starts = self._chunk_starts(size)
+        return ColumnarCollectionSingleTradePoint(dates=self._dates[starts],
+                                                  values=self._values[starts],
+                                                  volumes=self._chunk_volumes(starts))
+
+    def resample(self, interval: str, timezone: Optional[str] = None,
+                 fill_gaps: bool = False) -> ColumnarCollectionSingleTradePoint:
+        """Resamples the collection by wall-clock interval (see models.resample): each point is the last value of
+        its bucket, with the volume of the whole bucket. If fill_gaps is set, the empty buckets repeat the previous
+        value with no volume."""
+        col = self._chronological()
+        if col is not self:
+            return col.resample(interval, timezone, fill_gaps)
+        buckets = bucketize(self._dates, interval, timezone, fill_gaps)
+        values = self._values[buckets.ends]
+        return ColumnarCollectionSingleTradePoint(dates=buckets.dates, values=buckets.spread(values, values),
+                                                  volumes=self._bucket_volumes(buckets))
+
+    def to_ohcl(self, interval: str, timezone: Optional[str] = None, fill_gaps: bool = False) -> ColumnarCollectionOhcl:
+        """Aggregates the trades in candles of the given wall-clock interval (see models.resample). If fill_gaps
+        is set, the intervals without trades are flat candles at the previous close, with no volume."""
+        col = self._chronological()
+        if col is not self:
+            return col.to_ohcl(interval, timezone, fill_gaps)
+        buckets = bucketize(self._dates, interval, timezone, fill_gaps)
+        if not len(buckets.starts):
+            return ColumnarCollectionOhcl(dates=[], opens=[], highs=[], lows=[], closes=[])
+        return _candles(buckets, self._bucket_volumes(buckets),
+                        opens=self._values[buckets.starts],
+                        highs=np.maximum.reduceat(self._values, buckets.starts),
+                        lows=np.minimum.reduceat(self._values, buckets.starts),
+                        closes=self._values[buckets.ends])
+
+
+# noinspection SpellCheckingInspection
+class ColumnarCollectionOhcl(AbsColumnarCollection):
+    """Columnar collection of Ohcls."""
+    row_class = OhclTradePoint
+    value_columns = ('opens', 'highs', 'lows', 'closes')
+
+    def __init__(self, dates: Sequence, opens: Sequence[float], highs: Sequence[float], lows: Sequence[float],
+                 closes: Sequence[float], volumes: Optional[Sequence[Optional[float]]] = None):
+        super().__init__(dates, volumes)
+        self._opens = _float_column(opens)
+        self._highs = _float_column(highs)
+        self._lows = _float_column(lows)
+        self._closes = _float_column(closes)
+        for name in self.value_columns:
+            if len(getattr(self, '_' + name)) != len(self._dates):
+                raise ValueError(f"Got {len(getattr(self, '_' + name))} {name} for {len(self._dates)} dates")
+
+    @classmethod
+    def from_collection(cls, collection: CollectionOhcl) -> ColumnarCollectionOhcl:
+        """Casts a row oriented collection to a columnar one"""
+        return cls(dates=[d.date for d in collection.coll],
+                   opens=[d.v_open for d in collection.coll],
+                   highs=[d.v_high for d in collection.coll],
+                   lows=[d.v_low for d in collection.coll],
+                   closes=[d.v_close for d in collection.coll],
+                   volumes=[d.volume for d in collection.coll])
+
+    @classmethod
+    def from_raw_values(cls, opens: Sequence[float], highs: Sequence[float], lows: Sequence[float],
+                        closes: Sequence[float], volumes: Sequence[Optional[float]], dates: Sequence,
+                        dedupe: bool = False) -> ColumnarCollectionOhcl:
+        """Returns an initialized collection from the provided raw value, sorted by date"""
+        return cls.from_columns(dict(dates=dates, opens=opens, highs=highs, lows=lows, closes=closes,
+                                     volumes=volumes), dedupe=dedupe)
+
+    def _row_values(self, i: int) -> dict:
+        return {'v_open': float(self._opens[i]), 'v_high': float(self._highs[i]),
+                'v_low': float(self._lows[i]), 'v_close': float(self._closes[i])}
+
+    def _point_values(self, data_point: OhclTradePoint) -> dict:
+        return {'opens': data_point.v_open, 'highs': data_point.v_high,
+                'lows': data_point.v_low, 'closes': data_point.v_close}
+
+    def highest_value(self) -> OhclTradePoint:
+        """Returns the OHCL with the highest value"""
+        return self._row(int(np.argmax(self._highs)))
+
+    def lowest_value(self) -> OhclTradePoint:
+        """return the OHCL with the lowest value"""
+        return self._row(int(np.argmin(self._lows)))
+
+    def lows(self) -> np.ndarray:
+        """Returns a view on the lows, sorted by time"""
+        return self._lows
+
+    def highs(self) -> np.ndarray:
+        """Returns a view on the highs, sorted by time"""
+        return self._highs
+
+    def opens(self) -> np.ndarray:
+        """Returns a view on the opens, sorted by time"""
+        return self._opens
+
+    def closes(self) -> np.ndarray:
+        """Returns a view on the closes, sorted by time"""
+        return self._closes
+
+    def regroup(self, size) -> ColumnarCollectionOhcl:
+        """Merges the collection of ohcl by groupe of 'size' into a new collection"""
+        if not self.size():
+            return ColumnarCollectionOhcl(dates=[], opens=[], highs=[], lows=[], closes=[])
+        starts = self._chunk_starts(size)
+        ends = np.minimum(starts + size, self.size()) - 1
+        return ColumnarCollectionOhcl(dates=self._dates[starts],
+                                      opens=self._opens[starts],
+                                      highs=np.maximum.reduceat(self._highs, starts),
+                                      lows=np.minimum.reduceat(self._lows, starts),
+                                      closes=self._closes[ends],
+                                      volumes=self._chunk_volumes(starts))
+
+    def resample(self, interval: str, timezone: Optional[str] = None,
+                 fill_gaps: bool = False) -> ColumnarCollectionOhcl:
+        """Merges the candles by wall-clock interval (see models.resample). If fill_gaps is set, the intervals
+        without candles are flat candles at the previous close, with no volume."""
+        col = self._chronological()
+        if col is not self:
+            return col.resample(interval, timezone, fill_gaps)
+        buckets = bucketize(self._dates, interval, timezone, fill_gaps)
+        if not len(buckets.starts):
+            return ColumnarCollectionOhcl(dates=[], opens=[], highs=[], lows=[], closes=[])
+        return _candles(buckets, self._bucket_volumes(buckets),
+                        opens=self._opens[buckets.starts],
+                        highs=np.maximum.reduceat(self._highs, buckets.starts),
+                        lows=np.minimum.reduceat(self._lows, buckets.starts),
+                        closes=self._closes[buckets.ends])
+
+
+def _candles(buckets: Buckets, volumes: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+             closes: np.ndarray) -> ColumnarCollectionOhcl:
+    """Candles of the given buckets from the columns aggregated over the non empty ones, the empty ones being flat
+    at the previous close"""
+    return ColumnarCollectionOhcl(dates=buckets.dates,
+                                  opens=buckets.spread(opens, closes),
+                                  highs=buckets.spread(highs, closes),
+                                  lows=buckets.spread(lows, closes),
+                                  closes=buckets.spread(closes, closes),
+                                  volumes=volumes)
+
+
+def to_columnar(collection: Union[AbsCollection, AbsColumnarCollection]) -> AbsColumnarCollection:
+    """Returns the columnar version of a collection, the collection itself if it already is columnar"""
+    match collection:
+        case AbsColumnarCollection():
+            return collection
+        case CollectionOhcl():
+            return ColumnarCollectionOhcl.from_collection(collection)
+        case CollectionSingleTradePoint():
+            return ColumnarCollectionSingleTradePoint.from_collection(collection)
+    raise TypeError(f"Can't cast {type(collection).__name__} to a columnar collection")
@@ -1,10 +1,16 @@
 from dataclasses import dataclass
-from typing import Optional, Any
+from typing import Any, List, Optional
 
 import pydantic
 
+from graph.decimation import MODES as DOWNSAMPLINGS
+from models.resample import parse_interval, parse_timezone
 from models.themes import GraphTheme, DarkTheme, WhiteTheme
 
+SUBSAMPLINGS = ('4:4:4', '4:2:2', '4:2:0')
+# width in pixels of the variants of an image, the full one keeping the size it was painted at
+VARIANT_WIDTHS = {'thumbnail': 320, 'preview': 800, 'full': None}
+
 
 # noinspection PyTypeChecker
 class GraphOption(pydantic.BaseModel):
@@ -19,11 +25,93 @@ class GraphOption(pydantic.BaseModel):
     upper_part_text: Optional[str] = None
     watermark: Optional[str] = None
     export_type: str = 'JPEG'
+    # 'plotly' renders through plotly and Kaleido, 'raster' draws directly with Pillow
+    render_backend: str = 'plotly'
+    # downsampling of the long simple charts: None, 'lttb' (largest triangle three buckets) or 'minmax'
+    downsample: Optional[str] = None
+    # resampling of the points by wall-clock interval ('1m', '5m', '1h', '1d', ...) before painting, a candlestick
+    # can then be painted from raw trades. The daily buckets start at midnight in the timezone (UTC by default).
+    interval: Optional[str] = None
+    timezone: Optional[str] = None
+    # the intervals without any point are painted flat instead of being skipped
+    fill_gaps: bool = False
+    # the chart is framed by a border colored by its trend. Without border nor upper part text, the image is
+    # exported by Kaleido in its export type directly.
+    border: bool = True
+    # encoding: quality of the JPEG and WEBP images (1-100), progressive JPEG, chroma subsampling of the JPEG
+    # images ('4:4:4', '4:2:2' or '4:2:0'), and number of colors of the palette the PNG images are reduced to
+    quality: Optional[int] = None
+    progressive: bool = False
+    subsampling: Optional[str] = None
+    palette_colors: Optional[int] = None
+    # size of the figure, and scale it's exported at: the images are (width * scale) x (height * scale) pixels
+    width: int = 1600
+    height: int = 900
+    scale: float = 2
+    # several sizes of the image painted once at the largest one, see VARIANT_WIDTHS
+    variants: Optional[List[str]] = None
 
     def __init__(self, **data: Any):
         super().__init__(**data)
         self.theme = WhiteTheme if self.theme_name.lower() == 'white' else DarkTheme
 
+    @pydantic.validator('downsample')
+    def _check_downsample(cls, downsample: Optional[str]) -> Optional[str]:
+        if downsample is not None and downsample not in DOWNSAMPLINGS:
+            raise ValueError(f"Unknown downsampling {downsample}, expected one of {', '.join(DOWNSAMPLINGS)}")
+        return downsample
+
+    @pydantic.validator('interval')
+    def _check_interval(cls, interval: Optional[str]) -> Optional[str]:
+        if interval is not None:
+            parse_interval(interval)
+        return interval
+
+    @pydantic.validator('timezone')
+    def _check_timezone(cls, timezone: Optional[str]) -> Optional[str]:
+        parse_timezone(timezone)
+        return timezone
+
+    @pydantic.validator('quality')
+    def _check_quality(cls, quality: Optional[int]) -> Optional[int]:
+        if quality is not None and not 1 <= quality <= 100:
+            raise ValueError(f"The quality must be between 1 and 100, got {quality}")
+        return quality
+
+    @pydantic.validator('subsampling')
+    def _check_subsampling(cls, subsampling: Optional[str]) -> Optional[str]:
+        if subsampling is not None and subsampling not in SUBSAMPLINGS:
+            raise ValueError(f"Unknown subsampling {subsampling}, expected one of {', '.join(SUBSAMPLINGS)}")
+        return subsampling
+
+    @pydantic.validator('palette_colors')
+    def _check_palette_colors(cls, colors: Optional[int]) -> Optional[int]:
+        if colors is not None and not 2 <= colors <= 256:
+            raise ValueError(f"The palette must have between 2 and 256 colors, got {colors}")
+        return colors
+
+    @pydantic.validator('width', 'height')
+    def _check_size(cls, size: int, field: pydantic.fields.ModelField) -> int:
+        if not 100 <= size <= 4096:
+            raise ValueError(f"The {field.name} must be between 100 and 4096, got {size}")
+        return size
+
+    @pydantic.validator('scale')
+    def _check_scale(cls, scale: float) -> float:
+        if not 0.1 <= scale <= 4:
+            raise ValueError(f"The scale must be between 0.1 and 4, got {scale}")
+        return scale
+
+    @pydantic.validator('variants')
+    def _check_variants(cls, variants: Optional[List[str]]) -> Optional[List[str]]:
+        if variants is None:
+            return None
+        unknown = [name for name in variants if name not in VARIANT_WIDTHS]
+        if unknown:
+            raise ValueError(f"Unknown variants {', '.join(unknown)}, expected some of {', '.join(VARIANT_WIDTHS)}")
+        # no variant is the same as no variants option
+        return variants or None
+
     def generate_watermark(self):
         """Generates a watermark to add on the graph if requested"""
         if self.watermark is None:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC
 from datetime import datetime
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Iterable
 import pydantic
 
 
@@ -48,6 +48,17 @@ class AbsCollection(pydantic.BaseModel, ABC):
         self.coll.append(data_point)
         self.coll.sort(key=lambda x: x.date)
 
+    def extend(self, data_points: Iterable[DataTradePoint], dedupe: bool = False) -> None:
+        """Add several data points to the collection, sorting it at most once.
+        If dedupe is set, only the last point added is kept for a given date."""
+        self.coll.extend(data_points)
+        if any(self.coll[i].date > self.coll[i + 1].date for i in range(len(self.coll) - 1)):
+            # the sort is stable, points sharing a date keep their insertion order
+            self.coll.sort(key=lambda x: x.date)
+        if dedupe:
+            self.coll = [p for i, p in enumerate(self.coll)
+                         if i == len(self.coll) - 1 or p.date != self.coll[i + 1].date]
+
     def first_value(self) -> DataTradePoint:
         """Returns the data point with the earliest recorded value"""
         return self.coll[0]
@@ -89,6 +100,12 @@ class AbsCollection(pydantic.BaseModel, ABC):
         """If any, returns a DataTradePoint whose time is matching. Timestamp has to be in seconds"""
         return next(x for x in self.coll if x.date.timestamp() == ts)
 
+    def _regrouped_rows(self, rows: List[DataTradePoint], size: int) -> List[DataTradePoint]:
+        """Rows of the chunks of 'size' points merged on the columns: they get back the date of the first point of
+        their chunk, as given (the columns hold naive UTC dates), and a volume of 0 if none of its points had one"""
+        return [row.copy(update=dict(date=self.coll[start].date, volume=0. if row.volume is None else row.volume))
+                for start, row in zip(range(0, self.size(), size), rows)]
+
 
 # noinspection SpellCheckingInspection
 class CollectionSingleTradePoint(AbsCollection, pydantic.BaseModel):
@@ -103,32 +120,21 @@ class CollectionSingleTradePoint(AbsCollection, pydantic.BaseModel):
 
     @classmethod
     def from_raw_values(cls, values: List[float], volumes: List[Optional[float]],
-                        dates: List[datetime]) -> CollectionSingleTradePoint:
+                        dates: List[datetime], dedupe: bool = False) -> CollectionSingleTradePoint:
         """Returns an initialized collection from the provided raw value"""
         col = CollectionSingleTradePoint()
-        for i in range(len(values)):
-            col.add(SingleTradePoint(value=values[i],
+        col.extend((SingleTradePoint(value=values[i],
                                      volume=volumes[i],
-                                     date=dates[i]))
+                                     date=dates[i]) for i in range(len(values))), dedupe=dedupe)
         return col
 
     def regroup(self, size) -> CollectionSingleTradePoint:
-        """Merges the collection of single trade points by groupe of 'size' into a new Collection"""
-
-        def chunks(lst, n):
-            """Yield successive n-sized chunks from lst."""
-            for i in range(0, len(lst), n):
-                yield CollectionOhcl(coll=lst[i:i + n])
-
-        tmp = chunks(self.coll, size)
-        new_coll = CollectionSingleTradePoint()
-        for colls in tmp:
-            earliest = colls.first_value()
-            new_ohcl = SingleTradePoint(value=earliest.value,
-                                        date=earliest.date,
-                                        volume=colls.total_volume())
-            new_coll.add(new_ohcl)
-        return new_coll
+        """Merges the collection of single trade points by groupe of 'size' into a new Collection. The merge is done
+        on the columns of the collection, see models.columnar."""
+        # imported here: models.columnar builds on the collections of this module
+        from models.columnar import ColumnarCollectionSingleTradePoint
+        regrouped = ColumnarCollectionSingleTradePoint.from_collection(self).regroup(size)
+        return CollectionSingleTradePoint.construct(coll=self._regrouped_rows(regrouped.coll, size))
 
     def values(self) -> List[float]:
         return [d.value for d in self.coll]
@@ -147,16 +153,15 @@ class CollectionOhcl(AbsCollection, pydantic.BaseModel):
 
     @classmethod
     def from_raw_values(cls, opens: List[float], highs: List[float], lows: List[float], closes: List[float],
-                        volumes: List[Optional[float]], dates: List[datetime]) -> CollectionOhcl:
+                        volumes: List[Optional[float]], dates: List[datetime], dedupe: bool = False) -> CollectionOhcl:
         """Returns an initialized collection from the provided raw value"""
         col = CollectionOhcl()
-        for i in range(len(opens)):
-            col.add(OhclTradePoint(v_open=opens[i],
+        col.extend((OhclTradePoint(v_open=opens[i],
                                    v_close=closes[i],
                                    v_low=lows[i],
                                    v_high=highs[i],
                                    volume=volumes[i],
-                                   date=dates[i]))
+                                   date=dates[i]) for i in range(len(opens))), dedupe=dedupe)
         return col
 
     def highest_value(self) -> OhclTradePoint:
@@ -184,22 +189,9 @@ class CollectionOhcl(AbsCollection, pydantic.BaseModel):
         return [d.v_close for d in self.coll]
 
     def regroup(self, size) -> CollectionOhcl:
-        """Merges the collection of ohcl by groupe of 'size' into a new CollectionOHCL"""
-
-        def chunks(lst, n):
-            """Yield successive n-sized chunks from lst."""
-            for i in range(0, len(lst), n):
-                yield CollectionOhcl(coll=lst[i:i + n])
-
-        tmp = chunks(self.coll, size)
-        new_coll = CollectionOhcl()
-        for colls in tmp:
-            earliest = colls.first_value()
-            new_ohcl = OhclTradePoint(v_open=earliest.v_open,
-                                      v_close=colls.last_value().v_close,
-                                      v_low=colls.lowest_value().v_low,
-                                      v_high=colls.highest_value().v_high,
-                                      date=earliest.date,
-                                      volume=colls.total_volume())
-            new_coll.add(new_ohcl)
-        return new_coll
+        """Merges the collection of ohcl by groupe of 'size' into a new CollectionOHCL. The merge is done on the
+        columns of the collection, see models.columnar."""
+        # imported here: models.columnar builds on the collections of this module
+        from models.columnar import ColumnarCollectionOhcl
+        regrouped = ColumnarCollectionOhcl.from_collection(self).regroup(size)
+        return CollectionOhcl.construct(coll=self._regrouped_rows(regrouped.coll, size))
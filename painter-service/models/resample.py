@@ -0,0 +1,124 @@
+"""Bucketing of sorted dates by wall-clock interval, used to resample the columnar collections.
+
+The intervals are written as a number and a unit: '30s', '1m', '5m', '1h', '4h', '1d', '1w'. The buckets are
+aligned on the unix epoch, the weeks starting on monday. With a timezone, the daily and weekly buckets start at
+local midnight, DST changes included; the shorter ones keep a constant length and are aligned on the offset of the
+timezone at the first date."""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+SECOND_US = 1_000_000
+HOUR_US = 3600 * SECOND_US
+DAY_US = 24 * HOUR_US
+WEEK_US = 7 * DAY_US
+# 1970-01-01 is a thursday, the first monday is 4 days later
+WEEK_ORIGIN_US = 4 * DAY_US
+UNITS = {'s': SECOND_US, 'm': 60 * SECOND_US, 'h': HOUR_US, 'd': DAY_US, 'w': WEEK_US}
+# bound of the number of buckets when the gaps are filled
+MAX_BUCKETS = 1_000_000
+_INTERVAL = re.compile(r'^\s*(\d+)\s*([smhdw])\s*$')
+
+
+@lru_cache(maxsize=64)
+def parse_interval(interval: str) -> int:
+    """Length in microseconds of an interval such as '5m'"""
+    match = _INTERVAL.match(interval)
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid interval {interval}, expected a number followed by one of {', '.join(UNITS)}")
+    return int(match.group(1)) * UNITS[match.group(2)]
+
+
+@lru_cache(maxsize=64)
+def parse_timezone(timezone: Optional[str]) -> Optional[ZoneInfo]:
+    """The timezone of the given IANA name, None for UTC"""
+    if timezone is None or timezone.upper() == 'UTC':
+        return None
+    try:
+        return ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone {timezone}")
+
+
+def utc_offsets(dates_us: np.ndarray, tz: ZoneInfo) -> np.ndarray:
+    """Offsets in microseconds of the timezone to UTC, at each of the given sorted UTC timestamps. The timezone is
+    queried once per distinct hour, the offsets only changing on hour boundaries."""
+    if not len(dates_us):
+        return np.zeros(0, dtype=np.int64)
+    hours = dates_us // HOUR_US
+    starts = np.append(0, np.flatnonzero(np.diff(hours)) + 1)
+    offsets = np.array([datetime.fromtimestamp(int(h) * 3600, tz).utcoffset() // timedelta(microseconds=1)
+                        for h in hours[starts]], dtype=np.int64)
+    return np.repeat(offsets, np.diff(np.append(starts, len(hours))))
+
+
+@dataclass
+class Buckets:
+    """Buckets of a sorted series of dates"""
+    # start of each bucket, naive UTC
+    dates: np.ndarray
+    # indices of the first and last dates of each non empty bucket
+    starts: np.ndarray
+    ends: np.ndarray
+    # set when the gaps are filled: for each bucket, the index of the last non empty bucket at or before it, and
+    # whether it's empty
+    owners: Optional[np.ndarray] = None
+    empty: Optional[np.ndarray] = None
+
+    def spread(self, values: np.ndarray, gaps: Union[np.ndarray, float]) -> np.ndarray:
+        """Places the values aggregated over the non empty buckets in all the buckets. The empty ones take the
+        `gaps` value, indexed like `values` if it's an array: the one of the previous non empty bucket."""
+        if self.owners is None:
+            return values
+        if isinstance(gaps, np.ndarray):
+            gaps = gaps[self.owners]
+        return np.where(self.empty, gaps, values[self.owners])
+
+
+def bucketize(dates: np.ndarray, interval: str, timezone: Optional[str] = None,
+              fill_gaps: bool = False) -> Buckets:
+    """Splits sorted datetime64 dates in buckets of the given interval. If fill_gaps is set, the buckets without
+    any date between the first and the last one are kept. Raises ValueError if the dates aren't sorted."""
+    length = parse_interval(interval)
+    tz = parse_timezone(timezone)
+    dates_us = dates.astype('datetime64[us]').astype(np.int64)
+    if len(dates_us) > 1 and np.any(dates_us[1:] < dates_us[:-1]):
+        raise ValueError("The dates to bucketize must be sorted")
+    if not len(dates_us):
+        no_index = np.zeros(0, dtype=np.int64)
+        return Buckets(dates=np.zeros(0, dtype='datetime64[us]'), starts=no_index, ends=no_index)
+    origin = WEEK_ORIGIN_US if length % WEEK_US == 0 else 0
+    calendar = tz is not None and length % DAY_US == 0
+    offset = 0
+    if calendar:
+        offset = utc_offsets(dates_us, tz)
+    elif tz is not None:
+        offset = int(utc_offsets(dates_us[:1], tz)[0])
+    keys = (dates_us + offset - origin) // length
+
+    starts = np.append(0, np.flatnonzero(np.diff(keys)) + 1)
+    ends = np.append(starts[1:], len(keys)) - 1
+    keys = keys[starts]
+    owners = empty = None
+    if fill_gaps:
+        if keys[-1] - keys[0] >= MAX_BUCKETS:
+            raise ValueError(f"Filling the gaps would make {keys[-1] - keys[0] + 1} buckets of {interval}, "
+                             f"at most {MAX_BUCKETS} are allowed")
+        all_keys = np.arange(keys[0], keys[-1] + 1)
+        owners = np.searchsorted(keys, all_keys, side='right') - 1
+        empty = keys[owners] != all_keys
+        keys = all_keys
+
+    local = keys * length + origin
+    if calendar:
+        # the offset at the start of the bucket, found from the one at its local time
+        utc = local - utc_offsets(local, tz)
+        utc = local - utc_offsets(utc, tz)
+    else:
+        utc = local - offset
+    return Buckets(dates=utc.astype('datetime64[us]'), starts=starts, ends=ends, owners=owners, empty=empty)
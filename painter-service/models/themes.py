@@ -1,10 +1,27 @@
 from abc import ABC
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Tuple
 
-import PIL
 import pydantic
-from PIL import ImageFont
+
+
+@lru_cache(maxsize=None)
+def load_font(path: str, size: int):
+    """Font of the given file and size, loaded once"""
+    from PIL import ImageFont
+    return ImageFont.truetype(path, size, encoding="unic")
+
+
+class LazyFont:
+    """Font of a theme, loaded on its first use rather than when the themes are defined"""
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+
+    def __get__(self, instance, owner):
+        return load_font(self.path, self.size)
 
 
 @dataclass(frozen=True)
@@ -18,7 +35,14 @@ class GraphTheme(ABC):
     decreasing_color = '#FF0000'
     upper_part_font_size = 40
     watermark_color: str = 'white'
-    upper_part_font = ImageFont.truetype("DejaVuSans.ttf", upper_part_font_size, encoding="unic")
+    upper_part_font = LazyFont("DejaVuSans.ttf", upper_part_font_size)
+    # used by the raster backend, which draws the charts without plotly
+    raster_font_size = 22
+    raster_font = LazyFont("DejaVuSans.ttf", raster_font_size)
+    raster_watermark_font = LazyFont("DejaVuSans.ttf", 100)
+    raster_bg_color: Tuple[int, int, int] = (17, 17, 17)
+    raster_grid_color: Tuple[int, int, int] = (40, 52, 66)
+    raster_txt_color: Tuple[int, int, int] = (242, 245, 250)
     # used to paint the border of the images if higher or lower values
     increase_color_img_border: str = '#013220'  # that's some green
     decrease_color_img_border: str = '#3f0000'  # that's some red
@@ -31,6 +55,9 @@ class DarkTheme(GraphTheme):
     plot_bgcolor = None
     layout_template = 'plotly_dark'
     watermark_color = 'white'
+    raster_bg_color = (17, 17, 17)
+    raster_grid_color = (40, 52, 66)
+    raster_txt_color = (242, 245, 250)
 
 
 @dataclass(frozen=True)
@@ -40,6 +67,9 @@ class WhiteTheme(GraphTheme):
     plot_bgcolor = None
     layout_template = 'rgb(250, 250, 250)'
     watermark_color = 'dark'
+    raster_bg_color = (250, 250, 250)
+    raster_grid_color = (223, 223, 223)
+    raster_txt_color = (42, 63, 95)
     watermark = [dict(name='watermark',
                       font=dict(color="dark", size=50),
                       text="THEFOMOBOT.COM",
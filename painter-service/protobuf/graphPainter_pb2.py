@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x12graphPainter.proto\"A\n\x0c\x43hartRequest\x12\r\n\x05\x64\x61tas\x18\x01 \x01(\t\x12\x11\n\ttokenInfo\x18\x02 \x01(\t\x12\x0f\n\x07options\x18\x03 \x01(\t\"\x1e\n\rChartResponse\x12\r\n\x05image\x18\x01 \x01(\x0c\"$\n\x11SayHelloGPMessage\x12\x0f\n\x07message\x18\x01 \x01(\t2\xae\x01\n\x13GraphPainterService\x12\x33\n\x07GreetGP\x12\x12.SayHelloGPMessage\x1a\x12.SayHelloGPMessage\"\x00\x12\x33\n\x10PaintCandlestick\x12\r.ChartRequest\x1a\x0e.ChartResponse\"\x00\x12-\n\nPaintChart\x12\r.ChartRequest\x1a\x0e.ChartResponse\"\x00\x62\x06proto3'
+  serialized_pb=b'\n\x12graphPainter.proto\"a\n\x0c\x43hartRequest\x12\r\n\x05\x64\x61tas\x18\x01 \x01(\t\x12\x11\n\ttokenInfo\x18\x02 \x01(\t\x12\x0f\n\x07options\x18\x03 \x01(\t\x12\r\n\x05\x61rrow\x18\x04 \x01(\x0c\x12\x0f\n\x07parquet\x18\x05 \x01(\x0c\"\xec\x01\n\x0e\x43hartRequestV2\x12\x12\n\ntimestamps\x18\x01 \x03(\x12\x12\r\n\x05opens\x18\x02 \x03(\x01\x12\r\n\x05highs\x18\x03 \x03(\x01\x12\x0c\n\x04lows\x18\x04 \x03(\x01\x12\x0e\n\x06\x63loses\x18\x05 \x03(\x01\x12\x0e\n\x06values\x18\x06 \x03(\x01\x12\x0f\n\x07volumes\x18\x07 \x03(\x01\x12$\n\ttokenInfo\x18\x08 \x01(\x0b\x32\x11.TokenInfoMessage\x12$\n\x07options\x18\t \x01(\x0b\x32\x13.GraphOptionMessage\x12\x1d\n\x06series\x18\n \x01(\x0b\x32\r.SeriesWindow\")\n\x0c\x42\x61tchRequest\x12\x19\n\x05items\x18\x01 \x03(\x0b\x32\n.BatchItem\">\n\tBatchItem\x12\x1c\n\x05\x63hart\x18\x01 \x01(\x0b\x32\r.ChartRequest\x12\x13\n\x0b\x63\x61ndlestick\x18\x02 \x01(\x08\"^\n\x11\x42\x61tchItemResponse\x12\r\n\x05index\x18\x01 \x01(\r\x12\x0c\n\x04\x63ode\x18\x02 \x01(\x05\x12\r\n\x05\x65rror\x18\x03 \x01(\t\x12\x1d\n\x05\x63hart\x18\x04 \x01(\x0b\x32\x0e.ChartResponse\"\x86\x01\n\x0bGridRequest\x12\x1a\n\x06panels\x18\x01 \x03(\x0b\x32\n.GridPanel\x12$\n\x07options\x18\x02 \x01(\x0b\x32\x13.GraphOptionMessage\x12\x14\n\x07\x63olumns\x18\x03 \x01(\rH\x00\x88\x01\x01\x12\x13\n\x0b\x63rop_panels\x18\x04 \x01(\x08\x42\n\n\x08_columns\"^\n\tGridPanel\x12\x1e\n\x05\x63hart\x18\x01 \x01(\x0b\x32\x0f.ChartRequestV2\x12\x13\n\x0b\x63\x61ndlestick\x18\x02 \x01(\x08\x12\x12\n\x05title\x18\x03 \x01(\tH\x00\x88\x01\x01\x42\x08\n\x06_title\"w\n\x0cSeriesWindow\x12\x11\n\ttimeframe\x18\x01 \x01(\t\x12\x12\n\x05start\x18\x02 \x01(\x03H\x00\x88\x01\x01\x12\x10\n\x03\x65nd\x18\x03 \x01(\x03H\x01\x88\x01\x01\x12\x12\n\x05limit\x18\x04 \x01(\rH\x02\x88\x01\x01\x42\x08\n\x06_startB\x06\n\x04_endB\x08\n\x06_limit\"\xaf\x01\n\x14\x41ppendCandlesRequest\x12\x12\n\nchain_name\x18\x01 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x02 \x01(\t\x12\x11\n\ttimeframe\x18\x03 \x01(\t\x12\x12\n\ntimestamps\x18\x04 \x03(\x12\x12\r\n\x05opens\x18\x05 \x03(\x01\x12\r\n\x05highs\x18\x06 \x03(\x01\x12\x0c\n\x04lows\x18\x07 \x03(\x01\x12\x0e\n\x06\x63loses\x18\x08 \x03(\x01\x12\x0f\n\x07volumes\x18\t \x03(\x01\"7\n\x15\x41ppendCandlesResponse\x12\x10\n\x08\x61ppended\x18\x01 \x01(\x04\x12\x0c\n\x04size\x18\x02 \x01(\x04\"\x8c\x03\n\x10TokenInfoMessage\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x1d\n\x10\x63urrency_against\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x1c\n\x0fvolume_currency\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x13\n\x06ticker\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x14\n\x07\x61\x64\x64ress\x18\x05 \x01(\tH\x03\x88\x01\x01\x12\x14\n\x07holders\x18\x06 \x01(\x03H\x04\x88\x01\x01\x12\x14\n\x07\x64\x65\x63imal\x18\x07 \x01(\x05H\x05\x88\x01\x01\x12\x19\n\x0ctotal_supply\x18\x08 \x01(\x03H\x06\x88\x01\x01\x12\x17\n\nmarket_cap\x18\t \x01(\x03H\x07\x88\x01\x01\x12\x19\n\x0cpicture_link\x18\n \x01(\tH\x08\x88\x01\x01\x42\x13\n\x11_currency_againstB\x12\n\x10_volume_currencyB\t\n\x07_tickerB\n\n\x08_addressB\n\n\x08_holdersB\n\n\x08_decimalB\x0f\n\r_total_supplyB\r\n\x0b_market_capB\x0f\n\r_picture_link\"\x99\x06\n\x12GraphOptionMessage\x12\x17\n\ntheme_name\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x17\n\nchain_name\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x17\n\x0f\x62ollinger_bands\x18\x03 \x01(\x08\x12\x17\n\x0f\x66ibonacci_bands\x18\x04 \x01(\x08\x12\x0b\n\x03rsi\x18\x05 \x01(\x08\x12\x0f\n\x07\x61verage\x18\x06 \x01(\x08\x12\x0f\n\x07\x66inance\x18\x07 \x01(\x08\x12\x1c\n\x0fupper_part_text\x18\x08 \x01(\tH\x02\x88\x01\x01\x12\x16\n\twatermark\x18\t \x01(\tH\x03\x88\x01\x01\x12\x18\n\x0b\x65xport_type\x18\n \x01(\tH\x04\x88\x01\x01\x12\x1b\n\x0erender_backend\x18\x0b \x01(\tH\x05\x88\x01\x01\x12\x17\n\ndownsample\x18\x0c \x01(\tH\x06\x88\x01\x01\x12\x15\n\x08interval\x18\r \x01(\tH\x07\x88\x01\x01\x12\x15\n\x08timezone\x18\x0e \x01(\tH\x08\x88\x01\x01\x12\x11\n\tfill_gaps\x18\x0f \x01(\x08\x12\x13\n\x06\x62order\x18\x10 \x01(\x08H\t\x88\x01\x01\x12\x14\n\x07quality\x18\x11 \x01(\x05H\n\x88\x01\x01\x12\x13\n\x0bprogressive\x18\x12 \x01(\x08\x12\x18\n\x0bsubsampling\x18\x13 \x01(\tH\x0b\x88\x01\x01\x12\x1b\n\x0epalette_colors\x18\x14 \x01(\x05H\x0c\x88\x01\x01\x12\x12\n\x05width\x18\x15 \x01(\x05H\r\x88\x01\x01\x12\x13\n\x06height\x18\x16 \x01(\x05H\x0e\x88\x01\x01\x12\x12\n\x05scale\x18\x17 \x01(\x01H\x0f\x88\x01\x01\x12\x10\n\x08variants\x18\x18 \x03(\tB\r\n\x0b_theme_nameB\r\n\x0b_chain_nameB\x12\n\x10_upper_part_textB\x0c\n\n_watermarkB\x0e\n\x0c_export_typeB\x11\n\x0f_render_backendB\r\n\x0b_downsampleB\x0b\n\t_intervalB\x0b\n\t_timezoneB\t\n\x07_borderB\n\n\x08_qualityB\x0e\n\x0c_subsamplingB\x11\n\x0f_palette_colorsB\x08\n\x06_widthB\t\n\x07_heightB\x08\n\x06_scale\"?\n\rChartResponse\x12\r\n\x05image\x18\x01 \x01(\x0c\x12\x1f\n\x08variants\x18\x02 \x03(\x0b\x32\r.ImageVariant\"J\n\x0cImageVariant\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05width\x18\x02 \x01(\x05\x12\x0e\n\x06height\x18\x03 \x01(\x05\x12\r\n\x05image\x18\x04 \x01(\x0c\"\x10\n\x0eMetricsRequest\"\xba\x01\n\x10HistogramMessage\x12\x0c\n\x04name\x18\x01 \x01(\t\x12-\n\x06labels\x18\x02 \x03(\x0b\x32\x1d.HistogramMessage.LabelsEntry\x12\x0e\n\x06\x62ounds\x18\x03 \x03(\x01\x12\x0e\n\x06\x63ounts\x18\x04 \x03(\x04\x12\x0b\n\x03sum\x18\x05 \x01(\x01\x12\r\n\x05\x63ount\x18\x06 \x01(\x04\x1a-\n\x0bLabelsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x91\x02\n\x0fMetricsResponse\x12\x17\n\x0fprometheus_text\x18\x01 \x01(\t\x12%\n\nhistograms\x18\x02 \x03(\x0b\x32\x11.HistogramMessage\x12,\n\x06gauges\x18\x03 \x03(\x0b\x32\x1c.MetricsResponse.GaugesEntry\x12\x30\n\x08\x63ounters\x18\x04 \x03(\x0b\x32\x1e.MetricsResponse.CountersEntry\x1a-\n\x0bGaugesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\x1a/\n\rCountersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"$\n\x11SayHelloGPMessage\x12\x0f\n\x07message\x18\x01 \x01(\t2\xf1\x03\n\x13GraphPainterService\x12\x33\n\x07GreetGP\x12\x12.SayHelloGPMessage\x1a\x12.SayHelloGPMessage\"\x00\x12\x33\n\x10PaintCandlestick\x12\r.ChartRequest\x1a\x0e.ChartResponse\"\x00\x12-\n\nPaintChart\x12\r.ChartRequest\x1a\x0e.ChartResponse\"\x00\x12\x37\n\x12PaintCandlestickV2\x12\x0f.ChartRequestV2\x1a\x0e.ChartResponse\"\x00\x12\x31\n\x0cPaintChartV2\x12\x0f.ChartRequestV2\x1a\x0e.ChartResponse\"\x00\x12\x33\n\nPaintBatch\x12\r.BatchRequest\x1a\x12.BatchItemResponse\"\x00\x30\x01\x12@\n\rAppendCandles\x12\x15.AppendCandlesRequest\x1a\x16.AppendCandlesResponse\"\x00\x12+\n\tPaintGrid\x12\x0c.GridRequest\x1a\x0e.ChartResponse\"\x00\x12\x31\n\nGetMetrics\x12\x0f.MetricsRequest\x1a\x10.MetricsResponse\"\x00\x62\x06proto3'
 )
 
 
@@ -54,6 +54,1048 @@ _CHARTREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='arrow', full_name='ChartRequest.arrow', index=3,
+      number=4, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='parquet', full_name='ChartRequest.parquet', index=4,
+      number=5, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=22,
+  serialized_end=119,
+)
+
+
+_CHARTREQUESTV2 = _descriptor.Descriptor(
+  name='ChartRequestV2',
+  full_name='ChartRequestV2',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='timestamps', full_name='ChartRequestV2.timestamps', index=0,
+      number=1, type=18, cpp_type=2, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='opens', full_name='ChartRequestV2.opens', index=1,
+      number=2, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='highs', full_name='ChartRequestV2.highs', index=2,
+      number=3, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='lows', full_name='ChartRequestV2.lows', index=3,
+      number=4, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='closes', full_name='ChartRequestV2.closes', index=4,
+      number=5, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='values', full_name='ChartRequestV2.values', index=5,
+      number=6, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='volumes', full_name='ChartRequestV2.volumes', index=6,
+      number=7, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='tokenInfo', full_name='ChartRequestV2.tokenInfo', index=7,
+      number=8, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='options', full_name='ChartRequestV2.options', index=8,
+      number=9, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='series', full_name='ChartRequestV2.series', index=9,
+      number=10, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=122,
+  serialized_end=358,
+)
+
+
+_BATCHREQUEST = _descriptor.Descriptor(
+  name='BatchRequest',
+  full_name='BatchRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='items', full_name='BatchRequest.items', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=360,
+  serialized_end=401,
+)
+
+
+_BATCHITEM = _descriptor.Descriptor(
+  name='BatchItem',
+  full_name='BatchItem',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='chart', full_name='BatchItem.chart', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='candlestick', full_name='BatchItem.candlestick', index=1,
+      number=2, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=403,
+  serialized_end=465,
+)
+
+
+_BATCHITEMRESPONSE = _descriptor.Descriptor(
+  name='BatchItemResponse',
+  full_name='BatchItemResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='index', full_name='BatchItemResponse.index', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='code', full_name='BatchItemResponse.code', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='error', full_name='BatchItemResponse.error', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='chart', full_name='BatchItemResponse.chart', index=3,
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=467,
+  serialized_end=561,
+)
+
+
+_GRIDREQUEST = _descriptor.Descriptor(
+  name='GridRequest',
+  full_name='GridRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='panels', full_name='GridRequest.panels', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='options', full_name='GridRequest.options', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='columns', full_name='GridRequest.columns', index=2,
+      number=3, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='crop_panels', full_name='GridRequest.crop_panels', index=3,
+      number=4, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='_columns', full_name='GridRequest._columns',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+  ],
+  serialized_start=564,
+  serialized_end=698,
+)
+
+
+_GRIDPANEL = _descriptor.Descriptor(
+  name='GridPanel',
+  full_name='GridPanel',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='chart', full_name='GridPanel.chart', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='candlestick', full_name='GridPanel.candlestick', index=1,
+      number=2, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='title', full_name='GridPanel.title', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='_title', full_name='GridPanel._title',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+  ],
+  serialized_start=700,
+  serialized_end=794,
+)
+
+
+_SERIESWINDOW = _descriptor.Descriptor(
+  name='SeriesWindow',
+  full_name='SeriesWindow',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='timeframe', full_name='SeriesWindow.timeframe', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='start', full_name='SeriesWindow.start', index=1,
+      number=2, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='end', full_name='SeriesWindow.end', index=2,
+      number=3, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='limit', full_name='SeriesWindow.limit', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='_start', full_name='SeriesWindow._start',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_end', full_name='SeriesWindow._end',
+      index=1, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_limit', full_name='SeriesWindow._limit',
+      index=2, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+  ],
+  serialized_start=796,
+  serialized_end=915,
+)
+
+
+_APPENDCANDLESREQUEST = _descriptor.Descriptor(
+  name='AppendCandlesRequest',
+  full_name='AppendCandlesRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='chain_name', full_name='AppendCandlesRequest.chain_name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='address', full_name='AppendCandlesRequest.address', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='timeframe', full_name='AppendCandlesRequest.timeframe', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='timestamps', full_name='AppendCandlesRequest.timestamps', index=3,
+      number=4, type=18, cpp_type=2, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='opens', full_name='AppendCandlesRequest.opens', index=4,
+      number=5, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='highs', full_name='AppendCandlesRequest.highs', index=5,
+      number=6, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='lows', full_name='AppendCandlesRequest.lows', index=6,
+      number=7, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='closes', full_name='AppendCandlesRequest.closes', index=7,
+      number=8, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='volumes', full_name='AppendCandlesRequest.volumes', index=8,
+      number=9, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=918,
+  serialized_end=1093,
+)
+
+
+_APPENDCANDLESRESPONSE = _descriptor.Descriptor(
+  name='AppendCandlesResponse',
+  full_name='AppendCandlesResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='appended', full_name='AppendCandlesResponse.appended', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='AppendCandlesResponse.size', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1095,
+  serialized_end=1150,
+)
+
+
+_TOKENINFOMESSAGE = _descriptor.Descriptor(
+  name='TokenInfoMessage',
+  full_name='TokenInfoMessage',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='name', full_name='TokenInfoMessage.name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='currency_against', full_name='TokenInfoMessage.currency_against', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='volume_currency', full_name='TokenInfoMessage.volume_currency', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ticker', full_name='TokenInfoMessage.ticker', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='address', full_name='TokenInfoMessage.address', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='holders', full_name='TokenInfoMessage.holders', index=5,
+      number=6, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='decimal', full_name='TokenInfoMessage.decimal', index=6,
+      number=7, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='total_supply', full_name='TokenInfoMessage.total_supply', index=7,
+      number=8, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='market_cap', full_name='TokenInfoMessage.market_cap', index=8,
+      number=9, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='picture_link', full_name='TokenInfoMessage.picture_link', index=9,
+      number=10, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='_currency_against', full_name='TokenInfoMessage._currency_against',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_volume_currency', full_name='TokenInfoMessage._volume_currency',
+      index=1, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_ticker', full_name='TokenInfoMessage._ticker',
+      index=2, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_address', full_name='TokenInfoMessage._address',
+      index=3, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_holders', full_name='TokenInfoMessage._holders',
+      index=4, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_decimal', full_name='TokenInfoMessage._decimal',
+      index=5, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_total_supply', full_name='TokenInfoMessage._total_supply',
+      index=6, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_market_cap', full_name='TokenInfoMessage._market_cap',
+      index=7, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_picture_link', full_name='TokenInfoMessage._picture_link',
+      index=8, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+  ],
+  serialized_start=1153,
+  serialized_end=1549,
+)
+
+
+_GRAPHOPTIONMESSAGE = _descriptor.Descriptor(
+  name='GraphOptionMessage',
+  full_name='GraphOptionMessage',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='theme_name', full_name='GraphOptionMessage.theme_name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='chain_name', full_name='GraphOptionMessage.chain_name', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='bollinger_bands', full_name='GraphOptionMessage.bollinger_bands', index=2,
+      number=3, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='fibonacci_bands', full_name='GraphOptionMessage.fibonacci_bands', index=3,
+      number=4, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='rsi', full_name='GraphOptionMessage.rsi', index=4,
+      number=5, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='average', full_name='GraphOptionMessage.average', index=5,
+      number=6, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='finance', full_name='GraphOptionMessage.finance', index=6,
+      number=7, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='upper_part_text', full_name='GraphOptionMessage.upper_part_text', index=7,
+      number=8, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='watermark', full_name='GraphOptionMessage.watermark', index=8,
+      number=9, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='export_type', full_name='GraphOptionMessage.export_type', index=9,
+      number=10, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='render_backend', full_name='GraphOptionMessage.render_backend', index=10,
+      number=11, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='downsample', full_name='GraphOptionMessage.downsample', index=11,
+      number=12, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='interval', full_name='GraphOptionMessage.interval', index=12,
+      number=13, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='timezone', full_name='GraphOptionMessage.timezone', index=13,
+      number=14, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='fill_gaps', full_name='GraphOptionMessage.fill_gaps', index=14,
+      number=15, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='border', full_name='GraphOptionMessage.border', index=15,
+      number=16, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='quality', full_name='GraphOptionMessage.quality', index=16,
+      number=17, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='progressive', full_name='GraphOptionMessage.progressive', index=17,
+      number=18, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='subsampling', full_name='GraphOptionMessage.subsampling', index=18,
+      number=19, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='palette_colors', full_name='GraphOptionMessage.palette_colors', index=19,
+      number=20, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='width', full_name='GraphOptionMessage.width', index=20,
+      number=21, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='height', full_name='GraphOptionMessage.height', index=21,
+      number=22, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='scale', full_name='GraphOptionMessage.scale', index=22,
+      number=23, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='variants', full_name='GraphOptionMessage.variants', index=23,
+      number=24, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='_theme_name', full_name='GraphOptionMessage._theme_name',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_chain_name', full_name='GraphOptionMessage._chain_name',
+      index=1, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_upper_part_text', full_name='GraphOptionMessage._upper_part_text',
+      index=2, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_watermark', full_name='GraphOptionMessage._watermark',
+      index=3, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_export_type', full_name='GraphOptionMessage._export_type',
+      index=4, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_render_backend', full_name='GraphOptionMessage._render_backend',
+      index=5, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_downsample', full_name='GraphOptionMessage._downsample',
+      index=6, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_interval', full_name='GraphOptionMessage._interval',
+      index=7, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_timezone', full_name='GraphOptionMessage._timezone',
+      index=8, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_border', full_name='GraphOptionMessage._border',
+      index=9, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_quality', full_name='GraphOptionMessage._quality',
+      index=10, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_subsampling', full_name='GraphOptionMessage._subsampling',
+      index=11, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_palette_colors', full_name='GraphOptionMessage._palette_colors',
+      index=12, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_width', full_name='GraphOptionMessage._width',
+      index=13, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_height', full_name='GraphOptionMessage._height',
+      index=14, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_scale', full_name='GraphOptionMessage._scale',
+      index=15, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+  ],
+  serialized_start=1552,
+  serialized_end=2345,
+)
+
+
+_CHARTRESPONSE = _descriptor.Descriptor(
+  name='ChartResponse',
+  full_name='ChartResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='image', full_name='ChartResponse.image', index=0,
+      number=1, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='variants', full_name='ChartResponse.variants', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2347,
+  serialized_end=2410,
+)
+
+
+_IMAGEVARIANT = _descriptor.Descriptor(
+  name='ImageVariant',
+  full_name='ImageVariant',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='name', full_name='ImageVariant.name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='width', full_name='ImageVariant.width', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='height', full_name='ImageVariant.height', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='image', full_name='ImageVariant.image', index=3,
+      number=4, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -66,23 +1108,55 @@ _CHARTREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=22,
-  serialized_end=87,
+  serialized_start=2412,
+  serialized_end=2486,
 )
 
 
-_CHARTRESPONSE = _descriptor.Descriptor(
-  name='ChartResponse',
-  full_name='ChartResponse',
+_METRICSREQUEST = _descriptor.Descriptor(
+  name='MetricsRequest',
+  full_name='MetricsRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2488,
+  serialized_end=2504,
+)
+
+
+_HISTOGRAMMESSAGE_LABELSENTRY = _descriptor.Descriptor(
+  name='LabelsEntry',
+  full_name='HistogramMessage.LabelsEntry',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
-      name='image', full_name='ChartResponse.image', index=0,
-      number=1, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"",
+      name='key', full_name='HistogramMessage.LabelsEntry.key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='HistogramMessage.LabelsEntry.value', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
@@ -92,14 +1166,209 @@ _CHARTRESPONSE = _descriptor.Descriptor(
   nested_types=[],
   enum_types=[
   ],
+  serialized_options=b'8\001',
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2648,
+  serialized_end=2693,
+)
+
+_HISTOGRAMMESSAGE = _descriptor.Descriptor(
+  name='HistogramMessage',
+  full_name='HistogramMessage',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='name', full_name='HistogramMessage.name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='labels', full_name='HistogramMessage.labels', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='bounds', full_name='HistogramMessage.bounds', index=2,
+      number=3, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='counts', full_name='HistogramMessage.counts', index=3,
+      number=4, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='sum', full_name='HistogramMessage.sum', index=4,
+      number=5, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='count', full_name='HistogramMessage.count', index=5,
+      number=6, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[_HISTOGRAMMESSAGE_LABELSENTRY, ],
+  enum_types=[
+  ],
   serialized_options=None,
   is_extendable=False,
   syntax='proto3',
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=89,
-  serialized_end=119,
+  serialized_start=2507,
+  serialized_end=2693,
+)
+
+
+_METRICSRESPONSE_GAUGESENTRY = _descriptor.Descriptor(
+  name='GaugesEntry',
+  full_name='MetricsResponse.GaugesEntry',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='key', full_name='MetricsResponse.GaugesEntry.key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='MetricsResponse.GaugesEntry.value', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=b'8\001',
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2875,
+  serialized_end=2920,
+)
+
+_METRICSRESPONSE_COUNTERSENTRY = _descriptor.Descriptor(
+  name='CountersEntry',
+  full_name='MetricsResponse.CountersEntry',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='key', full_name='MetricsResponse.CountersEntry.key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='MetricsResponse.CountersEntry.value', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=b'8\001',
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2922,
+  serialized_end=2969,
+)
+
+_METRICSRESPONSE = _descriptor.Descriptor(
+  name='MetricsResponse',
+  full_name='MetricsResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='prometheus_text', full_name='MetricsResponse.prometheus_text', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='histograms', full_name='MetricsResponse.histograms', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='gauges', full_name='MetricsResponse.gauges', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='counters', full_name='MetricsResponse.counters', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[_METRICSRESPONSE_GAUGESENTRY, _METRICSRESPONSE_COUNTERSENTRY, ],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2696,
+  serialized_end=2969,
 )
 
 
@@ -130,12 +1399,134 @@ _SAYHELLOGPMESSAGE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=121,
-  serialized_end=157,
+  serialized_start=2971,
+  serialized_end=3007,
 )
 
+_CHARTREQUESTV2.fields_by_name['tokenInfo'].message_type = _TOKENINFOMESSAGE
+_CHARTREQUESTV2.fields_by_name['options'].message_type = _GRAPHOPTIONMESSAGE
+_CHARTREQUESTV2.fields_by_name['series'].message_type = _SERIESWINDOW
+_BATCHREQUEST.fields_by_name['items'].message_type = _BATCHITEM
+_BATCHITEM.fields_by_name['chart'].message_type = _CHARTREQUEST
+_BATCHITEMRESPONSE.fields_by_name['chart'].message_type = _CHARTRESPONSE
+_GRIDREQUEST.fields_by_name['panels'].message_type = _GRIDPANEL
+_GRIDREQUEST.fields_by_name['options'].message_type = _GRAPHOPTIONMESSAGE
+_GRIDREQUEST.oneofs_by_name['_columns'].fields.append(
+  _GRIDREQUEST.fields_by_name['columns'])
+_GRIDREQUEST.fields_by_name['columns'].containing_oneof = _GRIDREQUEST.oneofs_by_name['_columns']
+_GRIDPANEL.fields_by_name['chart'].message_type = _CHARTREQUESTV2
+_GRIDPANEL.oneofs_by_name['_title'].fields.append(
+  _GRIDPANEL.fields_by_name['title'])
+_GRIDPANEL.fields_by_name['title'].containing_oneof = _GRIDPANEL.oneofs_by_name['_title']
+_SERIESWINDOW.oneofs_by_name['_start'].fields.append(
+  _SERIESWINDOW.fields_by_name['start'])
+_SERIESWINDOW.fields_by_name['start'].containing_oneof = _SERIESWINDOW.oneofs_by_name['_start']
+_SERIESWINDOW.oneofs_by_name['_end'].fields.append(
+  _SERIESWINDOW.fields_by_name['end'])
+_SERIESWINDOW.fields_by_name['end'].containing_oneof = _SERIESWINDOW.oneofs_by_name['_end']
+_SERIESWINDOW.oneofs_by_name['_limit'].fields.append(
+  _SERIESWINDOW.fields_by_name['limit'])
+_SERIESWINDOW.fields_by_name['limit'].containing_oneof = _SERIESWINDOW.oneofs_by_name['_limit']
+_TOKENINFOMESSAGE.oneofs_by_name['_currency_against'].fields.append(
+  _TOKENINFOMESSAGE.fields_by_name['currency_against'])
+_TOKENINFOMESSAGE.fields_by_name['currency_against'].containing_oneof = _TOKENINFOMESSAGE.oneofs_by_name['_currency_against']
+_TOKENINFOMESSAGE.oneofs_by_name['_volume_currency'].fields.append(
+  _TOKENINFOMESSAGE.fields_by_name['volume_currency'])
+_TOKENINFOMESSAGE.fields_by_name['volume_currency'].containing_oneof = _TOKENINFOMESSAGE.oneofs_by_name['_volume_currency']
+_TOKENINFOMESSAGE.oneofs_by_name['_ticker'].fields.append(
+  _TOKENINFOMESSAGE.fields_by_name['ticker'])
+_TOKENINFOMESSAGE.fields_by_name['ticker'].containing_oneof = _TOKENINFOMESSAGE.oneofs_by_name['_ticker']
+_TOKENINFOMESSAGE.oneofs_by_name['_address'].fields.append(
+  _TOKENINFOMESSAGE.fields_by_name['address'])
+_TOKENINFOMESSAGE.fields_by_name['address'].containing_oneof = _TOKENINFOMESSAGE.oneofs_by_name['_address']
+_TOKENINFOMESSAGE.oneofs_by_name['_holders'].fields.append(
+  _TOKENINFOMESSAGE.fields_by_name['holders'])
+_TOKENINFOMESSAGE.fields_by_name['holders'].containing_oneof = _TOKENINFOMESSAGE.oneofs_by_name['_holders']
+_TOKENINFOMESSAGE.oneofs_by_name['_decimal'].fields.append(
+  _TOKENINFOMESSAGE.fields_by_name['decimal'])
+_TOKENINFOMESSAGE.fields_by_name['decimal'].containing_oneof = _TOKENINFOMESSAGE.oneofs_by_name['_decimal']
+_TOKENINFOMESSAGE.oneofs_by_name['_total_supply'].fields.append(
+  _TOKENINFOMESSAGE.fields_by_name['total_supply'])
+_TOKENINFOMESSAGE.fields_by_name['total_supply'].containing_oneof = _TOKENINFOMESSAGE.oneofs_by_name['_total_supply']
+_TOKENINFOMESSAGE.oneofs_by_name['_market_cap'].fields.append(
+  _TOKENINFOMESSAGE.fields_by_name['market_cap'])
+_TOKENINFOMESSAGE.fields_by_name['market_cap'].containing_oneof = _TOKENINFOMESSAGE.oneofs_by_name['_market_cap']
+_TOKENINFOMESSAGE.oneofs_by_name['_picture_link'].fields.append(
+  _TOKENINFOMESSAGE.fields_by_name['picture_link'])
+_TOKENINFOMESSAGE.fields_by_name['picture_link'].containing_oneof = _TOKENINFOMESSAGE.oneofs_by_name['_picture_link']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_theme_name'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['theme_name'])
+_GRAPHOPTIONMESSAGE.fields_by_name['theme_name'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_theme_name']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_chain_name'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['chain_name'])
+_GRAPHOPTIONMESSAGE.fields_by_name['chain_name'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_chain_name']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_upper_part_text'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['upper_part_text'])
+_GRAPHOPTIONMESSAGE.fields_by_name['upper_part_text'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_upper_part_text']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_watermark'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['watermark'])
+_GRAPHOPTIONMESSAGE.fields_by_name['watermark'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_watermark']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_export_type'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['export_type'])
+_GRAPHOPTIONMESSAGE.fields_by_name['export_type'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_export_type']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_render_backend'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['render_backend'])
+_GRAPHOPTIONMESSAGE.fields_by_name['render_backend'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_render_backend']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_downsample'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['downsample'])
+_GRAPHOPTIONMESSAGE.fields_by_name['downsample'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_downsample']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_interval'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['interval'])
+_GRAPHOPTIONMESSAGE.fields_by_name['interval'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_interval']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_timezone'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['timezone'])
+_GRAPHOPTIONMESSAGE.fields_by_name['timezone'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_timezone']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_border'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['border'])
+_GRAPHOPTIONMESSAGE.fields_by_name['border'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_border']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_quality'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['quality'])
+_GRAPHOPTIONMESSAGE.fields_by_name['quality'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_quality']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_subsampling'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['subsampling'])
+_GRAPHOPTIONMESSAGE.fields_by_name['subsampling'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_subsampling']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_palette_colors'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['palette_colors'])
+_GRAPHOPTIONMESSAGE.fields_by_name['palette_colors'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_palette_colors']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_width'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['width'])
+_GRAPHOPTIONMESSAGE.fields_by_name['width'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_width']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_height'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['height'])
+_GRAPHOPTIONMESSAGE.fields_by_name['height'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_height']
+_GRAPHOPTIONMESSAGE.oneofs_by_name['_scale'].fields.append(
+  _GRAPHOPTIONMESSAGE.fields_by_name['scale'])
+_GRAPHOPTIONMESSAGE.fields_by_name['scale'].containing_oneof = _GRAPHOPTIONMESSAGE.oneofs_by_name['_scale']
+_CHARTRESPONSE.fields_by_name['variants'].message_type = _IMAGEVARIANT
+_HISTOGRAMMESSAGE_LABELSENTRY.containing_type = _HISTOGRAMMESSAGE
+_HISTOGRAMMESSAGE.fields_by_name['labels'].message_type = _HISTOGRAMMESSAGE_LABELSENTRY
+_METRICSRESPONSE_GAUGESENTRY.containing_type = _METRICSRESPONSE
+_METRICSRESPONSE_COUNTERSENTRY.containing_type = _METRICSRESPONSE
+_METRICSRESPONSE.fields_by_name['histograms'].message_type = _HISTOGRAMMESSAGE
+_METRICSRESPONSE.fields_by_name['gauges'].message_type = _METRICSRESPONSE_GAUGESENTRY
+_METRICSRESPONSE.fields_by_name['counters'].message_type = _METRICSRESPONSE_COUNTERSENTRY
 DESCRIPTOR.message_types_by_name['ChartRequest'] = _CHARTREQUEST
+DESCRIPTOR.message_types_by_name['ChartRequestV2'] = _CHARTREQUESTV2
+DESCRIPTOR.message_types_by_name['BatchRequest'] = _BATCHREQUEST
+DESCRIPTOR.message_types_by_name['BatchItem'] = _BATCHITEM
+DESCRIPTOR.message_types_by_name['BatchItemResponse'] = _BATCHITEMRESPONSE
+DESCRIPTOR.message_types_by_name['GridRequest'] = _GRIDREQUEST
+DESCRIPTOR.message_types_by_name['GridPanel'] = _GRIDPANEL
+DESCRIPTOR.message_types_by_name['SeriesWindow'] = _SERIESWINDOW
+DESCRIPTOR.message_types_by_name['AppendCandlesRequest'] = _APPENDCANDLESREQUEST
+DESCRIPTOR.message_types_by_name['AppendCandlesResponse'] = _APPENDCANDLESRESPONSE
+DESCRIPTOR.message_types_by_name['TokenInfoMessage'] = _TOKENINFOMESSAGE
+DESCRIPTOR.message_types_by_name['GraphOptionMessage'] = _GRAPHOPTIONMESSAGE
 DESCRIPTOR.message_types_by_name['ChartResponse'] = _CHARTRESPONSE
+DESCRIPTOR.message_types_by_name['ImageVariant'] = _IMAGEVARIANT
+DESCRIPTOR.message_types_by_name['MetricsRequest'] = _METRICSREQUEST
+DESCRIPTOR.message_types_by_name['HistogramMessage'] = _HISTOGRAMMESSAGE
+DESCRIPTOR.message_types_by_name['MetricsResponse'] = _METRICSRESPONSE
 DESCRIPTOR.message_types_by_name['SayHelloGPMessage'] = _SAYHELLOGPMESSAGE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -146,6 +1537,83 @@ ChartRequest = _reflection.GeneratedProtocolMessageType('ChartRequest', (_messag
   })
 _sym_db.RegisterMessage(ChartRequest)
 
+ChartRequestV2 = _reflection.GeneratedProtocolMessageType('ChartRequestV2', (_message.Message,), {
+  'DESCRIPTOR' : _CHARTREQUESTV2,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:ChartRequestV2)
+  })
+_sym_db.RegisterMessage(ChartRequestV2)
+
+BatchRequest = _reflection.GeneratedProtocolMessageType('BatchRequest', (_message.Message,), {
+  'DESCRIPTOR' : _BATCHREQUEST,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:BatchRequest)
+  })
+_sym_db.RegisterMessage(BatchRequest)
+
+BatchItem = _reflection.GeneratedProtocolMessageType('BatchItem', (_message.Message,), {
+  'DESCRIPTOR' : _BATCHITEM,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:BatchItem)
+  })
+_sym_db.RegisterMessage(BatchItem)
+
+BatchItemResponse = _reflection.GeneratedProtocolMessageType('BatchItemResponse', (_message.Message,), {
+  'DESCRIPTOR' : _BATCHITEMRESPONSE,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:BatchItemResponse)
+  })
+_sym_db.RegisterMessage(BatchItemResponse)
+
+GridRequest = _reflection.GeneratedProtocolMessageType('GridRequest', (_message.Message,), {
+  'DESCRIPTOR' : _GRIDREQUEST,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:GridRequest)
+  })
+_sym_db.RegisterMessage(GridRequest)
+
+GridPanel = _reflection.GeneratedProtocolMessageType('GridPanel', (_message.Message,), {
+  'DESCRIPTOR' : _GRIDPANEL,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:GridPanel)
+  })
+_sym_db.RegisterMessage(GridPanel)
+
+SeriesWindow = _reflection.GeneratedProtocolMessageType('SeriesWindow', (_message.Message,), {
+  'DESCRIPTOR' : _SERIESWINDOW,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:SeriesWindow)
+  })
+_sym_db.RegisterMessage(SeriesWindow)
+
+AppendCandlesRequest = _reflection.GeneratedProtocolMessageType('AppendCandlesRequest', (_message.Message,), {
+  'DESCRIPTOR' : _APPENDCANDLESREQUEST,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:AppendCandlesRequest)
+  })
+_sym_db.RegisterMessage(AppendCandlesRequest)
+
+AppendCandlesResponse = _reflection.GeneratedProtocolMessageType('AppendCandlesResponse', (_message.Message,), {
+  'DESCRIPTOR' : _APPENDCANDLESRESPONSE,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:AppendCandlesResponse)
+  })
+_sym_db.RegisterMessage(AppendCandlesResponse)
+
+TokenInfoMessage = _reflection.GeneratedProtocolMessageType('TokenInfoMessage', (_message.Message,), {
+  'DESCRIPTOR' : _TOKENINFOMESSAGE,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:TokenInfoMessage)
+  })
+_sym_db.RegisterMessage(TokenInfoMessage)
+
+GraphOptionMessage = _reflection.GeneratedProtocolMessageType('GraphOptionMessage', (_message.Message,), {
+  'DESCRIPTOR' : _GRAPHOPTIONMESSAGE,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:GraphOptionMessage)
+  })
+_sym_db.RegisterMessage(GraphOptionMessage)
+
 ChartResponse = _reflection.GeneratedProtocolMessageType('ChartResponse', (_message.Message,), {
   'DESCRIPTOR' : _CHARTRESPONSE,
   '__module__' : 'graphPainter_pb2'
@@ -153,6 +1621,58 @@ ChartResponse = _reflection.GeneratedProtocolMessageType('ChartResponse', (_mess
   })
 _sym_db.RegisterMessage(ChartResponse)
 
+ImageVariant = _reflection.GeneratedProtocolMessageType('ImageVariant', (_message.Message,), {
+  'DESCRIPTOR' : _IMAGEVARIANT,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:ImageVariant)
+  })
+_sym_db.RegisterMessage(ImageVariant)
+
+MetricsRequest = _reflection.GeneratedProtocolMessageType('MetricsRequest', (_message.Message,), {
+  'DESCRIPTOR' : _METRICSREQUEST,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:MetricsRequest)
+  })
+_sym_db.RegisterMessage(MetricsRequest)
+
+HistogramMessage = _reflection.GeneratedProtocolMessageType('HistogramMessage', (_message.Message,), {
+
+  'LabelsEntry' : _reflection.GeneratedProtocolMessageType('LabelsEntry', (_message.Message,), {
+    'DESCRIPTOR' : _HISTOGRAMMESSAGE_LABELSENTRY,
+    '__module__' : 'graphPainter_pb2'
+    # @@protoc_insertion_point(class_scope:HistogramMessage.LabelsEntry)
+    })
+  ,
+  'DESCRIPTOR' : _HISTOGRAMMESSAGE,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:HistogramMessage)
+  })
+_sym_db.RegisterMessage(HistogramMessage)
+_sym_db.RegisterMessage(HistogramMessage.LabelsEntry)
+
+MetricsResponse = _reflection.GeneratedProtocolMessageType('MetricsResponse', (_message.Message,), {
+
+  'GaugesEntry' : _reflection.GeneratedProtocolMessageType('GaugesEntry', (_message.Message,), {
+    'DESCRIPTOR' : _METRICSRESPONSE_GAUGESENTRY,
+    '__module__' : 'graphPainter_pb2'
+    # @@protoc_insertion_point(class_scope:MetricsResponse.GaugesEntry)
+    })
+  ,
+
+  'CountersEntry' : _reflection.GeneratedProtocolMessageType('CountersEntry', (_message.Message,), {
+    'DESCRIPTOR' : _METRICSRESPONSE_COUNTERSENTRY,
+    '__module__' : 'graphPainter_pb2'
+    # @@protoc_insertion_point(class_scope:MetricsResponse.CountersEntry)
+    })
+  ,
+  'DESCRIPTOR' : _METRICSRESPONSE,
+  '__module__' : 'graphPainter_pb2'
+  # @@protoc_insertion_point(class_scope:MetricsResponse)
+  })
+_sym_db.RegisterMessage(MetricsResponse)
+_sym_db.RegisterMessage(MetricsResponse.GaugesEntry)
+_sym_db.RegisterMessage(MetricsResponse.CountersEntry)
+
 SayHelloGPMessage = _reflection.GeneratedProtocolMessageType('SayHelloGPMessage', (_message.Message,), {
   'DESCRIPTOR' : _SAYHELLOGPMESSAGE,
   '__module__' : 'graphPainter_pb2'
@@ -161,6 +1681,9 @@ SayHelloGPMessage = _reflection.GeneratedProtocolMessageType('SayHelloGPMessage'
 _sym_db.RegisterMessage(SayHelloGPMessage)
 
 
+_HISTOGRAMMESSAGE_LABELSENTRY._options = None
+_METRICSRESPONSE_GAUGESENTRY._options = None
+_METRICSRESPONSE_COUNTERSENTRY._options = None
 
 _GRAPHPAINTERSERVICE = _descriptor.ServiceDescriptor(
   name='GraphPainterService',
@@ -169,8 +1692,8 @@ _GRAPHPAINTERSERVICE = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_start=160,
-  serialized_end=334,
+  serialized_start=3010,
+  serialized_end=3507,
   methods=[
   _descriptor.MethodDescriptor(
     name='GreetGP',
@@ -202,6 +1725,66 @@ _GRAPHPAINTERSERVICE = _descriptor.ServiceDescriptor(
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='PaintCandlestickV2',
+    full_name='GraphPainterService.PaintCandlestickV2',
+    index=3,
+    containing_service=None,
+    input_type=_CHARTREQUESTV2,
+    output_type=_CHARTRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='PaintChartV2',
+    full_name='GraphPainterService.PaintChartV2',
+    index=4,
+    containing_service=None,
+    input_type=_CHARTREQUESTV2,
+    output_type=_CHARTRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='PaintBatch',
+    full_name='GraphPainterService.PaintBatch',
+    index=5,
+    containing_service=None,
+    input_type=_BATCHREQUEST,
+    output_type=_BATCHITEMRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='AppendCandles',
+    full_name='GraphPainterService.AppendCandles',
+    index=6,
+    containing_service=None,
+    input_type=_APPENDCANDLESREQUEST,
+    output_type=_APPENDCANDLESRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='PaintGrid',
+    full_name='GraphPainterService.PaintGrid',
+    index=7,
+    containing_service=None,
+    input_type=_GRIDREQUEST,
+    output_type=_CHARTRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetMetrics',
+    full_name='GraphPainterService.GetMetrics',
+    index=8,
+    containing_service=None,
+    input_type=_METRICSREQUEST,
+    output_type=_METRICSRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_GRAPHPAINTERSERVICE)
 
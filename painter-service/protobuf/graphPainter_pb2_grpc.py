@@ -30,6 +30,36 @@ class GraphPainterServiceStub(object):
                 request_serializer=graphPainter__pb2.ChartRequest.SerializeToString,
                 response_deserializer=graphPainter__pb2.ChartResponse.FromString,
                 )
+        self.PaintCandlestickV2 = channel.unary_unary(
+                '/GraphPainterService/PaintCandlestickV2',
+                request_serializer=graphPainter__pb2.ChartRequestV2.SerializeToString,
+                response_deserializer=graphPainter__pb2.ChartResponse.FromString,
+                )
+        self.PaintChartV2 = channel.unary_unary(
+                '/GraphPainterService/PaintChartV2',
+                request_serializer=graphPainter__pb2.ChartRequestV2.SerializeToString,
+                response_deserializer=graphPainter__pb2.ChartResponse.FromString,
+                )
+        self.PaintBatch = channel.unary_stream(
+                '/GraphPainterService/PaintBatch',
+                request_serializer=graphPainter__pb2.BatchRequest.SerializeToString,
+                response_deserializer=graphPainter__pb2.BatchItemResponse.FromString,
+                )
+        self.AppendCandles = channel.unary_unary(
+                '/GraphPainterService/AppendCandles',
+                request_serializer=graphPainter__pb2.AppendCandlesRequest.SerializeToString,
+                response_deserializer=graphPainter__pb2.AppendCandlesResponse.FromString,
+                )
+        self.PaintGrid = channel.unary_unary(
+                '/GraphPainterService/PaintGrid',
+                request_serializer=graphPainter__pb2.GridRequest.SerializeToString,
+                response_deserializer=graphPainter__pb2.ChartResponse.FromString,
+                )
+        self.GetMetrics = channel.unary_unary(
+                '/GraphPainterService/GetMetrics',
+                request_serializer=graphPainter__pb2.MetricsRequest.SerializeToString,
+                response_deserializer=graphPainter__pb2.MetricsResponse.FromString,
+                )
 
 
 class GraphPainterServiceServicer(object):
@@ -55,6 +85,51 @@ class GraphPainterServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PaintCandlestickV2(self, request, context):
+        """Same as PaintCandlestick, with the datas sent as packed numeric columns
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PaintChartV2(self, request, context):
+        """Same as PaintChart, with the datas sent as packed numeric columns
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PaintBatch(self, request, context):
+        """Paints the charts of a batch concurrently, each one being streamed back as soon as it's painted, with its own
+        status: a chart that fails doesn't stop the others
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AppendCandles(self, request, context):
+        """Appends candles to the series stored by the service, which PaintCandlestickV2 and PaintChartV2 can then paint
+        from a SeriesWindow instead of the columns sent
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PaintGrid(self, request, context):
+        """Paints several charts as the panels of a single figure, exported at once. The grid is returned as the image of
+        the response, or each panel as one of its variants, named after its index, if crop_panels is set.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMetrics(self, request, context):
+        """Latency histograms of the stages of the renders and gauges of the service
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_GraphPainterServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -73,6 +148,36 @@ def add_GraphPainterServiceServicer_to_server(servicer, server):
                     request_deserializer=graphPainter__pb2.ChartRequest.FromString,
                     response_serializer=graphPainter__pb2.ChartResponse.SerializeToString,
             ),
+            'PaintCandlestickV2': grpc.unary_unary_rpc_method_handler(
+                    servicer.PaintCandlestickV2,
+                    request_deserializer=graphPainter__pb2.ChartRequestV2.FromString,
+                    response_serializer=graphPainter__pb2.ChartResponse.SerializeToString,
+            ),
+            'PaintChartV2': grpc.unary_unary_rpc_method_handler(
+                    servicer.PaintChartV2,
+                    request_deserializer=graphPainter__pb2.ChartRequestV2.FromString,
+                    response_serializer=graphPainter__pb2.ChartResponse.SerializeToString,
+            ),
+            'PaintBatch': grpc.unary_stream_rpc_method_handler(
+                    servicer.PaintBatch,
+                    request_deserializer=graphPainter__pb2.BatchRequest.FromString,
+                    response_serializer=graphPainter__pb2.BatchItemResponse.SerializeToString,
+            ),
+            'AppendCandles': grpc.unary_unary_rpc_method_handler(
+                    servicer.AppendCandles,
+                    request_deserializer=graphPainter__pb2.AppendCandlesRequest.FromString,
+                    response_serializer=graphPainter__pb2.AppendCandlesResponse.SerializeToString,
+            ),
+            'PaintGrid': grpc.unary_unary_rpc_method_handler(
+                    servicer.PaintGrid,
+                    request_deserializer=graphPainter__pb2.GridRequest.FromString,
+                    response_serializer=graphPainter__pb2.ChartResponse.SerializeToString,
+            ),
+            'GetMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMetrics,
+                    request_deserializer=graphPainter__pb2.MetricsRequest.FromString,
+                    response_serializer=graphPainter__pb2.MetricsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'GraphPainterService', rpc_method_handlers)
@@ -134,3 +239,105 @@ class GraphPainterService(object):
             graphPainter__pb2.ChartResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PaintCandlestickV2(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/GraphPainterService/PaintCandlestickV2',
+            graphPainter__pb2.ChartRequestV2.SerializeToString,
+            graphPainter__pb2.ChartResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PaintChartV2(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/GraphPainterService/PaintChartV2',
+            graphPainter__pb2.ChartRequestV2.SerializeToString,
+            graphPainter__pb2.ChartResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PaintBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/GraphPainterService/PaintBatch',
+            graphPainter__pb2.BatchRequest.SerializeToString,
+            graphPainter__pb2.BatchItemResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def AppendCandles(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/GraphPainterService/AppendCandles',
+            graphPainter__pb2.AppendCandlesRequest.SerializeToString,
+            graphPainter__pb2.AppendCandlesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PaintGrid(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/GraphPainterService/PaintGrid',
+            graphPainter__pb2.GridRequest.SerializeToString,
+            graphPainter__pb2.ChartResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/GraphPainterService/GetMetrics',
+            graphPainter__pb2.MetricsRequest.SerializeToString,
+            graphPainter__pb2.MetricsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
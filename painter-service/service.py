@@ -1,8 +1,19 @@
+import asyncio
+
 import grpc
 import os
 from concurrent import futures
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+from controllers.image_cache import configure_image_cache, DEFAULT_MAX_BYTES, DEFAULT_TTL_SECONDS
+import protobuf.graphPainter_pb2 as pb2
 import protobuf.graphPainter_pb2_grpc as pb2_grpc
-from service.grpc_server import GraphPainterGrpcServer
+from controllers.request_decoder import configure_request_decoder
+from controllers.series_store import configure_series_store
+from controllers.warmup import warm_up
+from controllers.worker_pool import configure_worker_pool
+from graph.banners import configure_banner_cache, DEFAULT_MAX_BYTES as DEFAULT_BANNER_CACHE_MAX_BYTES
+from graph.renderer_pool import configure_renderer_pool
+from service.grpc_server import DEFAULT_BATCH_CONCURRENCY, GraphPainterGrpcServer
 
 import json
 import logging
@@ -11,20 +22,49 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 SECRETS_PATH = os.environ.get('SECRETS_PATH')
+# services reported by the health checks, '' being the whole server
+HEALTH_SERVICES = ('', pb2.DESCRIPTOR.services_by_name['GraphPainterService'].full_name)
 
 with open(SECRETS_PATH + "graph-painter/config.json") as f:
     config = json.load(f)
 
 
-def serve():
+async def serve():
     logging.info("Starting grpc server")
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=5))
-    pb2_grpc.add_GraphPainterServiceServicer_to_server(GraphPainterGrpcServer(), server)
+    worker_processes = config.get('painter', {}).get('worker_processes', 0)
+    if worker_processes:
+        # each worker starts its own Kaleido renderers
+        configure_worker_pool(worker_processes, config.get('painter', {}).get('renderers_per_worker', 1))
+    else:
+        configure_renderer_pool(config.get('painter', {}).get('renderers', 5))
+    configure_image_cache(config.get('painter', {}).get('cache_max_bytes', DEFAULT_MAX_BYTES),
+                          config.get('painter', {}).get('cache_ttl_seconds', DEFAULT_TTL_SECONDS))
+    configure_banner_cache(config.get('painter', {}).get('banner_cache_max_bytes', DEFAULT_BANNER_CACHE_MAX_BYTES))
+    configure_request_decoder(config.get('painter', {}).get('strict_decoding', True))
+    # the series appended by AppendCandles, disabled without a directory
+    configure_series_store(config.get('painter', {}).get('series_store_path'))
+    server = grpc.aio.server()
+    # the renders are done in threads, the event loop only handles the calls
+    executor = futures.ThreadPoolExecutor(max_workers=config.get('painter', {}).get('render_threads', 5))
+    batch_concurrency = config.get('painter', {}).get('batch_concurrency', DEFAULT_BATCH_CONCURRENCY)
+    pb2_grpc.add_GraphPainterServiceServicer_to_server(GraphPainterGrpcServer(executor, batch_concurrency), server)
+    health_servicer = health.aio.HealthServicer()
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    # the health checks are answered during the warm-up, the server is reported ready once it's done
+    await set_health(health_servicer, health_pb2.HealthCheckResponse.NOT_SERVING)
     server.add_insecure_port(f"[::]:{config['grpc']['port']}")
-    server.start()
+    await server.start()
+    if config.get('painter', {}).get('warm_up', True):
+        await asyncio.get_running_loop().run_in_executor(executor, warm_up)
+    await set_health(health_servicer, health_pb2.HealthCheckResponse.SERVING)
     logging.info("Started")
-    server.wait_for_termination()
+    await server.wait_for_termination()
+
+
+async def set_health(health_servicer, status) -> None:
+    for service in HEALTH_SERVICES:
+        await health_servicer.set(service, status)
 
 
 if __name__ == '__main__':
-    serve()
+    asyncio.run(serve())
@@ -1,35 +1,181 @@
+import asyncio
 import logging
+import time
+from concurrent.futures import Executor
+from typing import Optional
+
+import grpc
 
 import protobuf.graphPainter_pb2 as pb2
 import protobuf.graphPainter_pb2_grpc as pb2_grpc
-from controllers.grpc_controller import process_chart_request
+from controllers.deadline import DeadlineExceeded, RenderDeadline
+from controllers.grpc_controller import BatchHeaders, append_candles, process_chart_request, \
+    process_chart_request_v2, process_grid_request, service_metrics
+from controllers.metrics import get_metrics
+from controllers.single_flight import RequestCancelled
+from graph.output import EncodedChart
 from models.painting_types import PaintingType
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+MAX_BATCH_ITEMS = 1000
+# charts of a batch painted at the same time, the others wait without holding a thread of the executor
+DEFAULT_BATCH_CONCURRENCY = 4
+
+
+def _response(chart: EncodedChart) -> pb2.ChartResponse:
+    """Response holding the image, or its variants"""
+    if isinstance(chart, bytes):
+        return pb2.ChartResponse(image=chart)
+    return pb2.ChartResponse(variants=[pb2.ImageVariant(name=variant.name, width=variant.width, height=variant.height,
+                                                        image=variant.image) for variant in chart])
+
 
 class GraphPainterGrpcServer(pb2_grpc.GraphPainterServiceServicer):
+    """asyncio servicer: the renders run in the executor, off the event loop"""
 
-    def __init__(self, *args, **kwargs):
-        pass
+    def __init__(self, executor: Optional[Executor] = None, batch_concurrency: int = DEFAULT_BATCH_CONCURRENCY):
+        """The renders run in the given executor, in the default one of the event loop if None"""
+        self.executor = executor
+        self.batch_concurrency = batch_concurrency
 
-    def Greet(self, request, context):
+    async def Greet(self, request, context):
         """Echoes back the greeting message sent by the client."""
         message = request.message
         logging.info(f"Received Greet message: {message}, sending message back.")
         return pb2.SayHelloMessage(message=message)
 
-    def PaintCandlestick(self, request, context):
+    async def PaintCandlestick(self, request, context):
         """Returns a candlestick."""
         logging.info("Painting a candlestick.")
-        img_raw = process_chart_request(request, PaintingType.CANDLESTICK)
-        return pb2.ChartResponse(image=img_raw)
+        img_raw = await self._process(context, process_chart_request, request, PaintingType.CANDLESTICK)
+        return _response(img_raw)
 
-    def PaintChart(self, request, context):
+    async def PaintChart(self, request, context):
         """Returns a simple chart."""
         logging.info("Painting a chart.")
-        img_raw = process_chart_request(request, PaintingType.CHART)
-        return pb2.ChartResponse(image=img_raw)
+        img_raw = await self._process(context, process_chart_request, request, PaintingType.CHART)
+        return _response(img_raw)
+
+    async def PaintCandlestickV2(self, request, context):
+        """Returns a candlestick, from packed numeric columns."""
+        logging.info("Painting a candlestick (v2).")
+        img_raw = await self._process(context, process_chart_request_v2, request, PaintingType.CANDLESTICK)
+        return _response(img_raw)
+
+    async def PaintChartV2(self, request, context):
+        """Returns a simple chart, from packed numeric columns."""
+        logging.info("Painting a chart (v2).")
+        img_raw = await self._process(context, process_chart_request_v2, request, PaintingType.CHART)
+        return _response(img_raw)
+
+    async def PaintGrid(self, request, context):
+        """Returns a grid of charts, or each of its panels."""
+        logging.info(f"Painting a grid of {len(request.panels)} charts.")
+        img_raw = await self._process(context, lambda req, _, deadline: process_grid_request(req, deadline),
+                                      request, None)
+        return _response(img_raw)
+
+    async def PaintBatch(self, request, context):
+        """Streams the charts of a batch as they're painted, each with its status."""
+        if len(request.items) > MAX_BATCH_ITEMS:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                                f"A batch has at most {MAX_BATCH_ITEMS} charts, got {len(request.items)}")
+        logging.info(f"Painting a batch of {len(request.items)} charts.")
+        deadline = RenderDeadline(context.time_remaining())
+        # the options and token infos repeated in the batch are parsed once, by the first chart needing them
+        headers = BatchHeaders()
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def paint(index: int, item) -> pb2.BatchItemResponse:
+            async with semaphore:
+                return await self._batch_item(index, item, deadline, headers)
+
+        tasks = [asyncio.ensure_future(paint(index, item)) for index, item in enumerate(request.items)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # the client is gone, or every chart was sent
+            deadline.cancel()
+            for task in tasks:
+                task.cancel()
+
+    async def _batch_item(self, index: int, item, deadline: RenderDeadline,
+                          headers: BatchHeaders) -> pb2.BatchItemResponse:
+        """Paints a chart of a batch, its failure being reported in its response"""
+        req_type = PaintingType.CANDLESTICK if item.candlestick else PaintingType.CHART
+        submitted_at = time.perf_counter()
+
+        def run():
+            get_metrics().observe('queue_wait_seconds', time.perf_counter() - submitted_at,
+                                  (('type', req_type.name.lower()),))
+            return process_chart_request(item.chart, req_type, deadline, headers)
+
+        try:
+            with get_metrics().in_flight('requests'):
+                chart = await asyncio.get_running_loop().run_in_executor(self.executor, run)
+        except ValueError as e:
+            return pb2.BatchItemResponse(index=index, code=grpc.StatusCode.INVALID_ARGUMENT.value[0], error=str(e))
+        except DeadlineExceeded as e:
+            return pb2.BatchItemResponse(index=index, code=grpc.StatusCode.DEADLINE_EXCEEDED.value[0], error=str(e))
+        except RequestCancelled as e:
+            return pb2.BatchItemResponse(index=index, code=grpc.StatusCode.CANCELLED.value[0], error=str(e))
+        except Exception as e:
+            logging.exception(f"Painting the chart {index} of a batch failed.")
+            return pb2.BatchItemResponse(index=index, code=grpc.StatusCode.INTERNAL.value[0], error=str(e))
+        return pb2.BatchItemResponse(index=index, chart=_response(chart))
+
+    async def AppendCandles(self, request, context):
+        """Appends candles to a stored series."""
+        try:
+            appended, size = await asyncio.get_running_loop().run_in_executor(self.executor, append_candles, request)
+        except ValueError as e:
+            logging.info(f"Invalid candles: {e}")
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        logging.info(f"Appended {appended} candles to {request.chain_name}/{request.address}/{request.timeframe}.")
+        return pb2.AppendCandlesResponse(appended=appended, size=size)
+
+    async def GetMetrics(self, request, context):
+        """Returns the latency histograms, the gauges and the counters of the service."""
+        metrics = get_metrics()
+        service_gauges, service_counters = service_metrics()
+        gauges = metrics.gauges()
+        gauges.update(service_gauges)
+        histograms = [pb2.HistogramMessage(name=name, labels=dict(labels),
+                                           bounds=histogram.buckets,
+                                           counts=histogram.cumulative_counts(),
+                                           sum=histogram.sum, count=histogram.count)
+                      for name, labels, histogram in metrics.histograms()]
+        return pb2.MetricsResponse(prometheus_text=metrics.to_prometheus(service_gauges, service_counters),
+                                   histograms=histograms, gauges=gauges, counters=service_counters)
+
+    async def _process(self, context, process, request, req_type: Optional[PaintingType]) -> EncodedChart:
+        """Processes a request in the executor, the painting type being None for the grids. The deadline of the
+        call is checked before each stage of the render, and the render stops at the next stage if the call is
+        cancelled."""
+        deadline = RenderDeadline(context.time_remaining())
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
 
+        def run():
+            get_metrics().observe('queue_wait_seconds', time.perf_counter() - submitted_at,
+                                  (('type', req_type.name.lower() if req_type is not None else 'grid'),))
+            return process(request, req_type, deadline)
 
+        try:
+            with get_metrics().in_flight('requests'):
+                return await loop.run_in_executor(self.executor, run)
+        except asyncio.CancelledError:
+            deadline.cancel()
+            raise
+        except ValueError as e:
+            logging.info(f"Invalid request: {e}")
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except DeadlineExceeded as e:
+            logging.info(f"Stopped painting: {e}")
+            await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, str(e))
+        except RequestCancelled as e:
+            logging.info(f"Stopped painting: {e}")
+            await context.abort(grpc.StatusCode.CANCELLED, str(e))
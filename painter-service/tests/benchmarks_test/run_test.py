@@ -0,0 +1,45 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks import datasets
+from benchmarks.run import Result, compare, load_results, main
+
+
+class BenchmarkRunTest(unittest.TestCase):
+
+    def test_datasets(self):
+        col = datasets.ohcl(100)
+        self.assertEqual(col.size(), 100)
+        self.assertTrue((col.highs() >= col.closes()).all() and (col.lows() <= col.opens()).all())
+        self.assertEqual(datasets.single_points(100).values().tolist(), col.closes().tolist())
+
+    def test_run_and_compare(self):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, 'res.json')
+            csv_path = os.path.join(directory, 'res.csv')
+            args = ['--sizes', '50,200', '--stages', 'columnar_regroup,rsi,compose', '--repeat', '2']
+            self.assertEqual(main(args + ['--json', json_path, '--csv', csv_path]), 0)
+            results = load_results(json_path)
+            self.assertEqual([(r.stage, r.size) for r in results],
+                             [('columnar_regroup', 50), ('columnar_regroup', 200), ('rsi', 50), ('rsi', 200),
+                              ('compose', 50), ('compose', 200)])
+            with open(csv_path) as f:
+                self.assertEqual(len(list(csv.DictReader(f))), 6)
+            with open(json_path) as f:
+                self.assertEqual(json.load(f)['meta']['sizes'], [50, 200])
+            self.assertEqual(main(args + ['--baseline', json_path, '--tolerance', '100', '--fail-on-regression']), 0)
+
+    def test_compare(self):
+        baseline = [Result('rsi', 50, 5, 1., 1., 1.), Result('rsi', 100, 5, 1., 1., 1.)]
+        results = [Result('rsi', 50, 5, 1., 1.05, 1.), Result('rsi', 100, 5, 1., 1.5, 1.),
+                   Result('ema', 50, 5, 1., 1., 1.)]
+        comparison = compare(results, baseline, tolerance=0.1)
+        self.assertEqual([(c['size'], c['regression']) for c in comparison], [(50, False), (100, True)])
+        self.assertAlmostEqual(comparison[1]['ratio'], 1.5)
+
+    def test_unknown_stage(self):
+        with self.assertRaises(ValueError):
+            main(['--stages', 'unknown'])
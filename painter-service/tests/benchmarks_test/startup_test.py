@@ -0,0 +1,30 @@
+import unittest
+
+from benchmarks.startup import DEFERRED_MODULES, import_profile, import_time, loaded_modules, main
+
+
+class StartupBenchmarkTest(unittest.TestCase):
+
+    def test_heavy_modules_deferred(self):
+        """The libraries of the renders aren't imported along with the entry point of the service"""
+        self.assertTrue({'pandas', 'plotly.io', 'kaleido'} <= set(DEFERRED_MODULES))
+        self.assertEqual(loaded_modules(), [])
+        self.assertEqual(loaded_modules('graph.finance_util', ['pandas']), [])
+        self.assertEqual(loaded_modules('pandas', DEFERRED_MODULES), ['pandas'])
+
+    def test_import_time(self):
+        self.assertGreater(import_time(), 0)
+
+    def test_import_profile(self):
+        profile = {entry.module: entry for entry in import_profile()}
+        entry = profile['service.grpc_server']
+        self.assertGreater(entry.cumulative_s, entry.self_s)
+        self.assertIn('controllers.grpc_controller', profile)
+
+    def test_main(self):
+        self.assertEqual(main(['--repeat', '1', '--top', '3']), 0)
+        self.assertEqual(main(['--repeat', '1', '--max-seconds', '0']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import importlib.util
+import json
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from benchmarks import datasets
+from controllers.arrow_decoder import decode_table, is_ohcl, read_table
+from controllers.grpc_controller import process_chart_request
+from controllers.image_cache import get_image_cache
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint
+from models.painting_types import PaintingType
+from tests.test_elements import EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT, EXAMPLE_TOKEN_INFO
+from tests.test_utils import StubRequest, read_image
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+def _table(columns: dict, **changes):
+    """Table of the raw columns of a dataset, with some columns replaced or removed (None)"""
+    import pyarrow as pa
+    names = dict(dates='timestamp', volumes='volume', opens='open', highs='high', lows='low', closes='close',
+                 values='value')
+    table = {names[name]: column for name, column in columns.items()}
+    table.update(changes)
+    return pa.table({name: column for name, column in table.items() if column is not None})
+
+
+def _to_bytes(table, fmt: str) -> bytes:
+    import pyarrow as pa
+    import pyarrow.parquet
+    sink = pa.BufferOutputStream()
+    if fmt == 'arrow':
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pa.parquet.write_table(table, sink)
+    return sink.getvalue().to_pybytes()
+
+
+class ArrowDecoderWithoutPyarrowTest(unittest.TestCase):
+
+    def test_missing_pyarrow(self):
+        with mock.patch.dict(sys.modules, {'pyarrow': None}):
+            with self.assertRaisesRegex(ValueError, 'pyarrow'):
+                read_table(b'', 'arrow')
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, read_table, b'', 'csv')
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow isn't installed")
+class ArrowDecoderTest(unittest.TestCase):
+
+    def _assert_same_columns(self, res, expected):
+        self.assertEqual(type(res), type(expected))
+        for name, values in expected.columns().items():
+            np.testing.assert_array_equal(res.columns()[name], values, err_msg=name)
+
+    def test_round_trip(self):
+        for fmt in ('arrow', 'parquet'):
+            for columns, ohcl in ((datasets.raw_ohcl(100), True), (datasets.raw_single_points(100), False)):
+                table = read_table(_to_bytes(_table(columns), fmt), fmt)
+                self.assertEqual(is_ohcl(table), ohcl)
+                expected = ColumnarCollectionOhcl(**columns) if ohcl else ColumnarCollectionSingleTradePoint(**columns)
+                self._assert_same_columns(decode_table(table, ohcl), expected)
+
+    def test_zero_copy(self):
+        """The float64 columns of an Arrow stream are views of the bytes received"""
+        data = _to_bytes(_table(datasets.raw_ohcl(100)), 'arrow')
+        res = decode_table(read_table(data, 'arrow'), ohcl=True)
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        for name in ('dates', 'opens', 'closes', 'volumes'):
+            self.assertTrue(np.shares_memory(res.columns()[name], buffer), name)
+
+    def test_casts(self):
+        """Integer prices, timezone-aware timestamps and unix timestamps in milliseconds"""
+        import pyarrow as pa
+        columns = datasets.raw_single_points(10)
+        ms = columns['dates'].astype('datetime64[ms]').astype(np.int64)
+        for dates in (pa.array(columns['dates']).cast(pa.timestamp('ms', tz='Europe/Paris')), pa.array(ms)):
+            res = decode_table(_table(columns, timestamp=dates, value=pa.array(range(10))), ohcl=False)
+            np.testing.assert_array_equal(res.dates(), columns['dates'])
+            np.testing.assert_array_equal(res.values(), np.arange(10, dtype=np.float64))
+
+    def test_chunked_columns(self):
+        import pyarrow as pa
+        table = _table(datasets.raw_ohcl(100))
+        chunked = pa.concat_tables([table.slice(0, 40), table.slice(40)])
+        self._assert_same_columns(decode_table(chunked, ohcl=True), decode_table(table, ohcl=True))
+
+    def test_nulls(self):
+        import pyarrow as pa
+        table = _table(datasets.raw_single_points(3), value=pa.array([1., None, 3.]), volume=pa.array([None, 2., 3.]))
+        self.assertRaisesRegex(ValueError, 'value', decode_table, table, ohcl=False, strict=True)
+        res = decode_table(table, ohcl=False, strict=False)
+        np.testing.assert_array_equal(res.values(), [1., np.nan, 3.])
+        np.testing.assert_array_equal(res.volumes(), [np.nan, 2., 3.])
+
+    def test_invalid_tables(self):
+        import pyarrow as pa
+        columns = datasets.raw_ohcl(3)
+        for table in (_table(columns, close=None),
+                      _table(columns, open=pa.array(['a', 'b', 'c'])),
+                      _table(columns, timestamp=pa.array(['2021-01-01'] * 3)),
+                      _table(columns, timestamp=pa.array([1, None, 3]))):
+            self.assertRaises(ValueError, decode_table, table, ohcl=True)
+        for fmt in ('arrow', 'parquet'):
+            self.assertRaises(ValueError, read_table, b'not a table', fmt)
+
+    def test_grpc_candlestick(self):
+        """An Arrow request paints the same image as the json one"""
+        columns = datasets.raw_ohcl(100)
+        rows = zip(*(columns[name] for name in ('dates', 'opens', 'highs', 'lows', 'closes', 'volumes')))
+        points = [dict(date=str(date), v_open=o, v_high=h, v_low=low, v_close=c, volume=v)
+                  for date, o, h, low, c, v in rows]
+        options = EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT.replace('JPEG', 'PNG')
+        request = StubRequest(datas=json.dumps({'coll': points}), tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                              options=options)
+        request_arrow = StubRequest(datas='', tokenInfo=EXAMPLE_TOKEN_INFO.json(), options=options,
+                                    arrow=_to_bytes(_table(columns), 'arrow'))
+        res = process_chart_request(request, PaintingType.CANDLESTICK)
+        get_image_cache().clear()
+        res_arrow = process_chart_request(request_arrow, PaintingType.CANDLESTICK)
+        self.assertEqual(read_image(res).tobytes(), read_image(res_arrow).tobytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import grpc
+
+import protobuf.graphPainter_pb2 as pb2
+import protobuf.graphPainter_pb2_grpc as pb2_grpc
+from controllers import grpc_controller
+from controllers.grpc_controller import BatchHeaders
+from controllers.request_decoder import parse_options, parse_token_info
+from service import grpc_server
+from service.grpc_server import GraphPainterGrpcServer
+from tests.test_elements import EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT, \
+    EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT, EXAMPLE_TOKEN_INFO
+from tests.test_utils import read_image, to_chart_request_v2
+
+OPTIONS = EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT
+CANDLESTICK = pb2.BatchItem(chart=pb2.ChartRequest(datas=EXAMPLE_JSON_COLLECTION_OHCL,
+                                                   tokenInfo=EXAMPLE_TOKEN_INFO.json(), options=OPTIONS),
+                            candlestick=True)
+CHART = pb2.BatchItem(chart=pb2.ChartRequest(datas=EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT,
+                                             tokenInfo=EXAMPLE_TOKEN_INFO.json(), options=OPTIONS))
+INVALID = pb2.BatchItem(chart=pb2.ChartRequest(datas='{"coll": [{"date": "2021-11-04"}]}',
+                                               tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                                               options=OPTIONS.replace('"dark"', '"sepia"')),
+                        candlestick=True)
+
+
+class BatchTest(unittest.TestCase):
+
+    async def _serve(self, call):
+        server = grpc.aio.server()
+        pb2_grpc.add_GraphPainterServiceServicer_to_server(GraphPainterGrpcServer(batch_concurrency=2), server)
+        port = server.add_insecure_port('localhost:0')
+        await server.start()
+        try:
+            async with grpc.aio.insecure_channel(f'localhost:{port}') as channel:
+                return await call(pb2_grpc.GraphPainterServiceStub(channel))
+        finally:
+            await server.stop(None)
+
+    async def _call(self, items, timeout=60):
+        async def call(stub):
+            return [res async for res in stub.PaintBatch(pb2.BatchRequest(items=items), timeout=timeout)]
+        return await self._serve(call)
+
+    def test_batch(self):
+        """Every item is answered, the invalid one with its own status"""
+        responses = asyncio.run(self._call([CANDLESTICK, INVALID, CHART, CANDLESTICK]))
+        self.assertEqual(sorted(res.index for res in responses), [0, 1, 2, 3])
+        by_index = {res.index: res for res in responses}
+        self.assertEqual(by_index[1].code, grpc.StatusCode.INVALID_ARGUMENT.value[0])
+        self.assertTrue(by_index[1].error)
+        for index in (0, 2, 3):
+            self.assertEqual(by_index[index].code, 0)
+            self.assertEqual(read_image(by_index[index].chart.image).format, 'JPEG')
+        self.assertEqual(by_index[0].chart.image, by_index[3].chart.image)
+
+    def test_too_many_items(self):
+        with mock.patch.object(grpc_server, 'MAX_BATCH_ITEMS', 2):
+            with self.assertRaises(grpc.aio.AioRpcError) as e:
+                asyncio.run(self._call([CHART] * 3))
+        self.assertEqual(e.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+    def test_invalid_request(self):
+        """A request refused by the controller fails with INVALID_ARGUMENT, not with an unknown error"""
+        with self.assertRaises(grpc.aio.AioRpcError) as e:
+            asyncio.run(self._serve(lambda stub: stub.PaintCandlestick(INVALID.chart, timeout=60)))
+        self.assertEqual(e.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+        # refused by the grid painter
+        panel = pb2.GridPanel(chart=to_chart_request_v2(EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_TOKEN_INFO.json(),
+                                                        OPTIONS, ohcl=True), candlestick=True)
+        grid = pb2.GridRequest(panels=[panel] * 2, options=pb2.GraphOptionMessage(render_backend='raster'))
+        with self.assertRaises(grpc.aio.AioRpcError) as e:
+            asyncio.run(self._serve(lambda stub: stub.PaintGrid(grid, timeout=60)))
+        self.assertEqual(e.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+    def test_shared_parsing(self):
+        """The options and token infos repeated in a batch are parsed once, the invalid ones included, without
+        the cache of the parsers"""
+        headers = BatchHeaders()
+        errors = []
+        with mock.patch.object(grpc_controller, 'parse_options', wraps=parse_options.__wrapped__) as options, \
+                mock.patch.object(grpc_controller, 'parse_token_info', wraps=parse_token_info.__wrapped__) as token:
+            for item in (CANDLESTICK, INVALID, CHART, INVALID, CANDLESTICK):
+                self.assertEqual(headers.token_info(item.chart.tokenInfo), EXAMPLE_TOKEN_INFO)
+                headers.options(item.chart.options)
+            for _ in range(2):
+                with self.assertRaisesRegex(ValueError, 'width') as e:
+                    headers.options('{"width": 10}')
+                errors.append(e.exception)
+        self.assertEqual(options.call_count, 3)
+        self.assertEqual(token.call_count, 1)
+        # a new error for each request, raised from several threads at once
+        self.assertIsNot(errors[0], errors[1])
+        self.assertEqual(str(errors[0]), str(errors[1]))
+
+    def test_concurrent_parsing(self):
+        """Distinct headers are parsed at the same time by the requests needing them"""
+        headers = BatchHeaders()
+        barrier = threading.Barrier(2, timeout=10)
+
+        def parse(raw):
+            barrier.wait()
+            return parse_options.__wrapped__(raw)
+
+        raws = [OPTIONS, OPTIONS.replace('"dark"', '"white"')]
+        with mock.patch.object(grpc_controller, 'parse_options', side_effect=parse), \
+                ThreadPoolExecutor(2) as executor:
+            parsed = list(executor.map(headers.options, raws))
+        self.assertEqual([options.theme_name for options in parsed], ['dark', 'white'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import io
+import time
+import unittest
+from unittest import mock
+
+import grpc
+from PIL import Image
+
+import protobuf.graphPainter_pb2 as pb2
+import protobuf.graphPainter_pb2_grpc as pb2_grpc
+from controllers.deadline import DeadlineExceeded, RenderDeadline
+from controllers.grpc_controller import process_chart_request
+from controllers.image_cache import get_image_cache
+from controllers.single_flight import RequestCancelled
+from models.painting_types import PaintingType
+from service.grpc_server import GraphPainterGrpcServer
+from tests.test_elements import EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_TOKEN_INFO, \
+    EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT
+from tests.test_utils import StubRequest, read_image
+
+
+class RenderDeadlineTest(unittest.TestCase):
+    request = StubRequest(datas=EXAMPLE_JSON_COLLECTION_OHCL,
+                          tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                          options=EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT)
+
+    def test_check(self):
+        deadline = RenderDeadline()
+        deadline.check('parse')
+        self.assertIsNone(deadline.time_remaining())
+        deadline.cancel()
+        self.assertFalse(deadline.is_active())
+        self.assertRaises(RequestCancelled, deadline.check, 'parse')
+
+        deadline = RenderDeadline(0.05)
+        self.assertGreater(deadline.time_remaining(), 0)
+        time.sleep(0.06)
+        self.assertEqual(deadline.time_remaining(), 0)
+        self.assertRaises(DeadlineExceeded, deadline.check, 'parse')
+
+    def test_expired_request_is_not_painted(self):
+        get_image_cache().clear()
+        with mock.patch('controllers.grpc_controller.GraphPainter') as painter:
+            with self.assertRaises(DeadlineExceeded):
+                process_chart_request(self.request, PaintingType.CANDLESTICK, RenderDeadline(0))
+            painter.assert_not_called()
+
+    @staticmethod
+    def _cancel_and_export(deadline: RenderDeadline) -> bytes:
+        deadline.cancel()
+        with io.BytesIO() as output:
+            Image.new('RGB', (10, 10)).save(output, 'PNG')
+            return output.getvalue()
+
+    def test_stage_checked_during_painting(self):
+        """The call is cancelled during the export: the post processing isn't done"""
+        get_image_cache().clear()
+        deadline = RenderDeadline()
+        with mock.patch('graph.graph_painter.get_renderer_pool') as pool, \
+                mock.patch('graph.graph_painter.compose') as compose:
+            pool.return_value.to_image.side_effect = lambda *args, **kwargs: self._cancel_and_export(deadline)
+            with self.assertRaises(RequestCancelled):
+                process_chart_request(self.request, PaintingType.CANDLESTICK, deadline)
+            compose.assert_not_called()
+
+
+class AsyncServerTest(unittest.TestCase):
+    request = pb2.ChartRequest(datas=EXAMPLE_JSON_COLLECTION_OHCL,
+                               tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                               options=EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT.replace('JPEG', 'PNG'))
+
+    async def _call(self, timeout):
+        server = grpc.aio.server()
+        pb2_grpc.add_GraphPainterServiceServicer_to_server(GraphPainterGrpcServer(), server)
+        port = server.add_insecure_port('localhost:0')
+        await server.start()
+        try:
+            async with grpc.aio.insecure_channel(f'localhost:{port}') as channel:
+                stub = pb2_grpc.GraphPainterServiceStub(channel)
+                return await stub.PaintCandlestick(self.request, timeout=timeout)
+        finally:
+            await server.stop(None)
+
+    def test_paint(self):
+        res = asyncio.run(self._call(timeout=60))
+        self.assertEqual(read_image(res.image).size, (3220, 1920))
+
+    def test_deadline_exceeded(self):
+        get_image_cache().clear()
+        with self.assertRaises(grpc.aio.AioRpcError) as e:
+            asyncio.run(self._call(timeout=0.01))
+        self.assertEqual(e.exception.code(), grpc.StatusCode.DEADLINE_EXCEEDED)
@@ -7,12 +7,14 @@ import unittest
 import json
 import pydantic
 from PIL import Image
-from controllers.grpc_controller import process_chart_request
+import protobuf.graphPainter_pb2 as pb2
+from controllers.grpc_controller import process_chart_request, process_chart_request_v2, process_grid_request
+from controllers.image_cache import get_image_cache
 from models.graph_options import GraphOption
 from models.painting_types import PaintingType
 from tests.test_elements import EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT, EXAMPLE_JSON_COLLECTION_OHCL, \
     EXAMPLE_TOKEN_INFO, EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT
-from tests.test_utils import StubRequest, read_image
+from tests.test_utils import StubRequest, read_image, to_chart_request_v2
 
 
 class GrpcControllerTest(unittest.TestCase):
@@ -33,6 +35,74 @@ class GrpcControllerTest(unittest.TestCase):
         img = read_image(res)
         img.show()
 
+    def test_grpc_candlestick_v2(self):
+        """The binary request paints the same image as the json one"""
+        options = EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT.replace('JPEG', 'PNG')
+        request = StubRequest(datas=EXAMPLE_JSON_COLLECTION_OHCL,
+                              tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                              options=options)
+        request_v2 = to_chart_request_v2(EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_TOKEN_INFO.json(), options, ohcl=True)
+        res = process_chart_request(request, PaintingType.CANDLESTICK)
+        get_image_cache().clear()
+        res_v2 = process_chart_request_v2(request_v2, PaintingType.CANDLESTICK)
+        self.assertEqual(read_image(res).tobytes(), read_image(res_v2).tobytes())
+
+    def test_grpc_chart_v2(self):
+        request = StubRequest(datas=EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT,
+                              tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                              options=EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT)
+        request_v2 = to_chart_request_v2(EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT, EXAMPLE_TOKEN_INFO.json(),
+                                         EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT, ohcl=False)
+        res = process_chart_request(request, PaintingType.CHART)
+        res_v2 = process_chart_request_v2(request_v2, PaintingType.CHART)
+        self.assertEqual(read_image(res).size, read_image(res_v2).size)
+
+    def test_grpc_candlestick_from_trades(self):
+        """Trades sent for a candlestick are aggregated in candles of the interval of the options"""
+        options = json.loads(EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT)
+        options.update(export_type='PNG', interval='4h', timezone='Europe/Paris')
+        request = StubRequest(datas=EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT,
+                              tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                              options=json.dumps(options))
+        request_v2 = to_chart_request_v2(EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT, EXAMPLE_TOKEN_INFO.json(),
+                                         json.dumps(options), ohcl=False)
+        res = process_chart_request(request, PaintingType.CANDLESTICK)
+        get_image_cache().clear()
+        res_v2 = process_chart_request_v2(request_v2, PaintingType.CANDLESTICK)
+        self.assertEqual(read_image(res).tobytes(), read_image(res_v2).tobytes())
+
+        request.options = EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT
+        with self.assertRaises(ValueError):
+            process_chart_request(request, PaintingType.CANDLESTICK)
+
+    def test_grpc_candlestick_variants(self):
+        """The variants are painted once and returned in the order requested, the v2 options included"""
+        options = json.loads(EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT)
+        options.update(variants=['preview', 'thumbnail'], export_type='PNG')
+        request_v2 = to_chart_request_v2(EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_TOKEN_INFO.json(),
+                                         json.dumps(options), ohcl=True)
+        res = process_chart_request_v2(request_v2, PaintingType.CANDLESTICK)
+        self.assertEqual([(v.name, v.width) for v in res], [('preview', 800), ('thumbnail', 320)])
+        for variant in res:
+            self.assertEqual(read_image(variant.image).size, (variant.width, variant.height))
+        self.assertIs(process_chart_request_v2(request_v2, PaintingType.CANDLESTICK), res)
+
+    def test_grpc_grid(self):
+        """A grid of a candlestick and a chart, whole then cropped in panels"""
+        candles = to_chart_request_v2(EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_TOKEN_INFO.json(),
+                                      EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT, ohcl=True)
+        trades = to_chart_request_v2(EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT, EXAMPLE_TOKEN_INFO.json(),
+                                     EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT, ohcl=False)
+        request = pb2.GridRequest(panels=[pb2.GridPanel(chart=candles, candlestick=True),
+                                          pb2.GridPanel(chart=trades, title='Trades')],
+                                  options=pb2.GraphOptionMessage(export_type='PNG', width=800, height=450, scale=1))
+        self.assertEqual(read_image(process_grid_request(request)).size, (1600, 450))
+        request.crop_panels = True
+        request.columns = 1
+        res = process_grid_request(request)
+        self.assertEqual([(v.name, v.width, v.height) for v in res], [('0', 800, 450), ('1', 800, 450)])
+        self.assertIs(process_grid_request(request), res)
+
     def test_repetition(self):
         for i in range(0, 10):
             request = StubRequest(datas=EXAMPLE_JSON_COLLECTION_OHCL,
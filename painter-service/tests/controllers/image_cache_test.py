@@ -0,0 +1,72 @@
+import json
+import unittest
+from unittest import mock
+
+from controllers.grpc_controller import process_chart_request
+from controllers.image_cache import ImageCache, cache_key, get_image_cache
+from graph.output import ImageVariant
+from models.columnar import to_columnar
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+from models.price_point import CollectionOhcl
+from tests.test_elements import EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_TOKEN_INFO, \
+    EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT
+from tests.test_utils import StubRequest
+
+
+class ImageCacheTest(unittest.TestCase):
+    datas = to_columnar(CollectionOhcl(**json.loads(EXAMPLE_JSON_COLLECTION_OHCL)))
+
+    def test_key_depends_on_every_input(self):
+        key = cache_key(self.datas, EXAMPLE_TOKEN_INFO, GraphOption(), PaintingType.CANDLESTICK)
+        self.assertEqual(key, cache_key(to_columnar(CollectionOhcl(**json.loads(EXAMPLE_JSON_COLLECTION_OHCL))),
+                                        EXAMPLE_TOKEN_INFO.copy(), GraphOption(), PaintingType.CANDLESTICK))
+        self.assertNotEqual(key, cache_key(self.datas, EXAMPLE_TOKEN_INFO, GraphOption(export_type='PNG'),
+                                           PaintingType.CANDLESTICK))
+        self.assertNotEqual(key, cache_key(self.datas, EXAMPLE_TOKEN_INFO.copy(update=dict(name='other')),
+                                           GraphOption(), PaintingType.CANDLESTICK))
+        self.assertNotEqual(key, cache_key(self.datas.regroup(2), EXAMPLE_TOKEN_INFO, GraphOption(),
+                                           PaintingType.CANDLESTICK))
+
+    def test_lru_eviction_by_size(self):
+        cache = ImageCache(max_bytes=10)
+        cache.put(b'a', b'1234')
+        cache.put(b'b', b'1234')
+        self.assertEqual(cache.get(b'a'), b'1234')
+        cache.put(b'c', b'1234')
+        # b was the least recently used
+        self.assertIsNone(cache.get(b'b'))
+        self.assertEqual(cache.get(b'a'), b'1234')
+        self.assertEqual(cache.size_bytes(), 8)
+        cache.put(b'd', b'12345678901')
+        self.assertIsNone(cache.get(b'd'))
+        self.assertEqual(cache.stats(), dict(hits=2, misses=2, evictions=1, expirations=0, entries=2,
+                                             size_bytes=8))
+
+    def test_variants_size(self):
+        cache = ImageCache(max_bytes=10)
+        variants = (ImageVariant('thumbnail', 320, 180, b'1234'), ImageVariant('preview', 800, 450, b'123456'))
+        cache.put(b'a', variants)
+        self.assertIs(cache.get(b'a'), variants)
+        self.assertEqual(cache.size_bytes(), 10)
+
+    def test_ttl(self):
+        now = [0.]
+        cache = ImageCache(ttl=5, clock=lambda: now[0])
+        cache.put(b'a', b'1234')
+        now[0] = 4.9
+        self.assertEqual(cache.get(b'a'), b'1234')
+        now[0] = 5
+        self.assertIsNone(cache.get(b'a'))
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(cache.size_bytes(), 0)
+
+    def test_hit_does_not_paint(self):
+        request = StubRequest(datas=EXAMPLE_JSON_COLLECTION_OHCL,
+                              tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                              options=EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT)
+        res = process_chart_request(request, PaintingType.CANDLESTICK)
+        with mock.patch('controllers.grpc_controller.GraphPainter') as painter:
+            self.assertEqual(process_chart_request(request, PaintingType.CANDLESTICK), res)
+            painter.assert_not_called()
+        self.assertGreaterEqual(get_image_cache().hits, 1)
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+
+import grpc
+
+import protobuf.graphPainter_pb2 as pb2
+import protobuf.graphPainter_pb2_grpc as pb2_grpc
+from controllers.grpc_controller import process_chart_request
+from controllers.image_cache import get_image_cache
+from controllers.metrics import Histogram, MetricsRegistry, StageTimer, get_metrics, options_label
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+from service.grpc_server import GraphPainterGrpcServer
+from tests.test_elements import EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_TOKEN_INFO, \
+    EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT, EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT
+from tests.test_utils import StubRequest
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_histogram(self):
+        histogram = Histogram(buckets=(0.1, 1., float('inf')))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative_counts(), [2, 3, 4])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 3.65)
+
+    def test_options_label(self):
+        self.assertEqual(options_label(GraphOption()), 'none')
+        self.assertEqual(options_label(GraphOption(rsi=True, bollinger_bands=True)), 'bollinger_bands+rsi')
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry()
+        timer = StageTimer(PaintingType.CHART)
+        timer.add('export', 0.3)
+        registry.record(timer)
+        with registry.in_flight('requests'):
+            text = registry.to_prometheus({'image_cache_entries': 3}, {'image_cache_hits': 2})
+        self.assertIn('# TYPE graph_painter_stage_seconds histogram', text)
+        self.assertIn('graph_painter_stage_seconds_bucket{stage="export",type="chart",options="unknown",le="0.25"} 0',
+                      text)
+        self.assertIn('graph_painter_stage_seconds_bucket{stage="export",type="chart",options="unknown",le="+Inf"} 1',
+                      text)
+        self.assertIn('graph_painter_stage_seconds_count{stage="export",type="chart",options="unknown"} 1', text)
+        self.assertIn('graph_painter_requests_in_flight 1', text)
+        self.assertIn('# TYPE graph_painter_image_cache_entries gauge\ngraph_painter_image_cache_entries 3', text)
+        self.assertIn('# TYPE graph_painter_image_cache_hits_total counter\ngraph_painter_image_cache_hits_total 2',
+                      text)
+        self.assertIn('graph_painter_requests_in_flight 0', registry.to_prometheus())
+
+    def test_stages_of_a_request(self):
+        get_image_cache().clear()
+        get_metrics().reset()
+        request = StubRequest(datas=EXAMPLE_JSON_COLLECTION_OHCL,
+                              tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                              options=EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT)
+        process_chart_request(request, PaintingType.CANDLESTICK)
+        stages = {dict(labels)['stage'] for name, labels, _ in get_metrics().histograms()}
+        self.assertEqual(stages, {'decode', 'validation', 'indicators', 'figure', 'export', 'png_decode',
+                                  'compositing', 'encode', 'total'})
+        labels = dict(get_metrics().histograms()[0][1])
+        self.assertEqual(labels['type'], 'candlestick')
+
+    def test_get_metrics_rpc(self):
+        get_metrics().reset()
+
+        async def call():
+            server = grpc.aio.server()
+            pb2_grpc.add_GraphPainterServiceServicer_to_server(GraphPainterGrpcServer(), server)
+            port = server.add_insecure_port('localhost:0')
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f'localhost:{port}') as channel:
+                    stub = pb2_grpc.GraphPainterServiceStub(channel)
+                    await stub.PaintChart(pb2.ChartRequest(datas=EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT,
+                                                           tokenInfo=EXAMPLE_TOKEN_INFO.json(),
+                                                           options=EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT))
+                    return await stub.GetMetrics(pb2.MetricsRequest())
+            finally:
+                await server.stop(None)
+
+        res = asyncio.run(call())
+        names = {h.name for h in res.histograms}
+        self.assertIn('queue_wait_seconds', names)
+        self.assertIn('stage_seconds', names)
+        self.assertEqual(res.gauges['requests_in_flight'], 0)
+        self.assertIn('image_cache_hits', res.counters)
+        self.assertIn('image_cache_entries', res.gauges)
+        self.assertFalse(res.gauges.keys() & res.counters.keys())
+        self.assertIn('graph_painter_queue_wait_seconds_count{type="chart"} 1', res.prometheus_text)
+        self.assertIn('# TYPE graph_painter_image_cache_misses_total counter', res.prometheus_text)
+        self.assertIn('# TYPE graph_painter_image_cache_entries gauge', res.prometheus_text)
+        self.assertIn('# TYPE graph_painter_coalesced_requests_total counter', res.prometheus_text)
+        self.assertIn('coalesced_requests', res.counters)
@@ -0,0 +1,76 @@
+import json
+import unittest
+
+import numpy as np
+
+from controllers.request_decoder import decode_collection, parse_dates, parse_options, parse_token_info
+from models.columnar import to_columnar
+from models.price_point import CollectionOhcl, CollectionSingleTradePoint
+from tests.test_elements import EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT, \
+    EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT, EXAMPLE_TOKEN_INFO
+
+
+class RequestDecoderTest(unittest.TestCase):
+
+    def _assert_same_as_pydantic(self, json_collection: dict, ohcl: bool):
+        expected = to_columnar(CollectionOhcl(**json_collection) if ohcl
+                               else CollectionSingleTradePoint(**json_collection))
+        res = decode_collection(json_collection, ohcl)
+        self.assertEqual(type(res), type(expected))
+        for name, values in expected.columns().items():
+            np.testing.assert_array_equal(res.columns()[name], values, err_msg=name)
+
+    def test_same_as_pydantic(self):
+        self._assert_same_as_pydantic(json.loads(EXAMPLE_JSON_COLLECTION_OHCL), ohcl=True)
+        self._assert_same_as_pydantic(json.loads(EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT), ohcl=False)
+        self._assert_same_as_pydantic({'coll': []}, ohcl=False)
+
+    def test_dates(self):
+        for dates in (['2021-10-19T14:51:14Z', '2021-10-19 14:51:14.1234567', '2021-10-19T14:51'],
+                      ['2021-10-19T14:51:14+02:00', '2021-10-19T16:51:14-01:30'],
+                      ['2021-1-9T4:51:14', '1634655074'],
+                      ['2021-10-19T14:51:14.123456789012', '2021-10-19 14:51:1', '2021-10-19T14:51:14Z'],
+                      [1634655074, float('inf')],
+                      [1634655074, 1634655074123.0, -10]):
+            points = [dict(date=d, value=1, volume=None) for d in dates]
+            self._assert_same_as_pydantic({'coll': points}, ohcl=False)
+
+    def test_unsorted_points_keep_their_order(self):
+        points = [dict(date='2021-10-19T15:00:00', value=2, volume=1),
+                  dict(date='2021-10-19T14:00:00', value=1, volume=None)]
+        self._assert_same_as_pydantic({'coll': points}, ohcl=False)
+
+    def test_strict(self):
+        for points in ([dict(date='2021-10-19T15:00:00', value=None)],
+                       [dict(date='2021-10-19T15:00:00')],
+                       [dict(date='2021-10-19T15:00:00', value='abc')],
+                       [dict(date='2021-10-19', value=1)],
+                       [dict(date=None, value=1)],
+                       [dict(value=1)],
+                       [dict(date='2021-10-19T15:00:00', value=[1])],
+                       [dict(date='2021-10-19T14:51:14.', value=1)],
+                       [dict(date='2021-10-19T14:51:14.Z', value=1)],
+                       [dict(date='2021-10-19T14:51:14.1234567890123', value=1)],
+                       [dict(date=float('nan'), value=1)],
+                       [dict(date=1634655074, value=1), dict(date=float('nan'), value=1)],
+                       [1]):
+            with self.assertRaises(ValueError, msg=points):
+                CollectionSingleTradePoint(coll=points)
+            with self.assertRaises(ValueError, msg=points):
+                decode_collection({'coll': points}, ohcl=False)
+        # whatever the mode
+        for points in ([1], [dict(date='2021-10-19T15:00:00', value=[1])], [dict(date=float('nan'), value=1)]):
+            with self.assertRaises(ValueError, msg=points):
+                decode_collection({'coll': points}, ohcl=False, strict=False)
+        lenient = decode_collection({'coll': [dict(date='2021-10-19T15:00:00', value=None)]}, ohcl=False,
+                                    strict=False)
+        self.assertTrue(np.isnan(lenient.values()[0]))
+
+    def test_parse_dates(self):
+        self.assertEqual(parse_dates([]).dtype, np.dtype('datetime64[us]'))
+
+    def test_parsed_once(self):
+        options = parse_options(EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT)
+        self.assertIs(parse_options(EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT), options)
+        self.assertEqual(options.theme_name, json.loads(EXAMPLE_JSON_GRAPH_OPTIONS_DARK_TEXT)['theme_name'])
+        self.assertEqual(parse_token_info(EXAMPLE_TOKEN_INFO.json()), EXAMPLE_TOKEN_INFO)
@@ -0,0 +1,160 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import grpc
+import numpy as np
+
+import protobuf.graphPainter_pb2 as pb2
+from benchmarks import datasets
+from controllers.grpc_controller import append_candles, process_chart_request_v2
+from controllers.image_cache import get_image_cache
+from controllers.series_store import SeriesKey, SeriesStore, configure_series_store, get_series_store
+from models.columnar import ColumnarCollectionOhcl
+from models.painting_types import PaintingType
+from service.grpc_server import GraphPainterGrpcServer
+from tests.test_utils import read_image
+
+KEY = SeriesKey('eth', '0xdac17f958d2ee523a2206206994597c13d831ec7', '1m')
+CANDLES = datasets.raw_ohcl(200)
+
+
+def _candles(start: int, stop: int) -> ColumnarCollectionOhcl:
+    """Slice of the same series, as a copy"""
+    return ColumnarCollectionOhcl(**{name: column[start:stop].copy() for name, column in CANDLES.items()})
+
+
+def _append_request(candles: ColumnarCollectionOhcl, key: SeriesKey = KEY) -> pb2.AppendCandlesRequest:
+    timestamps = candles.dates().astype('datetime64[ms]').astype(np.int64)
+    return pb2.AppendCandlesRequest(chain_name=key.chain, address=key.address, timeframe=key.timeframe,
+                                    timestamps=np.diff(timestamps, prepend=0).tolist(),
+                                    opens=candles.opens().tolist(), highs=candles.highs().tolist(),
+                                    lows=candles.lows().tolist(), closes=candles.closes().tolist(),
+                                    volumes=candles.volumes().tolist())
+
+
+class SeriesStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = SeriesStore(self.dir.name)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _assert_same_candles(self, res: ColumnarCollectionOhcl, expected: ColumnarCollectionOhcl):
+        for name, values in expected.columns().items():
+            np.testing.assert_array_equal(res.columns()[name], values, err_msg=name)
+
+    def test_append_and_read(self):
+        self.assertEqual(self.store.append(KEY, _candles(0, 60)), 60)
+        self.assertEqual(self.store.append(KEY, _candles(60, 100)), 40)
+        self.assertEqual(self.store.size(KEY), 100)
+        self._assert_same_candles(self.store.read(KEY), _candles(0, 100))
+
+    def test_window(self):
+        self.store.append(KEY, _candles(0, 100))
+        dates = _candles(0, 100).dates()
+        self._assert_same_candles(self.store.read(KEY, start=dates[10], end=dates[19]), _candles(10, 20))
+        self._assert_same_candles(self.store.read(KEY, end=dates[49], limit=5), _candles(45, 50))
+        self._assert_same_candles(self.store.read(KEY, start=dates[90] + np.timedelta64(1, 's')), _candles(91, 100))
+        self.assertEqual(self.store.read(KEY, start=dates[-1] + np.timedelta64(1, 'm')).size(), 0)
+
+    def test_overlapping_append(self):
+        """The candles already stored are skipped, the last one is replaced"""
+        self.store.append(KEY, _candles(0, 50))
+        updated = _candles(49, 50)
+        updated.closes()[0] += 1
+        self.assertEqual(self.store.append(KEY, _candles(20, 49)), 0)
+        self.assertEqual(self.store.append(KEY, updated), 1)
+        self.assertEqual(self.store.append(KEY, _candles(49, 60)), 11)
+        self._assert_same_candles(self.store.read(KEY), _candles(0, 60))
+
+    def test_unknown_series(self):
+        """Reading a series never appended to neither creates its files nor keeps it"""
+        self.assertEqual(self.store.read(KEY._replace(timeframe='1h')).size(), 0)
+        self.assertEqual(self.store.size(KEY._replace(timeframe='1h')), 0)
+        self.assertEqual(os.listdir(self.dir.name), [])
+        self.assertEqual(self.store.stats()['series'], 0)
+
+    def test_invalid_appends(self):
+        unsorted = _candles(0, 10)
+        unsorted.dates()[[0, 1]] = unsorted.dates()[[1, 0]]
+        self.assertRaises(ValueError, self.store.append, KEY, unsorted)
+        for key in (KEY._replace(address='../../etc'), KEY._replace(chain=''), KEY._replace(timeframe='1 m')):
+            self.assertRaises(ValueError, self.store.append, key, _candles(0, 10))
+
+    def test_reopen(self):
+        """The series are read back from the files, and a partial append is truncated"""
+        self.store.append(KEY, _candles(0, 30))
+        with open(os.path.join(self.dir.name, *KEY, 'opens'), 'ab') as f:
+            f.write(np.zeros(3).tobytes())
+        store = SeriesStore(self.dir.name)
+        self.assertEqual(store.size(KEY), 30)
+        self.assertEqual(store.append(KEY, _candles(0, 40)), 11)
+        self._assert_same_candles(store.read(KEY), _candles(0, 40))
+
+
+class StoredChartRequestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        configure_series_store(self.dir.name)
+
+    def tearDown(self):
+        configure_series_store(None)
+        self.dir.cleanup()
+
+    def _request(self, **window) -> pb2.ChartRequestV2:
+        return pb2.ChartRequestV2(tokenInfo=pb2.TokenInfoMessage(name='Tether', address=KEY.address),
+                                  options=pb2.GraphOptionMessage(chain_name=KEY.chain, export_type='PNG'),
+                                  series=pb2.SeriesWindow(timeframe=KEY.timeframe, **window))
+
+    def test_paint_stored_series(self):
+        """A stored window paints the same image as its candles sent in the request"""
+        candles = _candles(0, 200)
+        self.assertEqual(append_candles(_append_request(candles)), (200, 200))
+        request = self._request(limit=100)
+        inline = _append_request(_candles(100, 200))
+        inline_request = pb2.ChartRequestV2(timestamps=inline.timestamps, opens=inline.opens, highs=inline.highs,
+                                            lows=inline.lows, closes=inline.closes, volumes=inline.volumes,
+                                            tokenInfo=request.tokenInfo, options=request.options)
+        res = process_chart_request_v2(request, PaintingType.CANDLESTICK)
+        get_image_cache().clear()
+        with mock.patch.object(get_series_store(), 'read') as read:
+            res_inline = process_chart_request_v2(inline_request, PaintingType.CANDLESTICK)
+            read.assert_not_called()
+        self.assertEqual(read_image(res).tobytes(), read_image(res_inline).tobytes())
+
+    def test_paint_stored_chart(self):
+        append_candles(_append_request(_candles(0, 100)))
+        start = int(_candles(0, 100).dates()[50].astype('datetime64[ms]').astype(np.int64))
+        self.assertEqual(read_image(process_chart_request_v2(self._request(start=start), PaintingType.CHART)).size,
+                         (3220, 1820))
+
+    def test_stored_series_errors(self):
+        request = self._request()
+        request.tokenInfo.ClearField('address')
+        self.assertRaises(ValueError, process_chart_request_v2, request, PaintingType.CANDLESTICK)
+        with self.assertRaisesRegex(ValueError, f'{KEY.chain}/{KEY.address}/{KEY.timeframe}'):
+            process_chart_request_v2(self._request(), PaintingType.CANDLESTICK)
+        append_candles(_append_request(_candles(0, 10)))
+        with self.assertRaisesRegex(ValueError, 'No candles'):
+            process_chart_request_v2(self._request(start=2 ** 50), PaintingType.CANDLESTICK)
+        configure_series_store(None)
+        self.assertRaises(ValueError, process_chart_request_v2, self._request(), PaintingType.CANDLESTICK)
+        self.assertRaises(ValueError, append_candles, _append_request(_candles(0, 10)))
+
+    def test_invalid_append_call(self):
+        """The candles refused by the store abort the call with INVALID_ARGUMENT"""
+        context = mock.Mock(abort=mock.AsyncMock(side_effect=grpc.RpcError))
+        with self.assertRaises(grpc.RpcError):
+            asyncio.run(GraphPainterGrpcServer().AppendCandles(_append_request(_candles(0, 10), KEY._replace(chain='')),
+                                                               context))
+        self.assertEqual(context.abort.call_args.args[0], grpc.StatusCode.INVALID_ARGUMENT)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from controllers.deadline import DeadlineExceeded, RenderDeadline
+from controllers.single_flight import RequestCancelled, SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def _slow(self, started: threading.Event, release: threading.Event, result=None, error=None):
+        def fn():
+            self.calls += 1
+            started.set()
+            release.wait(5)
+            if error is not None:
+                raise error
+            return result
+        return fn
+
+    def setUp(self):
+        self.calls = 0
+
+    def _wait_followers(self, flight: SingleFlight, count: int):
+        while flight.coalesced < count:
+            time.sleep(0.01)
+
+    def test_identical_calls_share_the_result(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        fn = self._slow(started, release, result=b'img')
+        with ThreadPoolExecutor(5) as executor:
+            futures = [executor.submit(flight.do, 'key', fn) for _ in range(5)]
+            started.wait(5)
+            self._wait_followers(flight, 4)
+            release.set()
+            self.assertEqual([f.result() for f in futures], [b'img'] * 5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_different_keys_are_not_coalesced(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do('a', lambda: 1), 1)
+        self.assertEqual(flight.do('b', lambda: 2), 2)
+        self.assertEqual(flight.coalesced, 0)
+
+    def test_errors_are_propagated(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        fn = self._slow(started, release, error=ValueError('boom'))
+        with ThreadPoolExecutor(2) as executor:
+            leader = executor.submit(flight.do, 'key', fn)
+            started.wait(5)
+            follower = executor.submit(flight.do, 'key', fn)
+            self._wait_followers(flight, 1)
+            release.set()
+            self.assertRaises(ValueError, leader.result)
+            self.assertRaises(ValueError, follower.result)
+        self.assertEqual(self.calls, 1)
+
+    def test_follower_cancelled(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        deadline = RenderDeadline()
+        with ThreadPoolExecutor(2) as executor:
+            leader = executor.submit(flight.do, 'key', self._slow(started, release, result=1))
+            started.wait(5)
+            follower = executor.submit(flight.do, 'key', lambda: 2, deadline.check)
+            self._wait_followers(flight, 1)
+            deadline.cancel()
+            with self.assertRaises(RequestCancelled) as e:
+                follower.result()
+            self.assertNotIsInstance(e.exception, DeadlineExceeded)
+            release.set()
+            self.assertEqual(leader.result(), 1)
+
+    def test_follower_deadline_exceeded(self):
+        """A follower whose own deadline expires while it waits gets DeadlineExceeded, not a cancellation"""
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        with ThreadPoolExecutor(2) as executor:
+            leader = executor.submit(flight.do, 'key', self._slow(started, release, result=1))
+            started.wait(5)
+            follower = executor.submit(flight.do, 'key', lambda: 2, RenderDeadline(0.1).check)
+            self.assertRaises(DeadlineExceeded, follower.result)
+            release.set()
+            self.assertEqual(leader.result(), 1)
+
+    def test_leader_cancellation_is_not_inherited(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        with ThreadPoolExecutor(2) as executor:
+            leader = executor.submit(flight.do, 'key', self._slow(started, release, error=RequestCancelled()))
+            started.wait(5)
+            follower = executor.submit(flight.do, 'key', lambda: 2)
+            self._wait_followers(flight, 1)
+            release.set()
+            self.assertRaises(RequestCancelled, leader.result)
+            # the follower made the call itself
+            self.assertEqual(follower.result(), 2)
+
+    def test_cancelled_before_start(self):
+        with self.assertRaises(RequestCancelled):
+            cancelled = RenderDeadline()
+            cancelled.cancel()
+            SingleFlight().do('key', lambda: 1, cancelled.check)
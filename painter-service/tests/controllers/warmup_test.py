@@ -0,0 +1,50 @@
+import unittest
+from unittest import mock
+
+from controllers.image_cache import get_image_cache
+from controllers.warmup import THEMES, paint_fixtures, warm_up, warm_up_process
+from graph.renderer_pool import get_renderer_pool
+
+
+class WarmUpTest(unittest.TestCase):
+
+    def test_every_renderer_started(self):
+        pool = get_renderer_pool()
+        before = pool.renders_per_renderer()
+        pool.warm_up()
+        self.assertTrue(all(after > count for after, count in zip(pool.renders_per_renderer(), before)))
+        self.assertEqual(pool.available(), pool.size)
+
+    def test_paint_fixtures(self):
+        """Each painting type is painted with each theme, without filling the image cache"""
+        get_image_cache().clear()
+        with mock.patch('controllers.warmup.encode_chart') as encode:
+            durations = paint_fixtures()
+        self.assertEqual(encode.call_count, 2 * len(THEMES))
+        self.assertEqual(set(durations), {'candlestick/dark', 'chart/dark'})
+        self.assertEqual(len(get_image_cache()), 0)
+
+    def test_failed_painting_skipped(self):
+        with mock.patch('controllers.warmup.encode_chart', side_effect=[ValueError('invalid\nmore'), b'']), \
+                self.assertLogs(level='WARNING') as logs:
+            durations = paint_fixtures()
+        self.assertNotIn('candlestick/dark', durations)
+        self.assertEqual(list(durations), ['chart/dark'])
+        self.assertIn('candlestick/dark failed: ValueError invalid', logs.output[0])
+
+    def test_warm_up_process(self):
+        durations = warm_up_process()
+        self.assertIn('renderers', durations)
+        self.assertIn('fonts', durations)
+        self.assertIn('candlestick/dark', durations)
+
+    def test_warm_up_worker_pool(self):
+        with mock.patch('controllers.warmup.get_worker_pool') as pool, \
+                mock.patch('controllers.warmup.warm_up_process') as in_process:
+            warm_up()
+        pool.return_value.warm_up.assert_called_once()
+        in_process.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
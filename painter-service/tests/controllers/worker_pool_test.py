@@ -0,0 +1,79 @@
+import json
+import os
+import time
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from controllers.deadline import DeadlineExceeded, RenderDeadline
+from controllers.grpc_controller import encode_chart
+from controllers.single_flight import RequestCancelled
+from controllers.worker_pool import RenderWorkerPool, _render_in_worker, columns_from_shared_memory, \
+    columns_to_shared_memory
+from models.columnar import to_columnar
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+from models.price_point import CollectionOhcl
+from tests.test_elements import EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_TOKEN_INFO
+from tests.test_utils import read_image
+
+
+class RenderWorkerPoolTest(unittest.TestCase):
+    datas = to_columnar(CollectionOhcl(**json.loads(EXAMPLE_JSON_COLLECTION_OHCL)))
+    options = GraphOption(export_type='PNG', rsi=True, upper_part_text='Test')
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = RenderWorkerPool(2)
+        cls.pool.warm_up()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_shared_memory_columns(self):
+        shm, layout = columns_to_shared_memory(self.datas.columns())
+        try:
+            columns = columns_from_shared_memory(shm, layout)
+        finally:
+            shm.close()
+            shm.unlink()
+        self.assertEqual(columns.keys(), self.datas.columns().keys())
+        for name, column in self.datas.columns().items():
+            np.testing.assert_array_equal(columns[name], column)
+            self.assertEqual(columns[name].dtype, column.dtype)
+
+    def test_same_image_as_in_process(self):
+        res = self.pool.render(self.datas, EXAMPLE_TOKEN_INFO, self.options, PaintingType.CANDLESTICK)
+        expected = encode_chart(self.datas, EXAMPLE_TOKEN_INFO, self.options, PaintingType.CANDLESTICK)
+        self.assertEqual(read_image(res).tobytes(), read_image(expected).tobytes())
+
+    def test_errors_are_propagated(self):
+        with self.assertRaises(RequestCancelled):
+            self.pool.render(self.datas, EXAMPLE_TOKEN_INFO, self.options, PaintingType.CANDLESTICK,
+                             RenderDeadline(0))
+
+    def test_queue_wait_counts_in_the_deadline(self):
+        """The worker rebuilds the deadline from its wall-clock expiry, not from the time left when it was sent"""
+        deadline = RenderDeadline(0.05)
+        expires_at = deadline.expires_at_epoch()
+        self.assertAlmostEqual(expires_at, time.time() + 0.05, delta=0.01)
+        shm, layout = columns_to_shared_memory(self.datas.columns())
+        try:
+            time.sleep(0.06)
+            with self.assertRaises(DeadlineExceeded):
+                _render_in_worker(shm.name, layout, type(self.datas).__name__, EXAMPLE_TOKEN_INFO.dict(),
+                                  self.options.dict(exclude={'theme'}), PaintingType.CANDLESTICK.name, expires_at,
+                                  time.time())
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_respawn_after_a_worker_died(self):
+        with self.assertRaises(BrokenProcessPool):
+            self.pool._executor.submit(os._exit, 1).result()
+        respawns = self.pool.respawns
+        res = self.pool.render(self.datas, EXAMPLE_TOKEN_INFO, self.options, PaintingType.CANDLESTICK)
+        self.assertEqual(read_image(res).format, 'PNG')
+        self.assertEqual(self.pool.respawns, respawns + 1)
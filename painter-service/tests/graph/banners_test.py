@@ -0,0 +1,47 @@
+import unittest
+
+from PIL import ImageChops
+
+from graph.banners import BannerCache, TextMetrics, configure_banner_cache, get_banner_cache, paint_banner
+from graph.graph_painter import GraphPainter
+from models.graph_options import GraphOption
+from models.themes import DarkTheme
+from benchmarks import datasets
+
+FONT = DarkTheme.upper_part_font
+
+
+class BannersTest(unittest.TestCase):
+
+    def test_text_metrics(self):
+        metrics = TextMetrics(max_texts=2)
+        size = metrics.text_size('Hello', FONT)
+        self.assertEqual(metrics.text_size('Hello', FONT), size)
+        self.assertGreater(metrics.text_size('Hello world', FONT)[0], size[0])
+        metrics.text_size('Bye', FONT)
+        self.assertEqual(metrics.stats(), dict(hits=1, misses=3, size=2))
+
+    def test_banner_cache(self):
+        cache = BannerCache(max_bytes=2 * 3200 * 100 * 3)
+        banner = cache.banner('Hello', FONT, (36, 36, 36), (255, 255, 255), 3200, 100)
+        self.assertIs(cache.banner('Hello', FONT, (36, 36, 36), (255, 255, 255), 3200, 100), banner)
+        self.assertIsNone(ImageChops.difference(
+            banner, paint_banner('Hello', FONT, (36, 36, 36), (255, 255, 255), 3200, 100)).getbbox())
+        # another color, another size, then the first one is evicted
+        cache.banner('Hello', FONT, (255, 255, 255), (0, 0, 0), 3200, 100)
+        cache.banner('Hello', FONT, (36, 36, 36), (255, 255, 255), 1600, 100)
+        self.assertEqual(cache.stats(), dict(hits=1, misses=3, evictions=1, entries=2, bytes=3200 * 100 * 3 * 1.5))
+
+    def test_oversized_banner_not_cached(self):
+        cache = BannerCache(max_bytes=100)
+        cache.banner('Hello', FONT, (36, 36, 36), (255, 255, 255), 3200, 100)
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_painter_uses_the_cache(self):
+        configure_banner_cache()
+        painter = GraphPainter(datasets.ohcl(10), datasets.TOKEN_INFO, GraphOption(upper_part_text='Cached'))
+        self.assertIs(painter._generate_text_banner(), painter._generate_text_banner())
+        configure_banner_cache(0)
+        self.assertIsNone(get_banner_cache())
+        self.assertIsNot(painter._generate_text_banner(), painter._generate_text_banner())
+        configure_banner_cache()
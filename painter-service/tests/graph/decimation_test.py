@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from benchmarks import datasets
+from graph.decimation import decimation_indices, downsample, lttb_indices, minmax_indices, target_points
+from graph.graph_painter import GraphPainter
+from models.graph_options import GraphOption
+
+
+class DecimationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.datas = datasets.single_points(20_000)
+        self.x = self.datas.dates().astype(np.int64)
+        self.y = self.datas.values()
+
+    def _assert_keeps_ends_and_extrema(self, indices):
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], len(self.y) - 1)
+        self.assertIn(np.argmin(self.y), indices)
+        self.assertIn(np.argmax(self.y), indices)
+        self.assertTrue((np.diff(indices) > 0).all())
+
+    def test_lttb(self):
+        indices = lttb_indices(self.x, self.y, 500)
+        self._assert_keeps_ends_and_extrema(indices)
+        self.assertLessEqual(len(indices), 502)
+
+    def test_minmax(self):
+        indices = minmax_indices(self.y, 250)
+        self._assert_keeps_ends_and_extrema(indices)
+        self.assertLessEqual(len(indices), 502)
+        # the envelope of each bucket is kept
+        starts = np.linspace(0, len(self.y), 250, endpoint=False).astype(np.int64)
+        kept = set(self.y[indices])
+        for low, high in zip(np.minimum.reduceat(self.y, starts), np.maximum.reduceat(self.y, starts)):
+            self.assertIn(low, kept)
+            self.assertIn(high, kept)
+
+    def test_short_series_not_decimated(self):
+        self.assertIsNone(decimation_indices(self.x[:100], self.y[:100], 3200))
+        self.assertEqual(lttb_indices(self.x[:10], self.y[:10], 20).tolist(), list(range(10)))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            decimation_indices(self.x, self.y, 100, 'average')
+
+    def test_downsample_keeps_volume(self):
+        indices = decimation_indices(self.x, self.y, 1000, 'minmax')
+        sampled = downsample(self.datas, indices)
+        self.assertEqual(sampled.size(), len(indices))
+        self.assertAlmostEqual(sampled.volumes().sum(), self.datas.volumes().sum(), delta=1e-6)
+        self.assertEqual(sampled.first_value().value, self.datas.first_value().value)
+        self.assertEqual(sampled.last_value().date, self.datas.last_value().date)
+
+    def test_painter(self):
+        datas = datasets.single_points(200_000)
+        for mode in ('lttb', 'minmax'):
+            painter = GraphPainter(datas, datasets.TOKEN_INFO, GraphOption(downsample=mode, rsi=True,
+                                                                            bollinger_bands=True))
+            painter._decimate()
+            self.assertLessEqual(painter.plotted.size(), target_points(1600, 2) + 2)
+            figure = painter._chart_figure()
+            painter._process_options(figure)
+            self.assertTrue(all(len(trace['x']) == painter.plotted.size() for trace in figure['data']))
+        painter = GraphPainter(datas, datasets.TOKEN_INFO, GraphOption())
+        painter._decimate()
+        self.assertIs(painter.plotted, painter.datas)
@@ -0,0 +1,52 @@
+import unittest
+
+import plotly.graph_objects as go
+
+from benchmarks import datasets
+from graph.figure_skeletons import SkeletonCache, build_layout, fill_layout, get_skeleton_cache
+from graph.graph_painter import GraphPainter
+from models.graph_options import GraphOption
+from models.token_info import TokenInfo
+
+
+class FigureSkeletonsTest(unittest.TestCase):
+
+    def test_build_layout(self):
+        updates = [dict(template='plotly_dark', yaxis2=dict(domain=[0, 1], title='{name} price')),
+                   dict(yaxis2=dict(domain=[0.2, 1]), showlegend=True)]
+        figure = go.Figure()
+        for update in updates:
+            figure.update_layout(update)
+        self.assertEqual(build_layout(updates), figure.to_plotly_json()['layout'])
+
+    def test_fill_layout(self):
+        skeleton = build_layout([dict(template='plotly_dark', yaxis=dict(title='Volume ({volume_currency})'),
+                                      yaxis2=dict(title='{name} price'))])
+        layout = fill_layout(skeleton, dict(name='{BTC}', volume_currency='$'), annotations=[dict(text='a')])
+        self.assertEqual(layout['yaxis']['title']['text'], 'Volume ($)')
+        self.assertEqual(layout['yaxis2']['title']['text'], '{BTC} price')
+        self.assertEqual(layout['annotations'], [dict(text='a')])
+        # the skeleton is left untouched, the template is shared
+        self.assertEqual(skeleton['yaxis2']['title']['text'], '{name} price')
+        self.assertNotIn('annotations', skeleton)
+        self.assertIs(layout['template'], skeleton['template'])
+
+    def test_cache(self):
+        cache = SkeletonCache(max_size=2)
+        builds = []
+        for key in ('a', 'b', 'a', 'c', 'b'):
+            cache.get(key, lambda: builds.append(key) or {'key': key})
+        self.assertEqual(builds, ['a', 'b', 'c', 'b'])
+        self.assertEqual(cache.stats(), dict(hits=1, misses=4, size=2))
+
+    def test_painter_reuses_skeletons(self):
+        get_skeleton_cache().clear()
+        misses = get_skeleton_cache().misses
+        options = GraphOption(rsi=True, bollinger_bands=True)
+        for size, name in ((50, 'Bitcoin'), (80, 'Ether')):
+            figure = GraphPainter(datasets.ohcl(size), TokenInfo(name=name), options)._candlestick_figure()
+            self.assertEqual(figure['layout']['yaxis2']['title']['text'], f"{name} price ($)")
+            self.assertEqual(len(figure['data'][0]['x']), size)
+        self.assertEqual(get_skeleton_cache().misses, misses + 1)
+        GraphPainter(datasets.single_points(50), TokenInfo(name='Bitcoin'), options)._chart_figure()
+        self.assertEqual(get_skeleton_cache().misses, misses + 2)
@@ -0,0 +1,86 @@
+import io
+import unittest
+
+from PIL import Image
+
+from benchmarks import datasets
+from graph.graph_painter import GraphPainter
+from graph.grid_painter import GridPainter, GridPanel, MAX_GRID_SIDE, MAX_PANELS, grid_shape
+from models.graph_options import GraphOption
+from models.painting_types import PaintingType
+
+OPTIONS = GraphOption(export_type='PNG', width=400, height=300, scale=1)
+
+
+def _panels(count: int, options: GraphOption = OPTIONS):
+    return [GridPanel(GraphPainter(datasets.ohcl(50, seed=i), datasets.TOKEN_INFO, options),
+                      PaintingType.CANDLESTICK, f'Candles {i}') if i % 2 == 0 else
+            GridPanel(GraphPainter(datasets.single_points(50, seed=i), datasets.TOKEN_INFO, options),
+                      PaintingType.CHART, f'Trades {i}') for i in range(count)]
+
+
+class GridPainterTest(unittest.TestCase):
+
+    def test_grid_shape(self):
+        self.assertEqual(grid_shape(1), (1, 1))
+        self.assertEqual(grid_shape(9), (3, 3))
+        self.assertEqual(grid_shape(10), (3, 4))
+        self.assertEqual(grid_shape(6, columns=2), (3, 2))
+        self.assertEqual(grid_shape(2, columns=5), (1, 2))
+
+    def test_figure(self):
+        """The axes of each panel are renamed and kept in its cell"""
+        figure = GridPainter(_panels(4), OPTIONS).figure()
+        layout = figure['layout']
+        self.assertEqual((layout['width'], layout['height']), (800, 600))
+        self.assertEqual({trace['xaxis'] for trace in figure['data']}, {'x', 'x2', 'x3', 'x4'})
+        self.assertEqual({trace['yaxis'] for trace in figure['data'] if trace['xaxis'] == 'x2'}, {'y5', 'y4'})
+        x0, x1 = layout['xaxis2']['domain']
+        self.assertTrue(0.5 < x0 < x1 < 1)
+        y0, y1 = layout['yaxis5']['domain']
+        self.assertTrue(0.5 < y0 < y1 < 1)
+        self.assertLess(layout['yaxis10']['domain'][1], 0.5)
+        self.assertEqual(layout['yaxis5']['anchor'], 'x2')
+        self.assertEqual([a['text'] for a in layout['annotations']], ['Candles 0', 'Trades 1', 'Candles 2', 'Trades 3'])
+
+    def test_paint(self):
+        img = GridPainter(_panels(3), OPTIONS).paint()
+        self.assertEqual(img.size, (800, 600))
+        # the border of the first panel, the fourth cell is empty
+        self.assertNotEqual(img.getpixel((1, 1)), img.getpixel((799, 599)))
+
+    def test_crop_panels(self):
+        variants = GridPainter(_panels(3), OPTIONS.copy(update=dict(scale=1.5))).encode(crop_panels=True)
+        self.assertEqual([(v.name, v.width, v.height) for v in variants],
+                         [('0', 600, 450), ('1', 600, 450), ('2', 600, 450)])
+        self.assertEqual(Image.open(io.BytesIO(variants[1].image)).size, (600, 450))
+
+    def test_invalid_grids(self):
+        self.assertRaises(ValueError, GridPainter, [], OPTIONS)
+        self.assertRaises(ValueError, GridPainter, _panels(MAX_PANELS + 1), OPTIONS)
+        for options in (dict(render_backend='raster'), dict(variants=['thumbnail'])):
+            options = OPTIONS.copy(update=options)
+            self.assertRaises(ValueError, GridPainter, _panels(2, options), options)
+        # each panel is small enough, not the whole grid: too wide, then too many pixels
+        options = OPTIONS.copy(update=dict(width=1200, scale=4))
+        self.assertRaises(ValueError, GridPainter, _panels(4, options), options, columns=4)
+        options = OPTIONS.copy(update=dict(width=2048, height=2048, scale=2))
+        self.assertRaises(ValueError, GridPainter, _panels(9, options), options)
+        GridPainter(_panels(2, OPTIONS), OPTIONS.copy(update=dict(width=MAX_GRID_SIDE // 4, scale=2)))
+
+    def test_stage_hooks(self):
+        """The stages of the grid are checked and timed by the hooks"""
+        stages = []
+
+        def check_stage(name: str):
+            stages.append(name)
+            if name == 'export':
+                raise TimeoutError(name)
+
+        grid = GridPainter(_panels(2), OPTIONS, check_stage=check_stage)
+        self.assertRaises(TimeoutError, grid.paint)
+        self.assertEqual(stages, ['indicators', 'figure', 'export'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from graph import finance_util
+from graph.indicators import IndicatorEngine
+from models.columnar import to_columnar
+from models.price_point import CollectionOhcl, CollectionSingleTradePoint
+from tests.test_elements import EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT
+
+
+class FinanceUtilTest(unittest.TestCase):
+    values = np.random.default_rng(42).normal(100, 5, size=200)
+
+    def test_sma_and_std_match_pandas(self):
+        series = pd.Series(self.values)
+        np.testing.assert_allclose(finance_util.sma(self.values, 20), series.rolling(20).mean().to_numpy())
+        np.testing.assert_allclose(finance_util.rolling_std(self.values, 20), series.rolling(20).std().to_numpy())
+
+    def test_window_larger_than_values(self):
+        self.assertTrue(np.all(np.isnan(finance_util.sma(self.values[:5], 20))))
+
+    def test_rsi_wilder(self):
+        rsi = finance_util.rsi(self.values, method='wilder')
+        self.assertTrue(np.all(np.isnan(rsi[:14])))
+        self.assertTrue(np.all((rsi[14:] >= 0) & (rsi[14:] <= 100)))
+        # only increases: no loss at all
+        self.assertEqual(finance_util.rsi(np.arange(30.), method='wilder')[-1], 100)
+
+    def test_fibonacci_levels_are_scalars(self):
+        levels = finance_util.fibonacci_levels(self.values)
+        self.assertEqual(levels[0], ('lowest', self.values.min()))
+        self.assertEqual(levels[-1], ('top', self.values.max()))
+
+
+class IndicatorEngineTest(unittest.TestCase):
+    coll_ohcl = to_columnar(CollectionOhcl(**json.loads(EXAMPLE_JSON_COLLECTION_OHCL)))
+    coll_single_trade_point = to_columnar(
+        CollectionSingleTradePoint(**json.loads(EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT)))
+
+    def test_bollinger_bands_share_rolling_mean(self):
+        engine = IndicatorEngine(self.coll_ohcl)
+        ma, upper, lower = (band[0] for band in engine.bollinger_bands)
+        self.assertIs(ma, engine.sma('typical_price', 20))
+        np.testing.assert_allclose(upper - ma, ma - lower)
+        expected = finance_util.bollinger_bands(self.coll_ohcl.highs(), self.coll_ohcl.lows(),
+                                                self.coll_ohcl.closes())
+        for band, expected_band in zip(engine.bollinger_bands, expected):
+            np.testing.assert_allclose(band[0], expected_band[0])
+
+    def test_indicators_are_cached(self):
+        engine = IndicatorEngine(self.coll_ohcl)
+        self.assertIs(engine.rsi, engine.rsi)
+        self.assertIs(engine.sma('prices', 10), engine.sma('prices', 10))
+
+    def test_simple_chart_uses_values(self):
+        engine = IndicatorEngine(self.coll_single_trade_point)
+        self.assertIs(engine.prices, self.coll_single_trade_point.values())
+        self.assertEqual(len(engine.moving_average), self.coll_single_trade_point.size())
+        self.assertEqual(engine.fibonacci_bands[0][0], self.coll_single_trade_point.values().min())
@@ -0,0 +1,105 @@
+import io
+import unittest
+from unittest import mock
+
+import pydantic
+from PIL import Image, ImageOps
+
+from graph.graph_painter import GraphPainter
+from graph.output import compose, encode, encode_variants, kaleido_format, render_scale
+from models.graph_options import GraphOption
+from benchmarks import datasets
+
+
+class OutputTest(unittest.TestCase):
+    chart = Image.new('RGB', (320, 180), (10, 20, 30))
+    banner = Image.new('RGB', (320, 10), (200, 200, 200))
+
+    def test_compose(self):
+        img = compose(self.chart, self.banner, 10, '#00ff00')
+        expected = Image.new('RGB', (320, 190))
+        expected.paste(self.banner, (0, 0))
+        expected.paste(self.chart, (0, 10))
+        expected = ImageOps.expand(expected, border=10, fill='#00ff00')
+        self.assertEqual(img.size, (340, 210))
+        self.assertEqual(img.tobytes(), expected.tobytes())
+
+    def test_compose_without_banner_nor_border(self):
+        img = compose(self.chart, None, 0, '#00ff00')
+        self.assertEqual(img.tobytes(), self.chart.tobytes())
+
+    def test_encode(self):
+        for export_type in ('JPEG', 'PNG', 'WEBP', 'webp'):
+            data = encode(self.chart, GraphOption(export_type=export_type))
+            self.assertEqual(Image.open(io.BytesIO(data)).format, export_type.upper())
+
+    def test_encode_jpeg_options(self):
+        default = encode(self.chart, GraphOption())
+        tuned = encode(self.chart, GraphOption(quality=95, progressive=True, subsampling='4:4:4'))
+        self.assertNotEqual(default, tuned)
+        self.assertTrue(Image.open(io.BytesIO(tuned)).info.get('progressive'))
+
+    def test_encode_png_palette(self):
+        data = encode(self.chart, GraphOption(export_type='PNG', palette_colors=16))
+        self.assertEqual(Image.open(io.BytesIO(data)).mode, 'P')
+
+    def test_invalid_options(self):
+        for options in (dict(quality=0), dict(subsampling='4:1:1'), dict(palette_colors=512)):
+            self.assertRaises(pydantic.ValidationError, GraphOption, **options)
+
+    def test_kaleido_format(self):
+        self.assertEqual(kaleido_format(GraphOption(export_type='webp')), 'webp')
+        self.assertEqual(kaleido_format(GraphOption(export_type='JPEG')), 'jpeg')
+        self.assertIsNone(kaleido_format(GraphOption(export_type='JPEG', quality=90)))
+        self.assertIsNone(kaleido_format(GraphOption(export_type='PNG', palette_colors=64)))
+        self.assertIsNone(kaleido_format(GraphOption(export_type='GIF')))
+
+    def test_encode_variants(self):
+        img = Image.new('RGB', (3220, 1820), (10, 20, 30))
+        variants = encode_variants(img, GraphOption(export_type='PNG', variants=['full', 'thumbnail', 'preview']))
+        self.assertEqual([(v.name, v.width, v.height) for v in variants],
+                         [('full', 3220, 1820), ('thumbnail', 320, 181), ('preview', 800, 452)])
+        for variant in variants:
+            self.assertEqual(Image.open(io.BytesIO(variant.image)).size, (variant.width, variant.height))
+
+    def test_render_scale(self):
+        self.assertEqual(render_scale(GraphOption(scale=3)), 3)
+        self.assertAlmostEqual(render_scale(GraphOption(scale=0.2, variants=['thumbnail'])), 320 / 1610)
+        self.assertEqual(render_scale(GraphOption(variants=['thumbnail', 'full'])), 2)
+        self.assertAlmostEqual(render_scale(GraphOption(variants=['thumbnail', 'preview'])), 800 / 1610)
+        self.assertAlmostEqual(render_scale(GraphOption(variants=['thumbnail'], border=False)), 320 / 1600)
+        self.assertRaises(pydantic.ValidationError, GraphOption, variants=['poster'])
+        self.assertRaises(pydantic.ValidationError, GraphOption, width=50)
+
+    def test_size_options(self):
+        """The figure, its banner and its border are painted at the size and scale of the options"""
+        gp = GraphPainter(datasets.ohcl(50), datasets.TOKEN_INFO,
+                          GraphOption(width=800, height=600, scale=1, upper_part_text='Hello'))
+        self.assertEqual(gp.paint_candlestick().size, (810, 660))
+
+    def test_thumbnail_painted_small(self):
+        """A thumbnail alone is exported at its size rather than downscaled from the full image"""
+        gp = GraphPainter(datasets.ohcl(50), datasets.TOKEN_INFO, GraphOption(variants=['thumbnail']))
+        with mock.patch.object(gp, '_compose', wraps=gp._compose) as compose_:
+            (thumbnail,) = gp.encode_candlestick()
+        self.assertLess(compose_.call_args.args[0].width, 330)
+        self.assertEqual((thumbnail.width, thumbnail.height), (320, 180))
+
+    def test_direct_export(self):
+        """Without border nor text, Kaleido exports the final image and it isn't decoded"""
+        gp = GraphPainter(datasets.ohcl(50), datasets.TOKEN_INFO, GraphOption(border=False, export_type='JPEG'))
+        with mock.patch.object(gp, '_decode') as decode:
+            data = gp.encode_candlestick()
+            decode.assert_not_called()
+        img = Image.open(io.BytesIO(data))
+        self.assertEqual((img.format, img.size), ('JPEG', (3200, 1800)))
+
+    def test_composed_export(self):
+        gp = GraphPainter(datasets.single_points(50), datasets.TOKEN_INFO,
+                          GraphOption(upper_part_text='Hello', export_type='WEBP', quality=60))
+        img = Image.open(io.BytesIO(gp.encode_simple_chart()))
+        self.assertEqual((img.format, img.size), ('WEBP', (3220, 1920)))
+
+
+if __name__ == '__main__':
+    unittest.main()
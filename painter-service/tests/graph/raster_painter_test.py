@@ -0,0 +1,55 @@
+import json
+import os
+import unittest
+
+from graph.graph_painter import GraphPainter
+from graph.raster_painter import RasterPainter, _nice_ticks, _to_rgb
+from models.graph_options import GraphOption
+from models.price_point import CollectionOhcl, CollectionSingleTradePoint
+from models.themes import DarkTheme, WhiteTheme
+from tests.test_elements import EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_TOKEN_INFO, \
+    EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT_VOLUME
+
+
+class RasterPainterTest(unittest.TestCase):
+    coll_ohcl = CollectionOhcl(**json.loads(EXAMPLE_JSON_COLLECTION_OHCL))
+    coll_single_trade_point_volume = CollectionSingleTradePoint(
+        **json.loads(EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT_VOLUME))
+
+    file_path = os.path.dirname(os.path.realpath(__file__)) + '/img.png'
+
+    def test_paint_candlestick(self):
+        opt = GraphOption(render_backend='raster')
+        img = RasterPainter(self.coll_ohcl, EXAMPLE_TOKEN_INFO, opt).paint_candlestick()
+        self.assertEqual(img.size, (3200, 1800))
+        # the corner of the chart is the background of the theme
+        self.assertEqual(img.getpixel((0, 0)), DarkTheme.raster_bg_color)
+        img.save(self.file_path)
+
+    def test_paint_candlestick_white_all_options(self):
+        opt = GraphOption(render_backend='raster', theme_name='white', bollinger_bands=True, fibonacci_bands=True,
+                          rsi=True, average=True, finance=True, watermark='TESTTESTTEST')
+        img = RasterPainter(self.coll_ohcl, EXAMPLE_TOKEN_INFO, opt).paint_candlestick()
+        self.assertEqual(img.getpixel((0, 0)), WhiteTheme.raster_bg_color)
+        img.save(self.file_path)
+
+    def test_paint_simple_chart(self):
+        opt = GraphOption(render_backend='raster', average=True)
+        img = RasterPainter(self.coll_single_trade_point_volume, EXAMPLE_TOKEN_INFO, opt).paint_simple_chart()
+        self.assertEqual(img.size, (3200, 1800))
+        img.save(self.file_path)
+
+    def test_graph_painter_uses_backend(self):
+        opt = GraphOption(render_backend='raster', upper_part_text='This is a test')
+        gp = GraphPainter(datas=self.coll_ohcl, token_info=EXAMPLE_TOKEN_INFO, options=opt)
+        img = gp.paint_candlestick()
+        # chart + banner + border
+        self.assertEqual(img.size, (3220, 1920))
+
+    def test_nice_ticks(self):
+        self.assertEqual(_nice_ticks(0, 100, count=5).tolist(), [0, 20, 40, 60, 80, 100])
+        self.assertEqual(_nice_ticks(60739, 62472, count=4).tolist(), [61000, 61500, 62000])
+
+    def test_colors(self):
+        self.assertEqual(_to_rgb('rgb(255, 0, 0, 0.5)'), (255, 0, 0))
+        self.assertEqual(_to_rgb('#228B22'), (34, 139, 34))
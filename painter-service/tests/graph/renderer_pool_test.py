@@ -0,0 +1,68 @@
+import io
+import threading
+import unittest
+from contextlib import ExitStack
+from unittest import mock
+
+import plotly.graph_objects as go
+from PIL import Image
+
+from graph.renderer_pool import KaleidoRendererPool
+
+
+class KaleidoRendererPoolTest(unittest.TestCase):
+    pool = KaleidoRendererPool(size=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_render_png(self):
+        fig = go.Figure(go.Scatter(x=[1, 2, 3], y=[3, 1, 2]))
+        res = self.pool.to_image(fig, width=320, height=200, scale=2)
+        img = Image.open(io.BytesIO(res))
+        self.assertEqual(img.format, 'PNG')
+        self.assertEqual(img.size, (640, 400))
+
+    def test_renderer_returned_after_use(self):
+        with self.pool.checkout() as renderer:
+            self.assertEqual(self.pool.available(), 1)
+            self.assertIn(renderer.renderer_id, (0, 1))
+        self.assertEqual(self.pool.available(), 2)
+
+    def test_checkout_timeout(self):
+        with self.pool.checkout(), self.pool.checkout():
+            with self.assertRaises(TimeoutError):
+                with self.pool.checkout(timeout=0.01):
+                    pass
+
+    def test_concurrent_renders_use_every_renderer(self):
+        fig = go.Figure(go.Bar(x=[1, 2, 3], y=[3, 1, 2]))
+        # every export waits for another one to run at the same time, which only a second renderer can do
+        barrier = threading.Barrier(2, timeout=30)
+
+        def contended(transform):
+            def wrapper(*args, **kwargs):
+                barrier.wait()
+                return transform(*args, **kwargs)
+            return wrapper
+
+        before = self.pool.renders_per_renderer()
+        with ExitStack() as stack:
+            for renderer in self.pool._renderers:
+                stack.enter_context(mock.patch.object(renderer.scope, 'transform',
+                                                      contended(renderer.scope.transform)))
+            threads = [threading.Thread(target=self.pool.to_image, args=(fig,), kwargs=dict(width=200, height=100))
+                       for _ in range(6)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        after = self.pool.renders_per_renderer()
+        self.assertEqual(sum(after) - sum(before), 6)
+        self.assertTrue(all(a > b for a, b in zip(after, before)))
+        self.assertEqual(self.pool.available(), 2)
+
+    def test_pool_needs_a_renderer(self):
+        with self.assertRaises(ValueError):
+            KaleidoRendererPool(size=0)
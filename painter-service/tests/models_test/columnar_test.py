@@ -0,0 +1,119 @@
+import json
+import os
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+import numpy as np
+
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint, to_columnar
+from models.price_point import CollectionOhcl, CollectionSingleTradePoint, OhclTradePoint
+from tests.test_elements import EXAMPLE_JSON_COLLECTION_OHCL, EXAMPLE_JSON_COLLECTION_OHCL_CRO, \
+    EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT
+
+
+class ColumnarCollectionTest(unittest.TestCase):
+    coll_ohcl = CollectionOhcl(**json.loads(EXAMPLE_JSON_COLLECTION_OHCL))
+    coll_single_trade_point = CollectionSingleTradePoint(**json.loads(EXAMPLE_JSON_COLLECTION_SINGLE_TRADE_POINT))
+
+    def test_same_values_as_rows(self):
+        col = to_columnar(self.coll_ohcl)
+        self.assertIsInstance(col, ColumnarCollectionOhcl)
+        self.assertEqual(col.size(), self.coll_ohcl.size())
+        self.assertEqual(col.closes().tolist(), self.coll_ohcl.closes())
+        self.assertEqual(col.highs().tolist(), self.coll_ohcl.highs())
+        self.assertEqual(col.dates().astype(datetime).tolist(), self.coll_ohcl.dates())
+        self.assertEqual(col.first_value(), self.coll_ohcl.first_value())
+        self.assertEqual(col.highest_value(), self.coll_ohcl.highest_value())
+        self.assertEqual(col.lowest_value(), self.coll_ohcl.lowest_value())
+        self.assertAlmostEqual(col.total_volume(), self.coll_ohcl.total_volume())
+        self.assertEqual(col.coll, self.coll_ohcl.coll)
+
+    def test_accessors_are_views(self):
+        col = to_columnar(self.coll_ohcl)
+        self.assertIs(col.closes(), col.closes())
+        self.assertEqual(col.closes().dtype, np.float64)
+        self.assertTrue(col.closes().flags['C_CONTIGUOUS'])
+
+    def test_unknown_volumes(self):
+        col = to_columnar(self.coll_single_trade_point)
+        self.assertIsInstance(col, ColumnarCollectionSingleTradePoint)
+        self.assertFalse(col.has_volume())
+        self.assertFalse(col.total_volume())
+        self.assertIsNone(col.last_value().volume)
+        self.assertEqual(col.values().tolist(), self.coll_single_trade_point.values())
+
+    def test_aware_dates_stored_as_utc(self):
+        coll = CollectionOhcl(**json.loads(EXAMPLE_JSON_COLLECTION_OHCL_CRO))
+        col = to_columnar(coll)
+        self.assertEqual(col.first_value().date, coll.first_value().date.replace(tzinfo=None))
+
+    def test_regroup(self):
+        col = to_columnar(self.coll_ohcl)
+        expected = self.coll_ohcl.regroup(7)
+        res = col.regroup(7)
+        self.assertEqual(res.size(), expected.size())
+        self.assertEqual(res.opens().tolist(), expected.opens())
+        self.assertEqual(res.closes().tolist(), expected.closes())
+        self.assertEqual(res.highs().tolist(), expected.highs())
+        self.assertEqual(res.lows().tolist(), expected.lows())
+        np.testing.assert_allclose(res.volumes(), expected.volumes())
+
+    def test_add_keeps_order(self):
+        col = ColumnarCollectionOhcl(dates=[datetime(2021, 1, 1), datetime(2021, 1, 3)],
+                                     opens=[1, 3], highs=[1, 3], lows=[1, 3], closes=[1, 3])
+        col.add(OhclTradePoint(date=datetime(2021, 1, 2), volume=None, v_open=2, v_high=2, v_low=2, v_close=2))
+        self.assertEqual(col.closes().tolist(), [1, 2, 3])
+        self.assertEqual(col.matching_date_ts_seconds(datetime(2021, 1, 2, tzinfo=timezone.utc).timestamp()).v_close,
+                         2)
+
+    def test_matching_date_is_utc(self):
+        """The timestamps are UTC epochs, whatever the timezone of the host"""
+        col = to_columnar(CollectionOhcl(**json.loads(EXAMPLE_JSON_COLLECTION_OHCL_CRO)))
+        point = col.coll[3]
+        ts = point.date.replace(tzinfo=timezone.utc).timestamp()
+        try:
+            with mock.patch.dict(os.environ, TZ='Europe/Paris'):
+                time.tzset()
+                self.assertEqual(col.matching_date_ts_seconds(ts), point)
+                self.assertIsNone(col.matching_date_ts_seconds(point.date.timestamp()))
+        finally:
+            time.tzset()
+
+    def test_partial_volumes(self):
+        col = ColumnarCollectionSingleTradePoint(dates=[datetime(2021, 1, 1), datetime(2021, 1, 2)], values=[1, 2],
+                                                 volumes=[None, 3])
+        self.assertTrue(col.has_volume())
+        self.assertEqual(col.total_volume(), 3)
+
+    def test_from_raw_values(self):
+        dates = np.array(['2021-01-03', '2021-01-01', '2021-01-02', '2021-01-02'], dtype='datetime64[us]')
+        col = ColumnarCollectionSingleTradePoint.from_raw_values(values=[3, 1, 2, 4], volumes=[None, 1, 2, 3],
+                                                                 dates=dates)
+        self.assertEqual(col.values().tolist(), [1, 2, 4, 3])
+        self.assertTrue(np.isnan(col.volumes()[-1]))
+        col = ColumnarCollectionSingleTradePoint.from_raw_values(values=[3, 1, 2, 4], volumes=[None, 1, 2, 3],
+                                                                 dates=dates, dedupe=True)
+        self.assertEqual(col.values().tolist(), [1, 4, 3])
+
+    def test_from_raw_values_sorted_input_is_not_copied(self):
+        closes = np.arange(5, dtype=np.float64)
+        dates = np.arange(5).astype('datetime64[D]').astype('datetime64[us]')
+        col = ColumnarCollectionOhcl.from_raw_values(opens=closes, highs=closes, lows=closes, closes=closes,
+                                                     volumes=closes, dates=dates)
+        self.assertIs(col.closes(), closes)
+
+    def test_extend(self):
+        col = to_columnar(self.coll_ohcl)
+        size = col.size()
+        col.extend(col.regroup(10), dedupe=True)
+        self.assertEqual(col.size(), size)
+        self.assertTrue(np.all(np.diff(col.dates()) > np.timedelta64(0)))
+        regrouped = col.regroup(10)
+        col.extend(regrouped)
+        self.assertEqual(col.size(), size + regrouped.size())
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            ColumnarCollectionSingleTradePoint(dates=[datetime(2021, 1, 1)], values=[1, 2])
@@ -1,6 +1,8 @@
 import unittest
 from pprint import pprint
 
+import pydantic
+
 from models.graph_options import GraphOption
 from models.themes import DarkTheme
 
@@ -16,3 +18,10 @@ class TestGraphOptions(unittest.TestCase):
         pprint(g)
         pprint(g.dict())
 
+    def test_downsample(self):
+        """An unknown downsampling is refused whatever the length of the series painted"""
+        self.assertEqual(GraphOption(downsample='lttb').downsample, 'lttb')
+        self.assertIsNone(GraphOption().downsample)
+        with self.assertRaises(pydantic.ValidationError):
+            GraphOption(downsample='foo')
+
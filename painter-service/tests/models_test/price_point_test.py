@@ -1,6 +1,6 @@
 import json
 import time
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import unittest
 from pprint import pprint
 
@@ -25,3 +25,33 @@ class PricePointsTest(unittest.TestCase):
         pprint(res)
         self.assertEqual(res.size(), 100)
 
+    def test_from_raw_values_sorts_once(self):
+        dates = [datetime(2021, 1, d) for d in (3, 1, 2, 2)]
+        res = CollectionSingleTradePoint.from_raw_values(values=[3, 1, 2, 4], volumes=[None] * 4, dates=dates)
+        self.assertEqual(res.values(), [1, 2, 4, 3])
+        res = CollectionSingleTradePoint.from_raw_values(values=[3, 1, 2, 4], volumes=[None] * 4, dates=dates,
+                                                         dedupe=True)
+        self.assertEqual(res.values(), [1, 4, 3])
+
+    def test_regroup_ohcl(self):
+        res = CollectionOhcl.from_raw_values(opens=[1, 2, 3], highs=[5, 6, 7], lows=[0, 1, 2], closes=[2, 3, 4],
+                                             volumes=[1, 1, None], dates=[datetime(2021, 1, d) for d in (1, 2, 3)])
+        regrouped = res.regroup(2)
+        self.assertEqual(regrouped.size(), 2)
+        self.assertEqual(regrouped.first_value().v_high, 6)
+        self.assertEqual(regrouped.first_value().v_close, 3)
+        self.assertEqual(regrouped.first_value().volume, 2)
+
+    def test_regroup_keeps_the_row_api(self):
+        """The dates keep their timezone, the chunks without volume have a volume of 0"""
+        paris = timezone(timedelta(hours=2))
+        dates = [datetime(2021, 1, 1, h, tzinfo=paris) for h in range(4)]
+        res = CollectionSingleTradePoint.from_raw_values(values=[1, 2, 3, 4], volumes=[None, None, 1, None],
+                                                         dates=dates).regroup(2)
+        self.assertEqual(res.dates(), [dates[0], dates[2]])
+        self.assertEqual(res.first_value().date.utcoffset(), timedelta(hours=2))
+        self.assertEqual(res.volumes(), [0., 1.])
+        res = CollectionOhcl.from_raw_values(opens=[1, 2], highs=[1, 2], lows=[1, 2], closes=[1, 2],
+                                             volumes=[None, None], dates=dates[:2]).regroup(2)
+        self.assertEqual(res.first_value().date, dates[0])
+        self.assertEqual(res.first_value().volume, 0.)
@@ -0,0 +1,106 @@
+import unittest
+
+import numpy as np
+
+from benchmarks import datasets
+from models.columnar import ColumnarCollectionOhcl, ColumnarCollectionSingleTradePoint
+from models.resample import bucketize, parse_interval
+
+
+def _dates(*dates):
+    return np.array(dates, dtype='datetime64[us]')
+
+
+class ResampleTest(unittest.TestCase):
+
+    def test_parse_interval(self):
+        self.assertEqual(parse_interval('5m'), 300_000_000)
+        self.assertEqual(parse_interval('1d'), 86_400_000_000)
+        for interval in ('5', '0m', '1y', 'm'):
+            with self.assertRaises(ValueError):
+                parse_interval(interval)
+
+    def test_buckets(self):
+        buckets = bucketize(_dates('2021-01-01T00:00:30', '2021-01-01T00:04:59', '2021-01-01T00:05:00',
+                                   '2021-01-01T00:21:00'), '5m')
+        self.assertEqual(buckets.starts.tolist(), [0, 2, 3])
+        self.assertEqual(buckets.ends.tolist(), [1, 2, 3])
+        np.testing.assert_array_equal(buckets.dates, _dates('2021-01-01T00:00', '2021-01-01T00:05',
+                                                            '2021-01-01T00:20'))
+        self.assertEqual(len(bucketize(_dates(), '5m').starts), 0)
+
+    def test_weeks_start_on_monday(self):
+        # 2021-01-06 is a wednesday
+        self.assertEqual(bucketize(_dates('2021-01-06T12:00'), '1w').dates[0], np.datetime64('2021-01-04', 'us'))
+
+    def test_timezone(self):
+        # the clocks went forward on 2021-03-28 in Paris
+        dates = _dates('2021-03-27T22:30', '2021-03-28T21:30', '2021-03-28T22:30')
+        buckets = bucketize(dates, '1d', 'Europe/Paris')
+        np.testing.assert_array_equal(buckets.dates, _dates('2021-03-26T23:00', '2021-03-27T23:00',
+                                                            '2021-03-28T22:00'))
+        self.assertEqual(buckets.starts.tolist(), [0, 1, 2])
+        # the shorter intervals keep their length
+        buckets = bucketize(dates, '1h', 'Asia/Kolkata')
+        self.assertEqual(buckets.dates[0], np.datetime64('2021-03-27T22:30', 'us'))
+        with self.assertRaises(ValueError):
+            bucketize(dates, '1d', 'Mars/Olympus')
+
+    def test_trades_to_ohcl(self):
+        trades = ColumnarCollectionSingleTradePoint(
+            dates=_dates('2021-01-01T00:00', '2021-01-01T00:00:20', '2021-01-01T00:00:40', '2021-01-01T00:03:10'),
+            values=[2, 5, 1, 3], volumes=[1, 2, 3, 4])
+        candles = trades.to_ohcl('1m')
+        self.assertEqual(candles.opens().tolist(), [2, 3])
+        self.assertEqual(candles.highs().tolist(), [5, 3])
+        self.assertEqual(candles.lows().tolist(), [1, 3])
+        self.assertEqual(candles.closes().tolist(), [1, 3])
+        self.assertEqual(candles.volumes().tolist(), [6, 4])
+
+        filled = trades.to_ohcl('1m', fill_gaps=True)
+        self.assertEqual(filled.size(), 4)
+        self.assertEqual(filled.opens().tolist(), [2, 1, 1, 3])
+        self.assertEqual(filled.highs().tolist(), [5, 1, 1, 3])
+        self.assertEqual(filled.volumes().tolist(), [6, 0, 0, 4])
+        self.assertEqual(trades.resample('1m', fill_gaps=True).values().tolist(), [1, 1, 1, 3])
+
+    def test_unsorted_dates(self):
+        """The points sent out of order are resampled as if they were sorted"""
+        trades = ColumnarCollectionSingleTradePoint(
+            dates=_dates('2021-01-01T00:05', '2021-01-01T00:01', '2021-01-01T00:03', '2021-01-01T00:01:30'),
+            values=[4, 1, 3, 2], volumes=[1, 2, 3, 4])
+        candles = trades.to_ohcl('1m')
+        np.testing.assert_array_equal(candles.dates(), _dates('2021-01-01T00:01', '2021-01-01T00:03',
+                                                              '2021-01-01T00:05'))
+        self.assertEqual(candles.opens().tolist(), [1, 3, 4])
+        self.assertEqual(candles.closes().tolist(), [2, 3, 4])
+        self.assertEqual(candles.volumes().tolist(), [6, 3, 1])
+        filled = trades.to_ohcl('1m', fill_gaps=True)
+        self.assertEqual(filled.closes().tolist(), [2, 2, 3, 3, 4])
+        self.assertEqual(trades.resample('1m', fill_gaps=True).values().tolist(), [2, 2, 3, 3, 4])
+        resampled = ColumnarCollectionOhcl(dates=candles.dates()[::-1], opens=candles.opens()[::-1],
+                                           highs=candles.highs()[::-1], lows=candles.lows()[::-1],
+                                           closes=candles.closes()[::-1]).resample('2m')
+        self.assertEqual(resampled.closes().tolist(), [2, 3, 4])
+        with self.assertRaises(ValueError):
+            bucketize(trades.dates(), '1m')
+
+    def test_resample_matches_regroup(self):
+        """Minute candles resampled by 10 minutes are regrouped by 10"""
+        col = datasets.ohcl(1000)
+        resampled = col.resample('10m')
+        regrouped = col.regroup(10)
+        for name in ColumnarCollectionOhcl.value_columns + ('dates', 'volumes'):
+            np.testing.assert_array_equal(resampled.columns()[name], regrouped.columns()[name])
+
+    def test_no_volume(self):
+        trades = ColumnarCollectionSingleTradePoint(dates=_dates('2021-01-01T00:00', '2021-01-01T00:03'),
+                                                    values=[1, 2])
+        self.assertTrue(np.isnan(trades.to_ohcl('1m', fill_gaps=True).volumes()).all())
+        empty = ColumnarCollectionOhcl(dates=[], opens=[], highs=[], lows=[], closes=[])
+        self.assertEqual(empty.resample('1h').size(), 0)
+
+    def test_fill_gaps_bound(self):
+        trades = ColumnarCollectionSingleTradePoint(dates=_dates('2000-01-01', '2021-01-01'), values=[1, 2])
+        with self.assertRaises(ValueError):
+            trades.to_ohcl('1s', fill_gaps=True)
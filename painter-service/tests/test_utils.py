@@ -1,14 +1,44 @@
 import io
+import json
+
+import numpy as np
 import pydantic
 from PIL import Image
 
+import protobuf.graphPainter_pb2 as pb2
+from models.columnar import to_columnar
+from models.price_point import CollectionOhcl, CollectionSingleTradePoint
+
 
 class StubRequest(pydantic.BaseModel):
     datas: str
     tokenInfo: str
     options: str
+    arrow: bytes = b''
+    parquet: bytes = b''
 
 
 def read_image(b) -> Image:
     """Cast a byte array to a PIL.Image object"""
     return Image.open(io.BytesIO(b))
+
+
+def to_chart_request_v2(json_datas: str, token_info: str, options: str, ohcl: bool) -> pb2.ChartRequestV2:
+    """Builds the binary equivalent of a json chart request"""
+    datas = json.loads(json_datas)
+    col = to_columnar(CollectionOhcl(**datas) if ohcl else CollectionSingleTradePoint(**datas))
+    timestamps = col.dates().astype('datetime64[ms]').astype(np.int64)
+    req = pb2.ChartRequestV2(timestamps=np.diff(timestamps, prepend=0).tolist(),
+                             volumes=col.volumes().tolist() if col.has_volume() else [],
+                             tokenInfo=pb2.TokenInfoMessage(**json.loads(token_info)),
+                             options=pb2.GraphOptionMessage(**{k: v for k, v in json.loads(options).items()
+                                                               if v is not None and
+                                                               k in pb2.GraphOptionMessage.DESCRIPTOR.fields_by_name}))
+    if ohcl:
+        req.opens.extend(col.opens())
+        req.highs.extend(col.highs())
+        req.lows.extend(col.lows())
+        req.closes.extend(col.closes())
+    else:
+        req.values.extend(col.values())
+    return req